@@ -0,0 +1,88 @@
+"""
+Concurrent prefetch of the constants CV graphs used by the issue handlers.
+
+Each CV field (grid_type, units, region, ...) is backed by a
+`constants:<field>/_graph.json` graph. Resolving them lazily, one field at a
+time inside the parse loop, costs one sequential graph round-trip per field.
+This helper fetches every graph in parallel up front and publishes the result
+as a read-only lookup table:
+
+    {field: {lowercased ui_label or validation_key: validation_key}}
+
+The table is built once per process and shared by every handler that loads
+this module, so a batch run pays for the graphs exactly once.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+
+
+# CV fields that may be submitted as ui_label — map field name to graph URL
+CV_FIELDS = {
+    'grid_type':          'constants:grid_type/_graph.json',
+    'grid_mapping':       'constants:grid_mapping/_graph.json',
+    'region':             'constants:region/_graph.json',
+    'temporal_refinement':'constants:temporal_refinement/_graph.json',
+    'units':              'constants:units/_graph.json',
+    'truncation_method':  'constants:truncation_method/_graph.json',
+}
+
+_EMPTY: Mapping[str, str] = MappingProxyType({})
+
+_TABLE: Mapping[str, Mapping[str, str]] = MappingProxyType({})
+_LOCK = threading.Lock()
+
+
+def _fetch_reverse_map(graph_url: str) -> Mapping[str, str]:
+    """Fetch one CV graph and return its frozen ui_label -> validation_key map.
+
+    A failed fetch yields an empty map so resolution falls back to storing the
+    submitted value as-is (with a warning), exactly as the lazy path did.
+    """
+    from cmipld.utils.ldparse import ui_label_to_key
+    try:
+        with _timing.span(graph_url, 'network'):
+            return MappingProxyType(dict(ui_label_to_key(graph_url)))
+    except Exception as e:
+        print(f"\033[93m  ⚠ Could not load CV graph {graph_url}: {e}\033[0m", flush=True)
+        return _EMPTY
+
+
+def prefetch_cv_maps(fields: Mapping[str, str] | None = None) -> Mapping[str, Mapping[str, str]]:
+    """Fetch every CV graph in `fields` concurrently and return the shared table.
+
+    Fields already present in the table are not fetched again, so calling this
+    at the start of every handler is cheap after the first call. Worst-case
+    latency is a single graph round-trip rather than one per field.
+    """
+    global _TABLE
+    fields = CV_FIELDS if fields is None else fields
+    with _LOCK:
+        missing = {f: url for f, url in fields.items() if f not in _TABLE}
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                fetched = dict(zip(missing, pool.map(_fetch_reverse_map, missing.values())))
+            _TABLE = MappingProxyType({**_TABLE, **fetched})
+    return _TABLE
+
+
+def cv_table() -> Mapping[str, Mapping[str, str]]:
+    """Return the shared lookup table, prefetching all CV_FIELDS on first use."""
+    return prefetch_cv_maps()
+
+
+def lookup(field: str, value: str) -> str | None:
+    """Return the validation_key for `value` in `field`, or None if unknown."""
+    return cv_table().get(field, _EMPTY).get((value or '').strip().lower())
@@ -0,0 +1,181 @@
+"""
+Canonical signatures for computational grids, and an index of them.
+
+Two grids are the same grid when their signatures match, whatever their
+description or labels say:
+
+  horizontal_computational_grid  arrangement + sorted subgrid ids
+  vertical_computational_grid    vertical_coordinate, n_z, n_z_range and the
+                                 three thicknesses (numbers compared by value)
+  any other folder               the record minus @id / @type /
+                                 validation_key / ui_label / alias — what
+                                 tempgrid-rename.yml compared before
+
+The index covers numbered entries only (h123, v104, g100, ...). It is built
+once per folder per process from the src-data checkout, and handlers consult
+it in run() before creating a tempgrid:
+
+    existing = _grid_signatures.find_existing('vertical_computational_grid', data)
+
+tempgrid-rename.yml checks the tempgrids it is about to rename with
+duplicates() (through .github/scripts/tempgrid_ids.py), which maps each
+file that duplicates a numbered entry to its ID, or to `@OTHER_FILE` when it
+duplicates an earlier file in the list.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+
+_NUMBERED = re.compile(r'^[sghv]\d+$', re.IGNORECASE)
+
+# Fields that never distinguish two grids.
+_IDENTITY_FIELDS = {'@id', '@type', 'validation_key', 'ui_label', 'alias'}
+
+_VGRID_NUMBERS = ('n_z', 'top_layer_thickness', 'bottom_layer_thickness', 'total_thickness')
+
+_PLACEHOLDER = {'', 'not specified', 'none', '_no response_'}
+
+# What "the same grid" means, for the duplicate comment.
+_COMPARED = {
+    'horizontal_computational_grid': 'arrangement and subgrids',
+    'vertical_computational_grid': 'vertical coordinate, levels and thicknesses',
+}
+
+_LOCK = threading.Lock()
+_INDEX: dict[tuple[str, str], dict] = {}
+
+
+def _token(value) -> str:
+    if isinstance(value, dict):
+        value = value.get('@id', '')
+    value = str(value or '').strip().lower()
+    return '' if value in _PLACEHOLDER else re.sub(r'[\s_]+', '-', value)
+
+
+def _number(value):
+    """85, 85.0 and '85' are the same value; blanks are None."""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.lower() in _PLACEHOLDER:
+            return None
+    if value is None:
+        return None
+    try:
+        return round(float(value), 6)
+    except (TypeError, ValueError):
+        return _token(value)
+
+
+def _as_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value.strip().lower() not in _PLACEHOLDER:
+        return [v for v in re.split(r'[\s,]+', value) if v]
+    return []
+
+
+def signature(folder: str, record: dict):
+    """Hashable canonical form of `record` as a `folder` entry."""
+    if folder == 'horizontal_computational_grid':
+        return (
+            _token(record.get('arrangement')),
+            tuple(sorted(_token(s) for s in _as_list(record.get('horizontal_subgrids')))),
+        )
+    if folder == 'vertical_computational_grid':
+        return (
+            _token(record.get('vertical_coordinate')),
+            *(_number(record.get(k)) for k in _VGRID_NUMBERS),
+            tuple(sorted(_number(v) for v in _as_list(record.get('n_z_range')))),
+        )
+    stripped = {k: v for k, v in record.items()
+                if k not in _IDENTITY_FIELDS and not k.startswith('_')}
+    return json.dumps(stripped, sort_keys=True)
+
+
+def index(folder: str, repo_root: str | None = None) -> dict:
+    """{signature: id} over the numbered entries of `folder`; cached."""
+    repo_root = repo_root or os.environ.get('GITHUB_WORKSPACE', os.getcwd())
+    key = (os.path.realpath(repo_root), folder)
+    with _LOCK:
+        if key not in _INDEX:
+            _INDEX[key] = _build(os.path.join(repo_root, folder), folder)
+        return _INDEX[key]
+
+
+def _build(directory: str, folder: str) -> dict:
+    sigs: dict = {}
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return sigs
+    for name in names:
+        stem = name[:-5] if name.endswith('.json') else ''
+        if not _NUMBERED.match(stem):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        # Lowest number wins if the registry already holds duplicates.
+        sigs.setdefault(signature(folder, record), stem.lower())
+    return sigs
+
+
+def find_existing(folder: str, record: dict, repo_root: str | None = None) -> str | None:
+    """Id of the numbered entry `record` duplicates, or None."""
+    return index(folder, repo_root).get(signature(folder, record))
+
+
+def close_as_duplicate(issue: dict, folder: str, existing_id: str, timing, dry_run=False) -> None:
+    """Comment on, stamp and close an issue whose grid already exists."""
+    print(f"\033[93m  ⚠ Duplicate of existing {folder} '{existing_id}' — no new entry.\033[0m",
+          flush=True)
+    number = issue.get('number') or issue.get('issue_number')
+    if dry_run or not number:
+        return
+    body = (
+        f'## ⚠️ This grid already exists\n\n'
+        f'The submitted grid matches **`{existing_id}`** in `{folder}` '
+        f'(same {_COMPARED.get(folder, "content")}; descriptions are not compared).\n\n'
+        f'No new entry has been created. Use **`{existing_id}`** in the next stage.\n\n'
+        f'_This issue has been closed automatically._'
+    )
+    title = re.sub(r'^\|[^|]*\|\s*', '', issue.get('title') or '')
+    for cmd in (
+        ['gh', 'issue', 'comment', str(number), '--body', body],
+        ['gh', 'issue', 'edit', str(number), '--title', f'| {existing_id} | {title}'.rstrip()],
+        ['gh', 'issue', 'close', str(number)],
+    ):
+        try:
+            timing.run(cmd, check=True)
+        except Exception as e:
+            print(f'\033[91m  ⚠ {" ".join(cmd[:3])} failed: {e}\033[0m', flush=True)
+
+
+def duplicates(paths: list[str]) -> dict[str, str]:
+    """{path: existing ID or '@earlier path'} for the duplicates among `paths`."""
+    out: dict[str, str] = {}
+    earlier: dict[tuple[str, object], str] = {}
+    for path in paths:
+        folder = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        root = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        try:
+            with open(path, encoding='utf-8') as f:
+                sig = signature(folder, json.load(f))
+        except (OSError, ValueError) as e:
+            print(f'{path}: {e}', file=sys.stderr)
+            continue
+        existing = index(folder, root).get(sig)
+        if existing:
+            out[path] = existing
+        elif (folder, sig) in earlier:
+            out[path] = f'@{earlier[(folder, sig)]}'
+        else:
+            earlier[(folder, sig)] = path
+    return out
@@ -0,0 +1,140 @@
+"""
+Structural diff of two EMD records.
+
+Records are aligned by key and compared field by field; the result is a flat
+list of changes, one per field (or list item) that differs:
+
+    {'op': 'changed', 'path': 'n_z',        'old': 85,        'new': 86}
+    {'op': 'added',   'path': 'references', 'old': None,      'new': 'https://doi.org/...'}
+    {'op': 'removed', 'path': 'region',     'old': 'global',  'new': None}
+
+Nested objects are walked with dotted paths (the same `metadata.version`
+notation the modify form uses). Lists are compared as sets — the registry
+stores references, regions, component pairs etc. with no meaningful order —
+so an added or removed item is one change and reordering is none. Lists in
+ORDERED_FIELDS (ranges, where position matters) are compared as values.
+`@context` and `@type` are the same in every record of a folder and are
+skipped.
+
+Used by the modify handler's review report, recent_pr_diff.py and
+.github/scripts/diff_records.py (the src-data-change summary).
+"""
+
+from __future__ import annotations
+
+import json
+
+IGNORED_FIELDS = frozenset({'@context', '@type'})
+
+# List fields whose order is significant.
+ORDERED_FIELDS = frozenset({'n_z_range'})
+
+_MAX_CELL = 120
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def diff(old, new, ignore=IGNORED_FIELDS, ordered=ORDERED_FIELDS) -> list[dict]:
+    """Field-level changes from `old` to `new` (dicts, or None for absent)."""
+    changes: list[dict] = []
+    if old is None or new is None:
+        if old is not new:
+            changes.append({'op': 'added' if old is None else 'removed',
+                            'path': '', 'old': old, 'new': new})
+        return changes
+    _diff_dicts(old, new, '', ignore, ordered, changes)
+    return changes
+
+
+def _diff_dicts(old: dict, new: dict, prefix: str, ignore, ordered, out: list) -> None:
+    for key in sorted(old.keys() | new.keys()):
+        if key in ignore:
+            continue
+        path = f'{prefix}{key}'
+        if key not in new:
+            out.append({'op': 'removed', 'path': path, 'old': old[key], 'new': None})
+        elif key not in old:
+            out.append({'op': 'added', 'path': path, 'old': None, 'new': new[key]})
+        else:
+            _diff_values(old[key], new[key], path, key, ignore, ordered, out)
+
+
+def _diff_values(a, b, path: str, key: str, ignore, ordered, out: list) -> None:
+    if a == b and type(a) is type(b):
+        return
+    if isinstance(a, dict) and isinstance(b, dict):
+        _diff_dicts(a, b, f'{path}.', ignore, ordered, out)
+    elif isinstance(a, list) and isinstance(b, list) and key not in ordered:
+        old_items = {_canonical(v): v for v in a}
+        new_items = {_canonical(v): v for v in b}
+        for k in sorted(old_items.keys() - new_items.keys()):
+            out.append({'op': 'removed', 'path': f'{path}[]', 'old': old_items[k], 'new': None})
+        for k in sorted(new_items.keys() - old_items.keys()):
+            out.append({'op': 'added', 'path': f'{path}[]', 'old': None, 'new': new_items[k]})
+    else:
+        out.append({'op': 'changed', 'path': path, 'old': a, 'new': b})
+
+
+def diff_text(old_text: str | None, new_text: str | None, **kwargs) -> list[dict] | None:
+    """diff() of two JSON documents; None if either side does not parse."""
+    try:
+        old = json.loads(old_text) if old_text else None
+        new = json.loads(new_text) if new_text else None
+    except ValueError:
+        return None
+    if not isinstance(old, (dict, type(None))) or not isinstance(new, (dict, type(None))):
+        return None
+    return diff(old, new, **kwargs)
+
+
+def summary(changes: list[dict]) -> dict[str, int]:
+    """{'added': n, 'removed': n, 'changed': n}."""
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    for c in changes:
+        counts[c['op']] += 1
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _cell(value) -> str:
+    if value is None:
+        return ''
+    s = json.dumps(value, ensure_ascii=False)
+    s = s if len(s) <= _MAX_CELL else s[:_MAX_CELL] + '…'
+    return f"`{s.replace('|', '&#124;').replace('`', 'ˋ')}`"
+
+
+def to_markdown(changes: list[dict]) -> str:
+    """A `| Field | Before | After |` table, or '' if there are no changes."""
+    if not changes:
+        return ''
+    lines = ['| Field | Before | After |', '|---|---|---|']
+    for c in changes:
+        lines.append(f"| `{c['path'] or '(file)'}` | {_cell(c['old'])} | {_cell(c['new'])} |")
+    return '\n'.join(lines)
+
+
+def to_lines(changes: list[dict], colour: bool = True) -> list[str]:
+    """One terminal line per change: `~ path: old -> new`, `+ path: new`, `- path: old`."""
+    red, green, yellow, reset = ('\033[31m', '\033[32m', '\033[33m', '\033[0m') if colour \
+        else ('', '', '', '')
+
+    def short(v) -> str:
+        s = json.dumps(v, ensure_ascii=False)
+        return s if len(s) <= _MAX_CELL else s[:_MAX_CELL] + '…'
+
+    lines = []
+    for c in changes:
+        path = c['path'] or '(file)'
+        if c['op'] == 'added':
+            lines.append(f"{green}+ {path}: {short(c['new'])}{reset}")
+        elif c['op'] == 'removed':
+            lines.append(f"{red}- {path}: {short(c['old'])}{reset}")
+        else:
+            lines.append(f"{yellow}~ {path}: {short(c['old'])} -> {short(c['new'])}{reset}")
+    return lines
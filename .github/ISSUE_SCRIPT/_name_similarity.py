@@ -5,12 +5,21 @@ For each proposed file path, scans the same folder on disk and reports any
 existing entries whose @id (filename stem) is suspiciously close to the
 proposed one. Returns a small markdown table for the PR description, or an
 empty string when nothing is similar enough.
+
+For auditing a whole folder at once, similar_pairs() finds every close pair
+without comparing all of them: each name gets a MinHash signature over its
+character shingles, signatures are split into LSH bands, and only names that
+share a band bucket are scored with the same ratio as above.
 """
 
 from __future__ import annotations
 
 import os
+import re
+import zlib
+from collections import defaultdict
 from difflib import SequenceMatcher
+from itertools import combinations
 
 
 # Threshold above which two names are flagged as similar. 0.80 catches typos
@@ -19,6 +28,21 @@ from difflib import SequenceMatcher
 _DEFAULT_THRESHOLD = 0.80
 _MAX_ROWS = 5
 
+# MinHash / LSH for similar_pairs(). 2-character shingles keep short ids
+# ('nemo-v3-6' vs 'nemo-v3-5') well above the band threshold; 24 bands of 3
+# rows put a pair in a shared bucket with probability 1 - (1 - J^3)^24,
+# i.e. >= 0.95 from shingle Jaccard J ~ 0.5, which covers the names that
+# reach a 0.80 ratio.
+_SHINGLE = 2
+_BANDS = 24
+_ROWS = 3
+_SEPARATORS = re.compile(r'[\s_.]+')
+_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (1 + 2 * zlib.crc32(f'a{i}'.encode()), zlib.crc32(f'b{i}'.encode()))
+    for i in range(_BANDS * _ROWS)
+]
+
 
 def _similarity(a: str, b: str) -> float:
     """Return a 0..1 similarity ratio between two names (case-insensitive)."""
@@ -92,3 +116,58 @@ def build_similarity_report(
     for existing_id, score in matches:
         lines.append(f'| `{existing_id}` | {score * 100:.0f}% |')
     return '\n'.join(lines)
+
+
+def _shingles(name: str) -> set[int]:
+    text = '^' + _SEPARATORS.sub('-', name.strip().lower()) + '$'
+    return {zlib.crc32(text[i:i + _SHINGLE].encode())
+            for i in range(max(1, len(text) - _SHINGLE + 1))}
+
+
+def _ratio_at_least(a: str, b: str, threshold: float) -> float:
+    """_similarity(a, b), or 0.0 once its cheap upper bounds fall short."""
+    matcher = SequenceMatcher(None, a.lower(), b.lower())
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+def minhash(name: str) -> tuple[int, ...]:
+    """MinHash signature of `name`'s character shingles (_BANDS * _ROWS values)."""
+    shingles = _shingles(name)
+    return tuple(min((a * x + b) % _PRIME for x in shingles) for a, b in _PERMUTATIONS)
+
+
+def similar_pairs(
+    names: dict[str, list[str]],
+    threshold: float = _DEFAULT_THRESHOLD,
+) -> list[tuple[str, str, float]]:
+    """Return [(key_a, key_b, similarity), ...] for close entries, best first.
+
+    `names` maps an entry key to the names it goes by (@id, ui_label, ...).
+    Two entries are a pair when any of their names score >= threshold;
+    candidates come from LSH buckets, so the cost grows with the number of
+    near matches rather than with the square of the folder size.
+    """
+    buckets: dict[tuple, list[str]] = defaultdict(list)
+    for key, values in names.items():
+        for value in {v.strip().lower() for v in values if v and v.strip()}:
+            sig = minhash(value)
+            for band in range(_BANDS):
+                buckets[(band, sig[band * _ROWS:(band + 1) * _ROWS])].append(key)
+
+    candidates: set[tuple[str, str]] = set()
+    for keys in buckets.values():
+        if len(keys) > 1:
+            candidates.update(combinations(sorted(set(keys)), 2))
+
+    pairs = []
+    for a, b in candidates:
+        score = max(
+            (_ratio_at_least(x, y, threshold) for x in names[a] if x for y in names[b] if y),
+            default=0.0,
+        )
+        if score >= threshold:
+            pairs.append((a, b, score))
+    pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return pairs
@@ -0,0 +1,136 @@
+"""
+Lazy handler registry for the issue scripts.
+
+A handler is any non-underscore `<kind>.py` in this folder; the kind is the
+issue label it serves. Discovery only lists the folder — nothing is imported
+until a handler is actually requested, so deciding which handler an issue
+needs (or listing them all) costs no cmipld / pydantic import at all.
+
+    import _registry                          # this folder on sys.path
+    registry = _registry.registry
+    kind = registry.kind_for_labels(issue['labels'])
+    module = registry[kind]                   # imported here, once
+
+`helper(name)` loads an `_`-prefixed sibling (e.g. `_timing`,
+`_name_similarity`) once per process and shares it through sys.modules, so
+every handler sees the same instance.
+
+Every module in this folder, handler or helper, gets its helpers the same
+way. Handlers are loaded by file path with an arbitrary cwd, so the folder
+is put on sys.path first; everything else goes through `helper()`:
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import _registry  # noqa: E402
+    _timing = _registry.helper('_timing')
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from types import ModuleType
+
+# os.path rather than pathlib: this module is on every handler's load path,
+# and pathlib alone costs more to import than the rest of it.
+HANDLER_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Labels that never name a handler.
+IGNORED_LABELS = frozenset({
+    'emd-submission', 'review', 'alpha', 'keep-open', 'pull_req',
+    'needs-review', 'changes-requested', 'changes-made',
+})
+
+_LOCK = threading.RLock()
+
+
+def _exec_file(name: str, path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    return module
+
+
+def helper(name: str, handler_dir: str = HANDLER_DIR) -> ModuleType:
+    """Return the shared `_name` helper module, loading it on first use."""
+    with _LOCK:
+        module = sys.modules.get(name)
+        if module is None:
+            module = _exec_file(name, os.path.join(handler_dir, f'{name}.py'))
+        return module
+
+
+class HandlerRegistry(Mapping):
+    """{kind: handler module}, where modules are imported on first lookup."""
+
+    def __init__(self, handler_dir: str = HANDLER_DIR):
+        self.handler_dir = os.fspath(handler_dir)
+        self._modules: dict[str, ModuleType] = {}
+
+    def path(self, kind: str) -> str | None:
+        """Handler file for `kind`, or None. Never imports anything."""
+        if not kind or kind.startswith(('_', '.')) or os.sep in kind:
+            return None
+        path = os.path.join(self.handler_dir, f'{kind}.py')
+        return path if os.path.isfile(path) else None
+
+    def kinds(self) -> list[str]:
+        return sorted(
+            name[:-3] for name in os.listdir(self.handler_dir)
+            if name.endswith('.py') and not name.startswith(('_', '.'))
+        )
+
+    def kind_for_labels(self, labels) -> str | None:
+        """Return the first label that names a handler, in label order."""
+        for label in labels or ():
+            if label in IGNORED_LABELS:
+                continue
+            if self.path(label) is not None:
+                return label
+        return None
+
+    def loaded(self) -> list[str]:
+        """Kinds imported so far in this process."""
+        return sorted(self._modules)
+
+    def __contains__(self, kind) -> bool:
+        return isinstance(kind, str) and self.path(kind) is not None
+
+    def __getitem__(self, kind: str) -> ModuleType:
+        with _LOCK:
+            if kind not in self._modules:
+                path = self.path(kind)
+                if path is None:
+                    raise KeyError(kind)
+                spec = importlib.util.spec_from_file_location(kind, path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self._modules[kind] = module
+            return self._modules[kind]
+
+    def __iter__(self):
+        return iter(self.kinds())
+
+    def __len__(self) -> int:
+        return len(self.kinds())
+
+
+registry = HandlerRegistry()
+
+_REGISTRIES: dict[str, HandlerRegistry] = {HANDLER_DIR: registry}
+
+
+def for_dir(handler_dir) -> HandlerRegistry:
+    """Registry for another handler folder (e.g. a fixture copy); cached."""
+    handler_dir = os.path.realpath(handler_dir)
+    with _LOCK:
+        if handler_dir not in _REGISTRIES:
+            _REGISTRIES[handler_dir] = HandlerRegistry(handler_dir)
+        return _REGISTRIES[handler_dir]
@@ -0,0 +1,218 @@
+"""
+Per-stage timing spans for issue processing.
+
+Wrap any stage in a span and it is recorded for the whole process:
+
+    with _timing.span('report_builder', kind=kind):
+        ...
+
+    result = _timing.run(['gh', 'issue', 'comment', ...], check=True)
+
+`run` is a drop-in for subprocess.run that records the call as a
+'subprocess' span; network fetches use category 'network'. Handler
+entry points are decorated with `@_timing.timed('<kind>.run')`.
+
+When the process exits the recorded spans are written out:
+
+  $GITHUB_STEP_SUMMARY   markdown table (calls / total / max per span)
+  $EMD_TRACE_FILE        Chrome trace-event JSON (open in Perfetto or
+                         chrome://tracing), only if the variable is set
+
+Setting EMD_PROFILE=cprofile (or =pyinstrument, if installed) also profiles
+the whole run and writes it to $EMD_PROFILE_OUT (default: emd_profile.prof /
+emd_profile.html in $RUNNER_TEMP or the system temp dir).
+
+Helpers in this folder are underscore-prefixed so they are never picked up
+as a handler for a label.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import defaultdict
+
+
+_T0 = time.perf_counter()
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+# (category, name, start_s, duration_s, thread_id, depth, attrs)
+_SPANS: list[tuple] = []
+
+_MAX_SUMMARY_ROWS = 25
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = 'stage', **attrs):
+    """Record the wall time of the enclosed block as one span."""
+    depth = getattr(_LOCAL, 'depth', 0)
+    _LOCAL.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _LOCAL.depth = depth
+        with _LOCK:
+            _SPANS.append((category, name, start - _T0, duration,
+                           threading.get_ident(), depth, attrs))
+
+
+def timed(name: str, category: str = 'stage'):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _command_name(cmd) -> str:
+    if isinstance(cmd, str):
+        return cmd.split()[0] if cmd.split() else cmd
+    parts = [os.path.basename(str(cmd[0]))] if cmd else []
+    # 'gh issue comment', 'gh api', 'git push' — enough to group by.
+    for part in cmd[1:3]:
+        part = str(part)
+        if part.startswith('-'):
+            break
+        parts.append(part)
+        if parts[0] != 'gh':
+            break
+    return ' '.join(parts)
+
+
+def run(cmd, *args, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run, recorded as a 'subprocess' span named after the command."""
+    shown = cmd if isinstance(cmd, str) else ' '.join(str(c) for c in cmd)
+    with span(_command_name(cmd), 'subprocess', cmd=shown[:200]):
+        return subprocess.run(cmd, *args, **kwargs)
+
+
+def spans() -> list[dict]:
+    """Return the recorded spans as dicts (ms), in start order."""
+    with _LOCK:
+        recorded = sorted(_SPANS, key=lambda s: s[2])
+    return [
+        {'category': c, 'name': n, 'start_ms': round(s * 1000, 3),
+         'duration_ms': round(d * 1000, 3), 'thread': t, 'depth': depth, 'attrs': a}
+        for c, n, s, d, t, depth, a in recorded
+    ]
+
+
+def summary_rows() -> list[dict]:
+    """Aggregate spans by (category, name), slowest total first."""
+    grouped: dict[tuple, list[float]] = defaultdict(list)
+    with _LOCK:
+        for category, name, _start, duration, *_ in _SPANS:
+            grouped[(category, name)].append(duration * 1000)
+    rows = [
+        {'category': c, 'name': n, 'calls': len(d),
+         'total_ms': sum(d), 'max_ms': max(d)}
+        for (c, n), d in grouped.items()
+    ]
+    return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+
+def write_summary(path: str, title: str = 'Issue processing timings') -> None:
+    rows = summary_rows()
+    if not rows:
+        return
+    wall = (time.perf_counter() - _T0) * 1000
+    lines = [f'## {title}', '',
+             f'Wall time since handler load: **{wall / 1000:.2f} s**', '',
+             '| Span | Category | Calls | Total (ms) | Max (ms) |',
+             '|---|---|---:|---:|---:|']
+    for r in rows[:_MAX_SUMMARY_ROWS]:
+        lines.append(f'| `{r["name"]}` | {r["category"]} | {r["calls"]} '
+                     f'| {r["total_ms"]:.1f} | {r["max_ms"]:.1f} |')
+    if len(rows) > _MAX_SUMMARY_ROWS:
+        lines.append(f'| … {len(rows) - _MAX_SUMMARY_ROWS} more | | | | |')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n\n')
+
+
+def write_trace(path: str) -> None:
+    """Write spans in Chrome trace-event format (complete 'X' events, µs)."""
+    events = [
+        {'name': s['name'], 'cat': s['category'], 'ph': 'X',
+         'ts': round(s['start_ms'] * 1000), 'dur': round(s['duration_ms'] * 1000),
+         'pid': os.getpid(), 'tid': s['thread'], 'args': s['attrs']}
+        for s in spans()
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+# =============================================================================
+# Optional profiler (EMD_PROFILE=cprofile | pyinstrument)
+# =============================================================================
+
+_PROFILER = None
+_PROFILE_MODE = os.environ.get('EMD_PROFILE', '').strip().lower()
+
+
+def _profile_out(suffix: str) -> str:
+    import tempfile
+    default_dir = os.environ.get('RUNNER_TEMP') or tempfile.gettempdir()
+    return os.environ.get('EMD_PROFILE_OUT') or os.path.join(default_dir, f'emd_profile{suffix}')
+
+
+def _start_profiler() -> None:
+    global _PROFILER, _PROFILE_MODE
+    if _PROFILE_MODE == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+            _PROFILER = Profiler()
+            _PROFILER.start()
+            return
+        except ImportError:
+            print("\033[93m  ⚠ pyinstrument not installed — falling back to cProfile\033[0m", flush=True)
+            _PROFILE_MODE = 'cprofile'
+    if _PROFILE_MODE in ('1', 'true', 'cprofile'):
+        import cProfile
+        _PROFILE_MODE = 'cprofile'
+        _PROFILER = cProfile.Profile()
+        _PROFILER.enable()
+
+
+def _stop_profiler() -> None:
+    if _PROFILER is None:
+        return
+    if _PROFILE_MODE == 'pyinstrument':
+        _PROFILER.stop()
+        out = _profile_out('.html')
+        with open(out, 'w', encoding='utf-8') as f:
+            f.write(_PROFILER.output_html())
+    else:
+        _PROFILER.disable()
+        out = _profile_out('.prof')
+        _PROFILER.dump_stats(out)
+    print(f"\033[92m  Profile ({_PROFILE_MODE}) written to {out}\033[0m", flush=True)
+
+
+def _finish() -> None:
+    _stop_profiler()
+    try:
+        summary = os.environ.get('GITHUB_STEP_SUMMARY')
+        if summary:
+            write_summary(summary)
+        trace = os.environ.get('EMD_TRACE_FILE')
+        if trace and _SPANS:
+            write_trace(trace)
+            print(f"\033[92m  Timing trace written to {trace}\033[0m", flush=True)
+    except OSError as e:
+        print(f"\033[93m  ⚠ Could not write timings: {e}\033[0m", flush=True)
+
+
+_start_profiler()
+atexit.register(_finish)
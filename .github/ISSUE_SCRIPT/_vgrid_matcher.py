@@ -0,0 +1,200 @@
+"""
+Nearest existing vertical grids for a submitted one.
+
+The vertical_computational_grid folder is loaded once per process into
+columns — one float column per numeric field (NaN where unset) and integer
+codes for `vertical_coordinate` — and a candidate is scored against every
+entry in a single vectorised NumPy pass.
+
+Scoring is the same as find_grid_matches.compare(): per field,
+
+  numeric       1 - |a - b| / max(|a|, |b|)        (n_z_range as min and max)
+  categorical   1.0 if equal (case-insensitive) else 0.0
+  unset on either side: the field is left out of that entry's mean
+
+and the overall score is the mean over the fields compared.
+
+Without NumPy the same scores are computed with a plain loop (slower, same
+result), so the report never depends on it being installed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+
+FIELDS = ('n_z', 'n_z_min', 'n_z_max', 'top_layer_thickness',
+          'bottom_layer_thickness', 'total_thickness')
+CATEGORICAL = 'vertical_coordinate'
+
+_DEFAULT_THRESHOLD = 0.5
+_MAX_ROWS = 5
+
+_PLACEHOLDER = {'', 'not specified', 'none', '_no response_'}
+
+_LOCK = threading.Lock()
+_COLUMNS: dict[str, dict] = {}
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _category(value) -> str | None:
+    value = str(value or '').strip().lower().replace('_', '-').replace(' ', '-')
+    return None if value in _PLACEHOLDER else value
+
+
+def features(record: dict) -> tuple[list[float], str | None]:
+    """(numeric values in FIELDS order, NaN if unset; vertical_coordinate)."""
+    n_z_range = record.get('n_z_range')
+    if isinstance(n_z_range, str):
+        n_z_range = [p for p in n_z_range.replace(',', ' ').split() if p]
+    bounds = sorted(v for v in (_float(x) for x in n_z_range or ()) if not math.isnan(v))
+    values = {
+        'n_z_min': bounds[0] if bounds else math.nan,
+        'n_z_max': bounds[-1] if bounds else math.nan,
+    }
+    row = [values[f] if f in values else _float(record.get(f)) for f in FIELDS]
+    return row, _category(record.get(CATEGORICAL))
+
+
+def columns(repo_root: str | None = None) -> dict:
+    """
+    The folder as columns: {'ids', 'rows', 'coords', 'categories'} plus
+    'numeric' (F x N float array) and 'codes' (N int array, -1 = unset) when
+    NumPy is available. Built once per repo_root.
+    """
+    repo_root = os.path.realpath(repo_root or os.environ.get('GITHUB_WORKSPACE', os.getcwd()))
+    with _LOCK:
+        if repo_root not in _COLUMNS:
+            _COLUMNS[repo_root] = _load(os.path.join(repo_root, 'vertical_computational_grid'))
+        return _COLUMNS[repo_root]
+
+
+def _load(directory: str) -> dict:
+    ids, rows, coords = [], [], []
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        names = []
+    for name in names:
+        if not name.endswith('.json') or name.startswith(('_', 'tempgrid')):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        row, coord = features(record)
+        ids.append(name[:-5])
+        rows.append(row)
+        coords.append(coord)
+
+    categories = {c: i for i, c in enumerate(sorted({c for c in coords if c}))}
+    cols = {'ids': ids, 'rows': rows, 'coords': coords, 'categories': categories}
+    np = _numpy()
+    if np is not None:
+        cols['numeric'] = np.array(rows, dtype=float).T.reshape(len(FIELDS), len(ids))
+        cols['codes'] = np.array([categories.get(c, -1) if c else -1 for c in coords], dtype=int)
+    return cols
+
+
+def _scores_numpy(np, cols: dict, row: list[float], coord: str | None):
+    cand = np.array(row, dtype=float)
+    known = ~np.isnan(cand)
+    values = cols['numeric'][known]                    # (fields set on the candidate) x N
+    target = cand[known][:, None]
+    valid = ~np.isnan(values)
+    denom = np.maximum(np.maximum(np.abs(values), np.abs(target)), 1e-9)
+    field_scores = np.where(valid, np.clip(1.0 - np.abs(values - target) / denom, 0.0, 1.0), 0.0)
+    total = field_scores.sum(axis=0)
+    count = valid.sum(axis=0)
+    if coord:
+        code = cols['categories'].get(coord, -2)
+        has_coord = cols['codes'] >= 0
+        total = total + ((cols['codes'] == code) & has_coord)
+        count = count + has_coord
+    return np.divide(total, count, out=np.zeros(len(cols['ids'])), where=count > 0)
+
+
+def _scores_python(cols: dict, row: list[float], coord: str | None) -> list[float]:
+    scores = []
+    for other, other_coord in zip(cols['rows'], cols['coords']):
+        parts = [
+            max(0.0, 1.0 - abs(a - b) / max(abs(a), abs(b), 1e-9))
+            for a, b in zip(row, other) if not (math.isnan(a) or math.isnan(b))
+        ]
+        if coord and other_coord:
+            parts.append(1.0 if coord == other_coord else 0.0)
+        scores.append(sum(parts) / len(parts) if parts else 0.0)
+    return scores
+
+
+def nearest(record: dict, k: int = _MAX_ROWS, threshold: float = 0.0,
+            repo_root: str | None = None, exclude=()) -> list[tuple[str, float]]:
+    """Return up to k [(id, score), ...] closest to `record`, best first."""
+    cols = columns(repo_root)
+    if not cols['ids']:
+        return []
+    row, coord = features(record)
+    np = _numpy() if 'numeric' in cols else None
+    if np is not None:
+        scores = _scores_numpy(np, cols, row, coord)
+        order = np.argsort(-scores, kind='stable')
+        ranked = [(cols['ids'][i], float(scores[i])) for i in order[:k + len(exclude)]]
+    else:
+        scores = _scores_python(cols, row, coord)
+        ranked = sorted(zip(cols['ids'], scores), key=lambda item: -item[1])[:k + len(exclude)]
+    return [(i, s) for i, s in ranked if i not in exclude and s >= threshold][:k]
+
+
+def build_report(record: dict, repo_root: str | None = None,
+                 threshold: float = _DEFAULT_THRESHOLD, max_rows: int = _MAX_ROWS) -> str:
+    """Markdown table of the closest existing vertical grids, or '' if none."""
+    exclude = {record.get('@id')} - {None}
+    matches = nearest(record, k=max_rows, threshold=threshold,
+                      repo_root=repo_root, exclude=exclude)
+    if not matches:
+        return ''
+    cols = columns(repo_root)
+    position = {entry_id: n for n, entry_id in enumerate(cols['ids'])}
+
+    def cell(value: float) -> str:
+        return '' if math.isnan(value) else f'{value:.10g}'
+
+    def span(lo: float, hi: float) -> str:
+        return '' if math.isnan(lo) else f'{lo:.10g}–{hi:.10g}'
+
+    row, coord = features(record)
+    lines = [
+        '#### Closest existing vertical grids',
+        '',
+        'Please check the submission is not one of these.',
+        '',
+        '| Grid | Score | Coordinate | n_z | n_z range | Top (m) | Bottom (m) | Total (m) |',
+        '|---|---:|---|---:|---|---:|---:|---:|',
+        f'| *submitted* | | {coord or ""} | {cell(row[0])} | {span(row[1], row[2])} '
+        f'| {cell(row[3])} | {cell(row[4])} | {cell(row[5])} |',
+    ]
+    for entry_id, score in matches:
+        r = cols['rows'][position[entry_id]]
+        c = cols['coords'][position[entry_id]]
+        lines.append(
+            f'| `{entry_id}` | {score * 100:.0f}% | {c or ""} | {cell(r[0])} '
+            f'| {span(r[1], r[2])} | {cell(r[3])} | {cell(r[4])} | {cell(r[5])} |'
+        )
+    return '\n'.join(lines)
@@ -8,14 +8,24 @@ Produces N+1 files per submission:
 Subgrid IDs remain content-addressed for deduplication.
 The comp grid file gets a tempgrid_ prefix and is renamed to h### on PR merge
 by tempgrid-rename.yml, which scans existing h### files on src-data.
+
+If an existing h### already has the same arrangement and subgrid set
+(_grid_signatures), no files are produced: the issue is pointed at that h###
+and closed.
 """
 
 import os
+import sys
 import time
 
-from cmipld.utils.id_generation import generate_id_from_issue
-from cmipld.utils.similarity import ReportBuilder
-from cmipld.utils.similarity.report_builder import build_subgrid_report
+# cmipld (id_generation, the similarity / pydantic stack) is imported inside
+# run() / update(), so loading this module to pick a handler stays cheap.
+
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+_grid_signatures = _registry.helper('_grid_signatures')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
@@ -102,7 +112,10 @@ def _slot_fields(parsed_issue: dict, issue_body: str = '') -> list[dict]:
     return slots
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
+    from cmipld.utils.id_generation import generate_id_from_issue
+
     arrangement = (parsed_issue.get('arrangement') or '').strip().lower()
     description = parsed_issue.get('additional_information') or parsed_issue.get('description') or ''
 
@@ -150,6 +163,15 @@ def run(parsed_issue, issue, dry_run=False):
         tag = '♻ matched' if reused else '+ new'
         print(f"\033[92m  [{tag}] Slot {slot['n']}: subgrid '{sid}'\033[0m", flush=True)
 
+    # Same arrangement + subgrid set as an existing h###: reuse it, don't
+    # register a second copy that only differs in its description.
+    with _timing.span('signature_index', kind=kind):
+        existing = _grid_signatures.find_existing(
+            kind, {'arrangement': arrangement, 'horizontal_subgrids': subgrid_ids}, repo_root)
+    if existing:
+        _grid_signatures.close_as_duplicate(issue, kind, existing, _timing, dry_run)
+        return None
+
     # Collect paths of matched subgrids so new_issue.py skips the 'file exists' check
     force_modify = {
         os.path.join('horizontal_subgrid', f"{s['sid']}.json")
@@ -202,7 +224,11 @@ def run(parsed_issue, issue, dry_run=False):
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
+    from cmipld.utils.similarity import ReportBuilder
+    from cmipld.utils.similarity.report_builder import build_subgrid_report
+
     atid        = files_to_write.get('_atid', '')
     slot_report = files_to_write.get('_slot_report', [])
     subgrid_ids = files_to_write.get('_subgrid_ids', [])
@@ -231,12 +257,14 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
             try:
                 # Fetch existing subgrid folder items for similarity comparison
                 from helpers.data_loader import fetch_data
-                folder_items = list(fetch_data('horizontal_subgrid', depth=1))
+                with _timing.span('fetch_data horizontal_subgrid', 'network'):
+                    folder_items = list(fetch_data('horizontal_subgrid', depth=1))
             except Exception:
                 folder_items = []
             try:
                 clean = {k: v for k, v in data.items() if not k.startswith('_')}
-                data['_validation_report'] = build_subgrid_report(clean, folder_items)
+                with _timing.span('subgrid_report'):
+                    data['_validation_report'] = build_subgrid_report(clean, folder_items)
             except Exception as e:
                 print(f"\033[91m  ⚠ Subgrid report failed for {file_path}: {e}\033[0m",
                       flush=True)
@@ -257,10 +285,11 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
             validate_data = data
 
         try:
-            report = ReportBuilder(
-                folder_url=folder_url, kind=report_kind,
-                item=validate_data, link_threshold=80.0,
-            ).build()
+            with _timing.span('report_builder', kind=report_kind):
+                report = ReportBuilder(
+                    folder_url=folder_url, kind=report_kind,
+                    item=validate_data, link_threshold=80.0,
+                ).build()
             data['_validation_report'] = report
             status = '✓' if report else '(empty)'
         except Exception as e:
@@ -10,11 +10,18 @@ scanning existing g### files and assigning max+1.
 
 import os
 import re
+import sys
 import time
 
-from cmipld.utils.id_generation import generate_id_from_issue
-from cmipld.utils.similarity import ReportBuilder
-from cmipld.utils.ldparse import ui_label_to_key
+# cmipld (id_generation, the similarity / pydantic stack) is imported inside
+# run() / update(), so loading this module to pick a handler stays cheap.
+
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+# One prefetched CV table per process, shared by every handler.
+_cv_prefetch = _registry.helper('_cv_prefetch')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
@@ -30,17 +37,7 @@ FIELD_MAP = {
 _NUMERIC_KEYS = re.compile(r'_(resolution|number|longitude|latitude|cells|truncation)')
 
 # CV fields that may be submitted as ui_label — map field name to graph URL
-CV_FIELDS = {
-    'grid_type':          'constants:grid_type/_graph.json',
-    'grid_mapping':       'constants:grid_mapping/_graph.json',
-    'region':             'constants:region/_graph.json',
-    'temporal_refinement':'constants:temporal_refinement/_graph.json',
-    'units':              'constants:units/_graph.json',
-    'truncation_method':  'constants:truncation_method/_graph.json',
-}
-
-# Cache reverse maps so we only fetch each graph once per run
-_CV_REVERSE_MAP: dict[str, dict] = {}
+CV_FIELDS = _cv_prefetch.CV_FIELDS
 
 def resolve_cv_value(field: str, value: str) -> str:
     """
@@ -51,12 +48,7 @@ def resolve_cv_value(field: str, value: str) -> str:
     if not value or field not in CV_FIELDS:
         return value
     value = value.strip().lower()
-    if field not in _CV_REVERSE_MAP:
-        try:
-            _CV_REVERSE_MAP[field] = ui_label_to_key(CV_FIELDS[field])
-        except Exception:
-            _CV_REVERSE_MAP[field] = {}
-    resolved = _CV_REVERSE_MAP[field].get(value)
+    resolved = _cv_prefetch.lookup(field, value)
     if resolved is None:
         print(f"\033[91m  WARNING: unrecognised {field} value {value!r} — storing as-is\033[0m", flush=True)
         return value
@@ -73,10 +65,17 @@ def to_num(key, val):
         return val
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
     if parsed_issue.get('validation_key'):
         return None  # fall back to generic handler
 
+    from cmipld.utils.id_generation import generate_id_from_issue
+
+    # Fetch every CV graph concurrently before any field is parsed.
+    with _timing.span('cv_prefetch', 'network'):
+        _cv_prefetch.prefetch_cv_maps(CV_FIELDS)
+
     author     = issue.get('author') or 'unknown'
     created_at = issue.get('created_at') or ''
     temp_id    = f"tempgrid_{generate_id_from_issue(author, created_at)['id']}" \
@@ -180,7 +179,10 @@ def run(parsed_issue, issue, dry_run=False):
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
+    from cmipld.utils.similarity import ReportBuilder
+
     atid = files_to_write.get('_atid', '')
     pydantic_overrides = files_to_write.get('_pydantic_data', {})
 
@@ -194,11 +196,12 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
             # so ReportBuilder's checklist reflects what the schema actually sees.
             # Falls back to raw data if no override was provided.
             report_item = pydantic_overrides.get(file_path, data)
-            report = ReportBuilder(
-                folder_url=f"emd:{kind}", kind=kind,
-                item=report_item, link_threshold=85.0,
-                val_result=pre_val,
-            ).build()
+            with _timing.span('report_builder', kind=kind):
+                report = ReportBuilder(
+                    folder_url=f"emd:{kind}", kind=kind,
+                    item=report_item, link_threshold=85.0,
+                    val_result=pre_val,
+                ).build()
             data['_validation_report'] = report
             print(f"\033[92m  Report generated ({len(report)} chars)\033[0m", flush=True)
         except Exception as e:
@@ -17,6 +17,23 @@ Behaviour
 
 The file is pushed directly to src-data (no PR) because there is nothing to
 review — the component and both grids are already approved entries.
+
+Batch links
+-----------
+When the "Batch links" field is filled in, the dropdowns are ignored and one
+config is derived per row instead:
+
+    component | h### | v###
+    nemo-v3-6 | h101, h102 | v103
+    cice5, si3 | h101 | v103
+
+A cell may list several IDs; a row expands to every combination, so a row is
+a components × grids matrix. Component realms and the existence checks are
+resolved against an in-memory index of src-data (one `git ls-tree`, one
+`git cat-file --batch`) rather than per config. All new configs are written
+in one commit and pushed once, and the issue gets one comment listing what
+was created and what already existed before being renamed and closed.
+Unknown components or grids fail the whole batch with nothing pushed.
 """
 
 import json
@@ -26,6 +43,11 @@ import sys
 
 # from cmipld.utils.similarity import ReportBuilder  # imported but never called here
 
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+
 kind = __file__.split('/')[-1].replace('.py', '')   # "link_existing_component"
 
 IGNORE = {'issue_category', 'additional_collaborators', 'collaborators'}
@@ -46,13 +68,20 @@ def _clean(s: str) -> str:
     return (s or '').strip().lower().replace('.', '-')
 
 
+def _contributors(parsed_issue) -> list:
+    collab_str = parsed_issue.get('additional_collaborators',
+                                  parsed_issue.get('collaborators', ''))
+    return [c.strip() for c in collab_str.split(',') if c.strip()] if collab_str else []
+
+
 def _get_component_type(component_id: str) -> str:
     """Look up the model_component record and return its realm (@id of component field)."""
     import cmipld
 
     # Try live graph first (authoritative)
     try:
-        record = cmipld.get(f'emd:model_component/{component_id}')
+        with _timing.span('cmipld.get model_component', 'network'):
+            record = cmipld.get(f'emd:model_component/{component_id}')
         realm = record.get('component', '').strip().lower()
         if realm:
             return realm.replace('_', '-')
@@ -71,7 +100,7 @@ def _get_component_type(component_id: str) -> str:
 
     # Fall back to origin/src-data
     try:
-        result = subprocess.run(
+        result = _timing.run(
             ['git', 'show', f'origin/{_BRANCH}:{rel_path}'],
             capture_output=True, text=True, cwd=_WORKSPACE,
         )
@@ -106,7 +135,7 @@ def _file_exists_on_src_data(rel_path: str) -> bool:
         return True
     # Fall back to asking git
     try:
-        result = subprocess.run(
+        result = _timing.run(
             ['git', 'cat-file', '-e', f'origin/{_BRANCH}:{rel_path}'],
             capture_output=True,
             cwd=_WORKSPACE,
@@ -123,8 +152,19 @@ def _push_file_to_src_data(rel_path: str, data: dict, author: str = '', collabor
     Commits under the issue submitter's name, with co-authors for collaborators.
     Returns True on success.
     """
+    return _push_files_to_src_data(
+        {rel_path: data}, f'Add component_config: {os.path.basename(rel_path)}',
+        author=author, collaborators=collaborators,
+    )
+
+
+def _push_files_to_src_data(files: dict, message: str, author: str = '', collaborators: list = []) -> bool:
+    """
+    Write every {rel_path: data} to the src-data branch as one commit and
+    push once. Returns True on success.
+    """
     try:
-        subprocess.run(
+        _timing.run(
             ['git', 'checkout', '-B', _BRANCH, f'origin/{_BRANCH}'],
             check=True, cwd=_WORKSPACE, capture_output=True,
         )
@@ -132,18 +172,18 @@ def _push_file_to_src_data(rel_path: str, data: dict, author: str = '', collabor
         print(f'\033[91m  ✗ Could not checkout {_BRANCH}: {e.stderr.decode().strip()}\033[0m', flush=True)
         return False
 
-    full = os.path.join(_WORKSPACE, rel_path)
-    os.makedirs(os.path.dirname(full), exist_ok=True)
-
-    with open(full, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
-        f.write('\n')
+    for rel_path, data in files.items():
+        full = os.path.join(_WORKSPACE, rel_path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+            f.write('\n')
 
     try:
-        subprocess.run(['git', 'add', rel_path], check=True, cwd=_WORKSPACE)
+        _timing.run(['git', 'add', *files], check=True, cwd=_WORKSPACE)
 
         # Build commit message with co-author trailers
-        commit_msg = f'Add component_config: {os.path.basename(rel_path)}'
+        commit_msg = message
         if collaborators:
             coauthors = '\n'.join(
                 f'Co-authored-by: {c} <{c}@users.noreply.github.com>'
@@ -156,8 +196,8 @@ def _push_file_to_src_data(rel_path: str, data: dict, author: str = '', collabor
             author_str = f'{author} <{author}@users.noreply.github.com>'
             commit_cmd += ['--author', author_str]
 
-        subprocess.run(commit_cmd, check=True, cwd=_WORKSPACE)
-        subprocess.run(
+        _timing.run(commit_cmd, check=True, cwd=_WORKSPACE)
+        _timing.run(
             ['git', 'push', 'origin', _BRANCH],
             check=True, cwd=_WORKSPACE,
         )
@@ -169,7 +209,7 @@ def _push_file_to_src_data(rel_path: str, data: dict, author: str = '', collabor
 
 def _post_comment(issue_number: str | int, body: str):
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'comment', str(issue_number), '--body', body],
             check=True, cwd=_WORKSPACE,
         )
@@ -179,7 +219,7 @@ def _post_comment(issue_number: str | int, body: str):
 
 def _rename_issue(issue_number: str | int, config_id: str):
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'edit', str(issue_number),
              '--title', f'| {config_id} | Link Component'],
             check=True, cwd=_WORKSPACE,
@@ -190,7 +230,7 @@ def _rename_issue(issue_number: str | int, config_id: str):
 
 def _close_issue(issue_number: str | int):
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'close', str(issue_number)],
             check=True, cwd=_WORKSPACE,
         )
@@ -198,11 +238,230 @@ def _close_issue(issue_number: str | int):
         print(f'\033[91m  ⚠ Could not close issue: {e}\033[0m', flush=True)
 
 
+# ---------------------------------------------------------------------------
+# Batch links
+# ---------------------------------------------------------------------------
+
+_INDEX_FOLDERS = ('model_component', 'component_config',
+                  'horizontal_computational_grid', 'vertical_computational_grid')
+
+
+def _realm(record: dict) -> str:
+    return (record.get('component') or '').strip().lower().replace('_', '-')
+
+
+def _read_blobs(specs: list) -> dict:
+    """{'<rev>:<path>': text} for every spec, through one `git cat-file --batch`."""
+    if not specs:
+        return {}
+    result = _timing.run(
+        ['git', 'cat-file', '--batch'],
+        input=''.join(f'{spec}\n' for spec in specs).encode(),
+        capture_output=True, cwd=_WORKSPACE,
+    )
+    out, pos, blobs = result.stdout, 0, {}
+    for spec in specs:
+        end = out.index(b'\n', pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if len(header) != 3:          # "<spec> missing"
+            continue
+        size = int(header[2])
+        blobs[spec] = out[pos:pos + size].decode('utf-8')
+        pos += size + 1
+    return blobs
+
+
+def _src_data_index() -> dict:
+    """
+    {folder: {id: record-or-None}} for the folders a link touches, from the
+    working tree plus origin/src-data. Component records are loaded (for the
+    realm); for the other folders only the ids matter.
+    """
+    index = {folder: {} for folder in _INDEX_FOLDERS}
+    for folder in _INDEX_FOLDERS:
+        directory = os.path.join(_WORKSPACE, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if name.endswith('.json') and not name.startswith('_'):
+                index[folder][name[:-5]] = None
+
+    with _timing.span('git ls-tree src-data', kind=kind):
+        listing = _timing.run(
+            ['git', 'ls-tree', '-r', '--full-tree', '--name-only', f'origin/{_BRANCH}', '--', *_INDEX_FOLDERS],
+            capture_output=True, text=True, cwd=_WORKSPACE,
+        )
+    remote = set()
+    if listing.returncode == 0:
+        for path in listing.stdout.splitlines():
+            folder, _, name = path.partition('/')
+            if folder in index and name.endswith('.json') and not name.startswith('_'):
+                index[folder].setdefault(name[:-5], None)
+                remote.add(path)
+
+    components = index['model_component']
+    for component_id in components:
+        full = os.path.join(_WORKSPACE, 'model_component', f'{component_id}.json')
+        try:
+            with open(full, encoding='utf-8') as f:
+                components[component_id] = json.load(f)
+        except (OSError, ValueError):
+            pass
+    missing = [f'origin/{_BRANCH}:model_component/{c}.json' for c, rec in components.items()
+               if rec is None and f'model_component/{c}.json' in remote]
+    with _timing.span('git cat-file model_component', kind=kind):
+        for spec, text in _read_blobs(missing).items():
+            try:
+                components[spec.rsplit('/', 1)[1][:-5]] = json.loads(text)
+            except ValueError:
+                pass
+    return index
+
+
+def _ids(cell: str) -> list:
+    """'h101, h102' -> ['h101', 'h102']; a blank or placeholder cell -> ['']."""
+    ids = [_clean(x) for x in cell.replace(';', ',').split(',')]
+    ids = [x for x in ids if x not in _PLACEHOLDER]
+    return ids or ['']
+
+
+def _parse_matrix(text: str) -> list:
+    """Batch table -> [(line_no, component, h_grid, v_grid), ...], rows expanded."""
+    links = []
+    for line_no, line in enumerate((text or '').splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('```') or set(line) <= set('|-: '):
+            continue
+        cells = [c.strip() for c in line.strip('|').split('|' if '|' in line else '\t')]
+        if len(cells) == 1:
+            cells = line.split()
+        cells += [''] * (3 - len(cells))
+        if cells[0].lower() in {'component', 'model_component', 'model component'}:
+            continue
+        for component in _ids(cells[0]):
+            for h_grid in _ids(cells[1]):
+                for v_grid in _ids(cells[2]):
+                    links.append((line_no, component, h_grid, v_grid))
+    return links
+
+
+def _config_record(config_id: str, component: str, h_grid: str, v_grid: str) -> dict:
+    return {
+        'validation_key':                config_id,
+        'ui_label':                      config_id,
+        'description':                   '',
+        'horizontal_computational_grid': h_grid if h_grid not in _PLACEHOLDER else '',
+        'model_component':               component,
+        'vertical_computational_grid':   v_grid if v_grid not in _PLACEHOLDER else '',
+        '@context':                      '_context',
+        '@type':                         ['emd', 'wcrp:component_config', 'esgvoc:ComponentConfig'],
+        '@id':                           config_id,
+    }
+
+
+def _run_batch(table: str, parsed_issue, issue, dry_run=False):
+    """run() for a batch table: resolve every link, write every new config, push once."""
+    issue_num = issue.get('number') or issue.get('issue_number')
+    links = _parse_matrix(table)
+
+    with _timing.span('src-data index', kind=kind):
+        index = _src_data_index()
+
+    errors, created, existing, seen = [], {}, [], set()
+    for line_no, component, h_grid, v_grid in links:
+        if not component:
+            errors.append((line_no, 'no component'))
+            continue
+        if component not in index['model_component']:
+            errors.append((line_no, f'unknown model_component `{component}`'))
+            continue
+        if h_grid and h_grid not in index['horizontal_computational_grid']:
+            errors.append((line_no, f'unknown horizontal_computational_grid `{h_grid}`'))
+            continue
+        if v_grid and v_grid not in index['vertical_computational_grid']:
+            errors.append((line_no, f'unknown vertical_computational_grid `{v_grid}`'))
+            continue
+        config_id = _build_config_id(_realm(index['model_component'][component] or {}),
+                                     component, h_grid, v_grid)
+        if config_id in seen:
+            continue
+        seen.add(config_id)
+        if config_id in index['component_config']:
+            existing.append(config_id)
+        else:
+            created[os.path.join('component_config', f'{config_id}.json')] = \
+                _config_record(config_id, component, h_grid, v_grid)
+
+    if errors or not links:
+        rows = '\n'.join(f'| {line_no} | {problem} |' for line_no, problem in errors)
+        msg = (
+            '## ❌ Cannot link components\n\n'
+            + (f'{len(errors)} row(s) could not be resolved, so nothing was pushed. '
+               f'Fix these rows and edit the issue to re-run.\n\n'
+               f'| Line | Problem |\n|---:|---|\n{rows}'
+               if errors else 'The batch table has no rows.')
+        )
+        print(f'\033[91m  ✗ {len(errors) or "no"} invalid batch row(s)\033[0m', flush=True)
+        for line_no, problem in errors:
+            print(f'    line {line_no}: {problem}', flush=True)
+        if not dry_run and issue_num:
+            _post_comment(issue_num, msg)
+        return None
+
+    for config_id in existing:
+        print(f'\033[93m  = {config_id} (exists)\033[0m', flush=True)
+    for config_path in created:
+        print(f'\033[92m  + {config_path}\033[0m', flush=True)
+
+    contributors = _contributors(parsed_issue)
+    if dry_run:
+        return {
+            **created,
+            '_author':       issue.get('author'),
+            '_contributors': contributors,
+            '_make_pull':    False,
+            '_config_ids':   [d['@id'] for d in created.values()] + existing,
+        }
+
+    if created:
+        ok = _push_files_to_src_data(
+            created, f'Add {len(created)} component_config records',
+            author=issue.get('author', ''), collaborators=contributors,
+        )
+        if not ok:
+            print(f'\033[91m  ✗ Push failed — issue left open.\033[0m', flush=True)
+            sys.exit(1)
+        print(f'\033[92m  ✅ Pushed {len(created)} config(s) to {_BRANCH}\033[0m', flush=True)
+
+    rows = [f'| `{d["@id"]}` | created | [{p}]({_BASE_URL}/{p}) |' for p, d in created.items()]
+    rows += [f'| `{c}` | already existed | [component_config/{c}.json]'
+             f'({_BASE_URL}/component_config/{c}.json) |' for c in existing]
+    msg = (
+        f'## ✅ Component configurations linked\n\n'
+        f'{len(created)} new, {len(existing)} already on `{_BRANCH}`.\n\n'
+        f'| Config ID | Status | File |\n|---|---|---|\n' + '\n'.join(rows) + '\n\n'
+        f'Use these IDs in Stage 4 (Model) under `component_configs`.\n\n'
+        f'_This issue has been closed automatically._'
+    )
+    if issue_num:
+        _rename_issue(issue_num, f'{len(created) + len(existing)} configs')
+        _post_comment(issue_num, msg)
+        _close_issue(issue_num)
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Entry points
 # ---------------------------------------------------------------------------
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
+    # issue form heading "### Batch links" parses to 'batch_links'
+    table = (parsed_issue.get('batch_links') or '').strip()
+    if table.lower() not in _PLACEHOLDER:
+        return _run_batch(table, parsed_issue, issue, dry_run)
+
     component = _clean(parsed_issue.get('model_component') or '')
     h_grid    = _clean(parsed_issue.get('horizontal_grid') or
                        parsed_issue.get('horizontal_computational_grid') or '')
@@ -241,22 +500,8 @@ def run(parsed_issue, issue, dry_run=False):
         return None   # signal to new_issue.py: nothing further to do
 
     # ── Build the config record ────────────────────────────────────────────
-    config_data = {
-        'validation_key':                config_id,
-        'ui_label':                      config_id,
-        'description':                   '',
-        'horizontal_computational_grid': h_grid if h_grid not in _PLACEHOLDER else '',
-        'model_component':               component,
-        'vertical_computational_grid':   v_grid if v_grid not in _PLACEHOLDER else '',
-        '@context':                      '_context',
-        '@type':                         ['emd', 'wcrp:component_config', 'esgvoc:ComponentConfig'],
-        '@id':                           config_id,
-    }
-
-    collab_str   = parsed_issue.get('additional_collaborators',
-                                    parsed_issue.get('collaborators', ''))
-    contributors = [c.strip() for c in collab_str.split(',') if c.strip()] \
-                   if collab_str else []
+    config_data  = _config_record(config_id, component, h_grid, v_grid)
+    contributors = _contributors(parsed_issue)
 
     # ── Push directly to src-data ──────────────────────────────────────────
     if not dry_run:
@@ -299,12 +544,15 @@ def run(parsed_issue, issue, dry_run=False):
         }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
     """
     update() is called after the PR/push path. For this handler run() either
     returns None (handled inline) or, in dry_run, returns the dict. Either
     way there is nothing extra to do here.
     """
-    config_id = files_to_write.get('_config_id', '') if files_to_write else ''
-    if config_id:
+    config_ids = []
+    if files_to_write:
+        config_ids = files_to_write.get('_config_ids') or [files_to_write.get('_config_id', '')]
+    for config_id in filter(None, config_ids):
         print(f'\033[92m  Config ID: {config_id}\033[0m', flush=True)
@@ -13,21 +13,22 @@ Schema field names (from esgvoc):
 import os
 import re
 import json
-import importlib.util as _importlib_util
+import sys
 # from cmipld.utils.similarity import ReportBuilder  # disabled for non-grid types
-from cmipld.utils import crs as _crs
 
-# Load sibling helper by absolute path (handler runs with arbitrary cwd)
-_spec = _importlib_util.spec_from_file_location(
-    '_name_similarity',
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), '_name_similarity.py'),
-)
-_name_similarity = _importlib_util.module_from_spec(_spec)
-_spec.loader.exec_module(_name_similarity)
-build_similarity_report = _name_similarity.build_similarity_report
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
+
+def build_similarity_report(proposed_id: str, folder: str) -> str:
+    # _name_similarity is only needed in update(); load it there, not on import.
+    return _registry.helper('_name_similarity').build_similarity_report(proposed_id, folder)
+
+
 FIELD_MAP = {
     'model_name':           None,           # handled explicitly → validation_key + ui_label
     'model_family':         'family',
@@ -140,6 +141,7 @@ def _parse_embedded(raw) -> list:
 
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
     source_id = (parsed_issue.get('model_name') or parsed_issue.get('name') or '').strip()
     if not source_id:
@@ -228,6 +230,7 @@ def run(parsed_issue, issue, dry_run=False):
     dynamic = [_norm_component(c) for c in
                (data.get('dynamic_components', []) +
                 data.get('prescribed_components', []))]
+    from cmipld.utils import crs as _crs
     crs_errors = _crs.validate(dynamic, embedded_pairs, coupling_groups)
     if crs_errors:
         for e in crs_errors:
@@ -251,6 +254,7 @@ def run(parsed_issue, issue, dry_run=False):
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
     source_id  = files_to_write.get('_source_id', '')
     model_path = next((p for p in files_to_write if not p.startswith('_')), None)
@@ -271,6 +275,7 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
         if crs_val:
             print(f"\033[92m\n  CRS: {crs_val}\033[0m", flush=True)
             try:
+                from cmipld.utils import crs as _crs
                 parsed = _crs.parse(crs_val)
                 if parsed['embeddings']:
                     print("\033[92m  Embeddings:\033[0m", flush=True)
@@ -292,7 +297,8 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
         # Lightweight check: flag suspiciously similar existing names in the same folder.
         folder = os.path.dirname(file_path) or 'model'
         proposed_id = data.get('@id') or source_id
-        data['_validation_report'] = build_similarity_report(proposed_id, folder)
+        with _timing.span('name_similarity', folder=folder):
+            data['_validation_report'] = build_similarity_report(proposed_id, folder)
 
     if model_data and source_id:
         clean = {k: v for k, v in model_data.items() if not k.startswith('_')}
@@ -13,20 +13,22 @@ e.g.  ocean_nemo-v3-6_h101_v103
 
 import os
 import re
-import importlib.util as _importlib_util
+import sys
 # from cmipld.utils.similarity import ReportBuilder  # disabled for non-grid types
 
-# Load sibling helper by absolute path (handler runs with arbitrary cwd)
-_spec = _importlib_util.spec_from_file_location(
-    '_name_similarity',
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), '_name_similarity.py'),
-)
-_name_similarity = _importlib_util.module_from_spec(_spec)
-_spec.loader.exec_module(_name_similarity)
-build_similarity_report = _name_similarity.build_similarity_report
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
+
+def build_similarity_report(proposed_id: str, folder: str) -> str:
+    # _name_similarity is only needed in update(); load it there, not on import.
+    return _registry.helper('_name_similarity').build_similarity_report(proposed_id, folder)
+
+
 IGNORE = {'issue_category', 'additional_collaborators', 'collaborators',
           'component_type', 'component_name', 'component_family',
           'horizontal_grid', 'vertical_grid', 'name'}
@@ -45,6 +47,7 @@ def _parse_list(value: str) -> list:
     return [v.strip() for v in value.split(delim) if v.strip()]
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
     component_type = (parsed_issue.get('component_type') or '').strip().lower().replace('_', '-')
     component_name = (parsed_issue.get('component_name') or '').strip()
@@ -154,9 +157,8 @@ _LINK_FORM_URL = (
 
 def _post_issue_comment(issue_number, body):
     """Post a comment on the original issue via the gh CLI."""
-    import subprocess
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'comment', str(issue_number), '--body', body],
             check=True,
         )
@@ -164,6 +166,7 @@ def _post_issue_comment(issue_number, body):
         print(f'\033[91m  ⚠ Could not post issue comment: {e}\033[0m', flush=True)
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
     config_id   = files_to_write.get('_config_id', '')
     config_path = next((p for p in files_to_write if 'component_config' in p), None)
@@ -223,7 +226,8 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
         # Lightweight check: flag suspiciously similar existing names in the same folder.
         folder = os.path.dirname(file_path)
         proposed_id = data.get('@id', '')
-        data['_validation_report'] = build_similarity_report(proposed_id, folder)
+        with _timing.span('name_similarity', folder=folder):
+            data['_validation_report'] = build_similarity_report(proposed_id, folder)
 
     if config_id and config_data:
         import json
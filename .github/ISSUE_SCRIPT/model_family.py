@@ -7,20 +7,22 @@ Handles both:
 """
 
 import os
-import importlib.util as _importlib_util
+import sys
 # from cmipld.utils.similarity import ReportBuilder  # disabled for non-grid types
 
-# Load sibling helper by absolute path (handler runs with arbitrary cwd)
-_spec = _importlib_util.spec_from_file_location(
-    '_name_similarity',
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), '_name_similarity.py'),
-)
-_name_similarity = _importlib_util.module_from_spec(_spec)
-_spec.loader.exec_module(_name_similarity)
-build_similarity_report = _name_similarity.build_similarity_report
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
+
+def build_similarity_report(proposed_id: str, folder: str) -> str:
+    # _name_similarity is only needed in update(); load it there, not on import.
+    return _registry.helper('_name_similarity').build_similarity_report(proposed_id, folder)
+
+
 # Fields that come in as comma- or newline-separated strings → lists
 LIST_FIELDS = {'collaborative_institutions', 'scientific_domains', 'reference_dois'}
 
@@ -53,6 +55,7 @@ def _parse_list(value) -> list:
     return [v.strip() for v in parts if v.strip()]
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
     family_name = parsed_issue.get('family_name') or parsed_issue.get('name') or ''
     if not family_name:
@@ -137,6 +140,7 @@ def run(parsed_issue, issue, dry_run=False):
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
     for file_path, data in files_to_write.items():
         if file_path.startswith('_'):
@@ -149,4 +153,5 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
         # Lightweight check: flag suspiciously similar existing names in the same folder.
         folder = os.path.dirname(file_path) or 'model_family'
         proposed_id = data.get('@id', '')
-        data['_validation_report'] = build_similarity_report(proposed_id, folder)
+        with _timing.span('name_similarity', folder=folder):
+            data['_validation_report'] = build_similarity_report(proposed_id, folder)
@@ -11,7 +11,24 @@ Behaviour
    notation are supported, e.g. `metadata.version`.
 4. Try to JSON-parse the value. If it parses (list/number/bool/object/null),
    store it as that type; otherwise store it as a string.
-5. Return the modified file dict so new_issue.py opens a PR for review.
+5. Return the modified file dict so new_issue.py opens a PR for review;
+   the PR's Before/After table is the structural diff of the file
+   (_json_diff), so list values show the items added and removed.
+
+Bulk edits
+----------
+When the "Bulk edits" field is filled in, the single-field inputs are ignored
+and every row of the table is applied instead — one row per edit:
+
+    folder | filename | key | value
+    horizontal_grid_cell | g100 | units | degree
+    horizontal_grid_cell | g101 | grid_mapping | latitude-longitude
+
+(`|`, tab or comma separated; the value is everything after the third
+separator, so JSON lists may contain commas). Each file is loaded once, every
+row is checked with the same rules as above before anything is changed, and
+all errors are reported in one comment. If all rows are valid, the edited
+files come back together: one PR, with a Before/After table for every file.
 
 Error path: posts a comment on the original issue explaining what went wrong
 and returns None so new_issue.py skips the PR creation path.
@@ -19,7 +36,13 @@ and returns None so new_issue.py skips the PR creation path.
 
 import json
 import os
-import subprocess
+import sys
+
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+_json_diff = _registry.helper('_json_diff')
 
 kind = __file__.split('/')[-1].replace('.py', '')  # "modify"
 
@@ -39,6 +62,12 @@ _VALID_FOLDERS = {
     'vertical_computational_grid',
 }
 
+# JSON-LD shorthand -> the key name actually used in the files.
+_KEY_ALIASES = {
+    '@id':   'validation_key',
+    '@type': 'type',
+}
+
 _WORKSPACE = os.environ.get('GITHUB_WORKSPACE', os.getcwd())
 
 
@@ -80,10 +109,155 @@ def _walk_to_key(data: dict, dotted_key: str):
     return cur, leaf, (leaf in cur)
 
 
+def _contributors(parsed_issue) -> list:
+    """Additional collaborators (matches the other handlers' contract)."""
+    collab_str = parsed_issue.get('additional_collaborators',
+                                  parsed_issue.get('collaborators', ''))
+    return [c.strip() for c in collab_str.split(',') if c.strip()] if collab_str else []
+
+
+def _parse_rows(text: str) -> list:
+    """Bulk-edit table -> [(line_no, folder, filename, key, raw_value), ...].
+
+    Accepts `|`-, tab- or comma-separated rows, with or without a markdown
+    header / separator line and code fences. Rows with fewer than four
+    cells come back with the missing cells as ''.
+    """
+    rows = []
+    for line_no, line in enumerate((text or '').splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('```') or set(line) <= set('|-: '):
+            continue
+        if '|' in line:
+            line = line.strip('|')
+            sep = '|'
+        else:
+            sep = '\t' if '\t' in line else ','
+        cells = [c.strip() for c in line.split(sep, 3)]
+        cells += [''] * (4 - len(cells))
+        folder, filename, key, raw = cells
+        if (folder.lower(), filename.lower()) in {('folder', 'filename'), ('folder', 'file')}:
+            continue
+        rows.append((line_no, folder, filename, key.strip('`'), raw))
+    return rows
+
+
+def _apply_rows(rows: list):
+    """Validate and apply every row against the files on disk, in one pass.
+
+    Returns (files, originals, applied, errors): the edited records and their
+    untouched copies by relative path, one dict per applied row, and
+    (line_no, message) for every row that cannot be applied. Nothing should
+    be written if `errors` is non-empty.
+    """
+    files, originals, applied, errors = {}, {}, [], []
+    seen = {}
+    for line_no, folder, filename, key, raw in rows:
+        key = _KEY_ALIASES.get(key, key)
+        if folder not in _VALID_FOLDERS:
+            errors.append((line_no, f'unknown folder `{folder or "(empty)"}`'))
+            continue
+        if filename.lower() in _PLACEHOLDER or key.lower() in _PLACEHOLDER:
+            errors.append((line_no, 'filename and key are required'))
+            continue
+        if not filename.endswith('.json'):
+            filename += '.json'
+        rel_path = os.path.join(folder, filename)
+
+        if rel_path not in files:
+            full_path = os.path.join(_WORKSPACE, rel_path)
+            try:
+                with open(full_path, encoding='utf-8') as f:
+                    files[rel_path] = json.load(f)
+            except FileNotFoundError:
+                errors.append((line_no, f'`{rel_path}` does not exist on `src-data`'))
+                continue
+            except (json.JSONDecodeError, OSError) as e:
+                errors.append((line_no, f'could not read `{rel_path}`: {e}'))
+                continue
+            originals[rel_path] = json.loads(json.dumps(files[rel_path]))
+        data = files[rel_path]
+
+        if (rel_path, key) in seen:
+            errors.append((line_no, f'`{rel_path}` `{key}` is already edited on line {seen[(rel_path, key)]}'))
+            continue
+        seen[(rel_path, key)] = line_no
+
+        parent, leaf, exists = _walk_to_key(data, key)
+        if not exists:
+            errors.append((line_no, f'`{rel_path}` has no field `{key}`'))
+            continue
+        new_value = _parse_value(raw)
+        applied.append({'path': rel_path, 'key': key, 'old': parent[leaf], 'new': new_value})
+        parent[leaf] = new_value
+
+    # Files whose every row failed are not part of the result.
+    edited = {e['path'] for e in applied}
+    files = {p: d for p, d in files.items() if p in edited}
+    originals = {p: d for p, d in originals.items() if p in edited}
+    return files, originals, applied, errors
+
+
+def _run_bulk(table: str, parsed_issue, issue, dry_run=False):
+    """run() for a bulk-edit table: all rows or nothing, one PR."""
+    issue_number  = issue.get('number') or issue.get('issue_number')
+    justification = _clean(parsed_issue.get('justification'))
+
+    rows = _parse_rows(table)
+    if not rows:
+        msg = '## ❌ Cannot modify: the bulk edit table has no rows.'
+        if not dry_run and issue_number:
+            _post_comment(issue_number, msg)
+        return None
+    if justification.lower() in _PLACEHOLDER:
+        msg = '## ❌ Cannot modify: justification is required.'
+        if not dry_run and issue_number:
+            _post_comment(issue_number, msg)
+        return None
+
+    with _timing.span('bulk_validate', kind=kind):
+        files, originals, applied, errors = _apply_rows(rows)
+
+    if errors:
+        msg = '\n'.join([
+            '## ❌ Cannot modify: some bulk edits are invalid',
+            '',
+            f'{len(errors)} of {len(rows)} row(s) could not be applied, so none were. '
+            'Fix these rows and edit the issue to re-run.',
+            '',
+            '| Line | Problem |',
+            '|---:|---|',
+            *(f'| {line_no} | {problem} |' for line_no, problem in errors),
+        ])
+        print(f'\033[91m  ✗ {len(errors)} invalid bulk edit row(s)\033[0m', flush=True)
+        for line_no, problem in errors:
+            print(f'    line {line_no}: {problem}', flush=True)
+        if not dry_run and issue_number:
+            _post_comment(issue_number, msg)
+        return None
+
+    for e in applied:
+        print(f'\033[92m  ✓ {e["path"]}: {e["key"]}\033[0m', flush=True)
+
+    new_title = f'| Modify bulk : {len(applied)} edits in {len(files)} files |'
+    if not dry_run and issue_number:
+        _retitle_issue(issue_number, new_title)
+
+    return {
+        **files,
+        '_author':        issue.get('author'),
+        '_contributors':  _contributors(parsed_issue),
+        '_make_pull':     True,
+        '_justification': justification,
+        '_modify_rows':   applied,
+        '_changes':       {p: _json_diff.diff(originals[p], files[p]) for p in files},
+    }
+
+
 def _post_comment(issue_number, body: str):
     """Best-effort gh comment; never raises."""
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'comment', str(issue_number), '--body', body],
             check=True, cwd=_WORKSPACE,
         )
@@ -94,7 +268,7 @@ def _post_comment(issue_number, body: str):
 def _retitle_issue(issue_number, title: str):
     """Best-effort gh issue title update."""
     try:
-        subprocess.run(
+        _timing.run(
             ['gh', 'issue', 'edit', str(issue_number), '--title', title],
             check=True, cwd=_WORKSPACE,
         )
@@ -106,7 +280,13 @@ def _retitle_issue(issue_number, title: str):
 # Entry points
 # ---------------------------------------------------------------------------
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
+    # issue form heading "### Bulk edits" parses to 'bulk_edits'
+    table = _clean(parsed_issue.get('bulk_edits'))
+    if table.lower() not in _PLACEHOLDER:
+        return _run_bulk(table, parsed_issue, issue, dry_run)
+
     folder        = _clean(parsed_issue.get('folder'))
     filename      = _clean(parsed_issue.get('filename'))
     # issue form heading "### Field name" parses to 'field_name'; 'key' is legacy
@@ -142,12 +322,7 @@ def run(parsed_issue, issue, dry_run=False):
         return None
 
     # ── Map JSON-LD shorthand aliases to the actual key names used in files ──
-    _KEY_ALIASES = {
-        '@id':   'validation_key',
-        '@type': 'type',
-    }
-    if key in _KEY_ALIASES:
-        key = _KEY_ALIASES[key]
+    key = _KEY_ALIASES.get(key, key)
 
     if justification.lower() in _PLACEHOLDER:
         msg = '## ❌ Cannot modify: justification is required.'
@@ -213,6 +388,7 @@ def run(parsed_issue, issue, dry_run=False):
     # ── Apply update ──────────────────────────────────────────────────────
     new_value = _parse_value(raw_val)
     old_value = parent[leaf]
+    original  = json.loads(json.dumps(data))
     parent[leaf] = new_value
 
     print(f'\033[92m  ✓ {rel_path}: {key}\033[0m', flush=True)
@@ -227,49 +403,54 @@ def run(parsed_issue, issue, dry_run=False):
     if not dry_run and issue_number:
         _retitle_issue(issue_number, new_title)
 
-    # ── Build collaborators list (matches the other handlers' contract) ──
-    collab_str = parsed_issue.get('additional_collaborators',
-                                  parsed_issue.get('collaborators', ''))
-    contributors = [c.strip() for c in collab_str.split(',') if c.strip()] \
-                   if collab_str else []
-
     return {
         rel_path:         data,
         '_author':        issue.get('author'),
-        '_contributors':  contributors,
+        '_contributors':  _contributors(parsed_issue),
         '_make_pull':     True,
         '_justification': justification,
         '_modify_key':    key,
         '_modify_old':    old_value,
         '_modify_new':    new_value,
+        '_changes':       {rel_path: _json_diff.diff(original, data)},
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
     """Attach a justification block to the PR description via _validation_report."""
     justification = files_to_write.get('_justification', '') or ''
     mod_key       = files_to_write.get('_modify_key', '') or ''
-    mod_old       = files_to_write.get('_modify_old', '')
-    mod_new       = files_to_write.get('_modify_new', '')
-
-    # Truncate huge values so the report stays readable
-    def _short(v):
-        s = json.dumps(v, ensure_ascii=False)
-        return s if len(s) <= 400 else s[:400] + '…'
+    changes       = files_to_write.get('_changes') or {}
+    bulk_rows     = files_to_write.get('_modify_rows')
 
+    first = True
     for file_path, data in files_to_write.items():
         if file_path.startswith('_'):
             continue
-        report_lines = ['## Modify request', '']
-        if mod_key:
-            report_lines += [
-                f'**Field:** `{mod_key}`',
-                '',
-                '| Before | After |',
-                '|---|---|',
-                f'| `{_short(mod_old)}` | `{_short(mod_new)}` |',
-                '',
-            ]
-        if justification:
-            report_lines += ['### Justification', '', justification]
+        table = _json_diff.to_markdown(changes.get(file_path, []))
+        if bulk_rows is not None:
+            # One PR body: the summary and justification once, then each
+            # file's path over its Before/After table.
+            report_lines = []
+            if first:
+                n_files = sum(1 for p in files_to_write if not p.startswith('_'))
+                report_lines += ['## Bulk modify request', '',
+                                 f'{len(bulk_rows)} edit(s) across {n_files} file(s).', '']
+                if justification:
+                    report_lines += ['### Justification', '', justification, '']
+            report_lines += [f'### `{file_path}`', '',
+                             table or '_No change: the fields already have these values._']
+            first = False
+        else:
+            report_lines = ['## Modify request', '']
+            if mod_key:
+                report_lines += [
+                    f'**Field:** `{mod_key}`',
+                    '',
+                    table or '_No change: the field already has this value._',
+                    '',
+                ]
+            if justification:
+                report_lines += ['### Justification', '', justification]
         data['_validation_report'] = '\n'.join(report_lines)
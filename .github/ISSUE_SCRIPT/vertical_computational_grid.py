@@ -6,14 +6,30 @@ Produces one file per submission:
 
 The tempgrid-rename.yml workflow renames this to v### on merge to src-data,
 scanning existing v### files and assigning max+1.
+
+If an existing v### already has the same coordinate, levels and thicknesses
+(_grid_signatures), no file is produced: the issue is pointed at that v###
+and closed.
+
+The review report is ReportBuilder's field checklist followed by the closest
+existing v### grids (_vgrid_matcher), so a near-duplicate with a slightly
+different thickness is still caught.
 """
 
 import os
 import re
+import sys
 import time
 
-from cmipld.utils.id_generation import generate_id_from_issue
-from cmipld.utils.similarity import ReportBuilder
+# cmipld (id_generation, the similarity / pydantic stack) is imported inside
+# run() / update(), so loading this module to pick a handler stays cheap.
+
+# Shared helpers (see _registry.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _registry  # noqa: E402
+_timing = _registry.helper('_timing')
+_grid_signatures = _registry.helper('_grid_signatures')
+_vgrid_matcher = _registry.helper('_vgrid_matcher')
 
 kind = __file__.split('/')[-1].replace('.py', '')
 
@@ -35,10 +51,13 @@ def _parse_list(value) -> list:
     return [v.strip() for v in str(value).split(delim) if v.strip()]
 
 
+@_timing.timed(f'{kind}.run')
 def run(parsed_issue, issue, dry_run=False):
     if parsed_issue.get('validation_key'):
         return None
 
+    from cmipld.utils.id_generation import generate_id_from_issue
+
     author     = issue.get('author') or 'unknown'
     created_at = issue.get('created_at') or ''
     temp_id    = f"tempgrid_{generate_id_from_issue(author, created_at)['id']}" \
@@ -109,6 +128,14 @@ def run(parsed_issue, issue, dry_run=False):
     contributors = [c.strip() for c in collab_str.split(',') if c.strip()] \
                    if collab_str else []
 
+    # Same coordinate, levels and thicknesses as an existing v###: reuse it.
+    repo_root = os.environ.get('GITHUB_WORKSPACE', os.getcwd())
+    with _timing.span('signature_index', kind=kind):
+        existing = _grid_signatures.find_existing(kind, data, repo_root)
+    if existing:
+        _grid_signatures.close_as_duplicate(issue, kind, existing, _timing, dry_run)
+        return None
+
     print(f"\033[92m  [+ new] Vertical grid '{temp_id}'\033[0m", flush=True)
 
     return {
@@ -120,7 +147,10 @@ def run(parsed_issue, issue, dry_run=False):
     }
 
 
+@_timing.timed(f'{kind}.update')
 def update(files_to_write, parsed_issue, issue, dry_run=False):
+    from cmipld.utils.similarity import ReportBuilder
+
     atid = files_to_write.get('_atid', '')
 
     for file_path, data in files_to_write.items():
@@ -128,13 +158,23 @@ def update(files_to_write, parsed_issue, issue, dry_run=False):
             continue
         print(f"\033[92m  Generating review report for {file_path} ...\033[0m", flush=True)
         try:
-            data['_validation_report'] = ReportBuilder(
-                folder_url=f"emd:{kind}", kind=kind,
-                item=data, link_threshold=80.0,
-            ).build()
+            with _timing.span('report_builder', kind=kind):
+                data['_validation_report'] = ReportBuilder(
+                    folder_url=f"emd:{kind}", kind=kind,
+                    item=data, link_threshold=80.0,
+                ).build()
         except Exception as e:
             print(f"\033[91m  WARNING Report generation failed: {e}\033[0m", flush=True)
             data['_validation_report'] = ''
+        try:
+            with _timing.span('vgrid_nearest', kind=kind):
+                nearest = _vgrid_matcher.build_report(data)
+        except Exception as e:
+            print(f"\033[91m  WARNING Nearest-grid report failed: {e}\033[0m", flush=True)
+            nearest = ''
+        if nearest:
+            data['_validation_report'] = '\n\n'.join(
+                part for part in (data['_validation_report'], nearest) if part)
 
     if atid:
         import json as _json
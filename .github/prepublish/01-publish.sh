@@ -0,0 +1,14 @@
+#!/bin/bash
+# Derive the served files (graph shards, resolved entries, search index,
+# extensionless twins, .gz/.br siblings, manifest) for this deploy.
+# Repository: Essential-Model-Documentation
+#
+# Runs before the production commit, so HEAD is the last published commit
+# and only what changed since then is rewritten. See .github/scripts/publish.py.
+
+set -euo pipefail
+
+# brotli is optional: without it only .gz siblings are written.
+python3 -m pip install --quiet brotli || echo "brotli unavailable: skipping .br siblings"
+
+python3 .github/scripts/publish.py --since HEAD
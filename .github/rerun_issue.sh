@@ -1,22 +1,35 @@
 #!/usr/bin/env bash
 # Manually re-run the New Issue Processing workflow on a single issue.
+# With several issue numbers, all of them are processed in ONE
+# batch-issues.yml job (one PR per issue, shared warm setup).
 #
 # Usage:
-#   .github/rerun_issue.sh <issue_number>
+#   .github/rerun_issue.sh <issue_number> [<issue_number> ...]
 #
 # Example:
 #   .github/rerun_issue.sh 43
+#   .github/rerun_issue.sh 43 44 47
 
 set -euo pipefail
 
 REPO="WCRP-CMIP/Essential-Model-Documentation"
 WORKFLOW="new-issue.yml"
+BATCH_WORKFLOW="batch-issues.yml"
 
 if [[ -z "${1:-}" ]]; then
-    echo "Usage: $0 <issue_number>"
+    echo "Usage: $0 <issue_number> [<issue_number> ...]"
     exit 1
 fi
 
+if [[ $# -gt 1 ]]; then
+    gh workflow run "$BATCH_WORKFLOW" \
+        --repo "$REPO" \
+        --field "issue_numbers=$*"
+    echo "✓ Triggered one batch run for issues: $*"
+    echo "  https://github.com/${REPO}/actions/workflows/${BATCH_WORKFLOW}"
+    exit 0
+fi
+
 ISSUE="$1"
 
 # Show the issue title so you know you're targeting the right one
@@ -7,6 +7,7 @@
 #   .github/rerun_stage.sh "Stage 2"              # dry run, custom pattern
 #   .github/rerun_stage.sh --run                  # trigger workflows, matches 'Stage 1'
 #   .github/rerun_stage.sh "Stage 2" --run        # trigger workflows, custom pattern
+#   .github/rerun_stage.sh "Stage 2" --run --batch  # one batch-issues.yml job for all matches
 #
 # Requires: gh CLI authenticated to WCRP-CMIP/Essential-Model-Documentation
 
@@ -14,13 +15,17 @@ set -euo pipefail
 
 REPO="WCRP-CMIP/Essential-Model-Documentation"
 WORKFLOW="new-issue.yml"
+BATCH_WORKFLOW="batch-issues.yml"
 DRY_RUN=true
+BATCH=false
 PATTERN="Stage 1"  # default
 
-# Parse args: optional --run flag and optional pattern string (either order)
+# Parse args: optional --run / --batch flags and optional pattern string (any order)
 for arg in "$@"; do
     if [[ "$arg" == "--run" ]]; then
         DRY_RUN=false
+    elif [[ "$arg" == "--batch" ]]; then
+        BATCH=true
     else
         PATTERN="$arg"
     fi
@@ -52,6 +57,16 @@ if $DRY_RUN; then
     exit 0
 fi
 
+if $BATCH; then
+    NUMBERS=$(echo "$ISSUES" | cut -f1 | paste -sd ' ')
+    echo "Triggering one '${BATCH_WORKFLOW}' run for issues: ${NUMBERS}"
+    gh workflow run "$BATCH_WORKFLOW" \
+        --repo "$REPO" \
+        --field "issue_numbers=${NUMBERS}"
+    echo "done"
+    exit 0
+fi
+
 echo "Triggering workflow '${WORKFLOW}' for each issue..."
 echo "$ISSUES" | while IFS=$'\t' read -r number title; do
     echo -n "  Triggering #${number} (${title})... "
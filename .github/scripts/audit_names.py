@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+audit_names.py
+==============
+Bulk near-duplicate audit of entry names across the registry.
+
+At submission time _name_similarity checks one proposed id against one
+folder. This runs the same check over every entry of `model`,
+`model_component`, `model_family` and `component_config` at once, comparing
+both the `@id` and the `ui_label` of each, to surface typos and version
+drift that slipped in (`nemo-v3-6` next to `nemo-v3-5`, `cice5` next to
+`cice-5`).
+
+Pairwise SequenceMatcher over a whole folder is quadratic, so candidates come
+from MinHash signatures over character shingles with LSH banding
+(_name_similarity.similar_pairs); only names sharing a bucket are scored.
+
+Usage
+-----
+  python .github/scripts/audit_names.py                           # all four folders
+  python .github/scripts/audit_names.py --folder model_component
+  python .github/scripts/audit_names.py --threshold 0.9
+  python .github/scripts/audit_names.py --json > similar_names.json
+
+Exit code: 0 (pairs are reported, not treated as failures).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+sys.path.insert(0, str(_SCRIPT_DIR.parent / "ISSUE_SCRIPT"))
+
+from emd_registry import Registry  # noqa: E402
+import _registry  # noqa: E402
+
+_name_similarity = _registry.helper('_name_similarity')
+
+AUDITED_FOLDERS = ("model", "model_component", "model_family", "component_config")
+
+
+# =============================================================================
+# Audit
+# =============================================================================
+
+def audit(reg: Registry, folders=AUDITED_FOLDERS,
+          threshold: float = _name_similarity._DEFAULT_THRESHOLD) -> dict[str, list[dict]]:
+    """Return {folder: [{'a', 'b', 'similarity', 'labels'}, ...]}, best first."""
+    result: dict[str, list[dict]] = {}
+    for folder in folders:
+        records = {entry_id: reg.entries[folder][entry_id]
+                   for f, entry_id, _path in reg.files() if f == folder}
+        names = {entry_id: [entry_id, str(record.get("ui_label") or "")]
+                 for entry_id, record in records.items()}
+        result[folder] = [
+            {"a": a, "b": b, "similarity": round(score, 3),
+             "labels": [names[a][1], names[b][1]]}
+            for a, b, score in _name_similarity.similar_pairs(names, threshold)
+        ]
+    return result
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_report(result: dict[str, list[dict]]) -> None:
+    total = sum(len(v) for v in result.values())
+    print(f"\033[94m{total} similar pair(s)\033[0m")
+    for folder, pairs in result.items():
+        if not pairs:
+            continue
+        print(f"\n{folder} ({len(pairs)})")
+        for p in pairs:
+            labels = " / ".join(label for label, entry_id in zip(p["labels"], (p["a"], p["b"]))
+                                if label and label.lower() != entry_id)
+            note = f"  \033[90m{labels}\033[0m" if labels else ""
+            print(f"  {p['similarity']:>5.0%}  {p['a']}  ~  {p['b']}{note}")
+
+
+def write_step_summary(result: dict[str, list[dict]], path: str) -> None:
+    lines = ["## Similar entry names", ""]
+    pairs = [(folder, p) for folder, ps in result.items() for p in ps]
+    if pairs:
+        lines += ["| Type | Entry | Similar to | Similarity |", "|---|---|---|---:|"]
+        lines += [f"| `{folder}` | `{p['a']}` | `{p['b']}` | {p['similarity']:.0%} |"
+                  for folder, p in pairs]
+    else:
+        lines.append("No similar names.")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--folder", action="append", choices=AUDITED_FOLDERS,
+                        help="Only audit this type (repeatable).")
+    parser.add_argument("--threshold", type=float, default=_name_similarity._DEFAULT_THRESHOLD,
+                        help=f"Similarity ratio to report (default: {_name_similarity._DEFAULT_THRESHOLD}).")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    folders = tuple(args.folder or AUDITED_FOLDERS)
+    result = audit(Registry.load(root, folders), folders, args.threshold)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        write_step_summary(result, summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
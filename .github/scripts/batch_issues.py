@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+batch_issues.py
+===============
+Process many emd-submission issues in one warm process.
+
+`rerun_stage.sh` used to trigger one `new-issue.yml` run per issue, and every
+run re-checked out src-data, reinstalled CMIPLD, restarted the LDR server and
+reloaded every graph. This script takes a list of issue numbers and runs
+cmipld's own per-issue entry point (`cmipld.generate.new_issue`, the
+`new_issue --issue N` the workflow calls) for each of them in a single
+interpreter, so the pipeline is exactly the per-issue one — body parsing,
+handler `run()` with the generic `build_data_from_issue` fallback when it
+returns None, JSONValidator validation, `update()`, the failure comments
+and one `issue_<N>_<kind>` PR per issue — while:
+
+  * each handler module in `.github/ISSUE_SCRIPT/` and its helpers are
+    loaded once, and only when an issue in the batch needs them (see
+    ISSUE_SCRIPT/_registry.py),
+  * the CV graphs are prefetched once (shared `_cv_prefetch` table), and
+    only if the batch contains a grid-cell issue,
+  * the cmipld graph / folder caches stay warm across issues.
+
+The steps new-issue.yml runs around new_issue are kept too: an issue with
+`|skip|` in its title is left alone, and each PR opened is added to the
+project board and its number written to GITHUB_OUTPUT (`pr_numbers`) so
+batch-issues.yml can run the tempgrid duplicate check on it.
+
+An issue whose processing fails validation exits new_issue non-zero (it has
+already commented on the issue); an unexpected exception is reported on the
+issue here, as the workflow run failure would have been.
+
+Stage, gh/git and graph-fetch timings are recorded through the shared
+`_timing` helper and summarised at exit (see ISSUE_SCRIPT/_timing.py).
+
+Usage
+-----
+  python .github/scripts/batch_issues.py 412 413 414            # dry run
+  python .github/scripts/batch_issues.py 412,413,414 --run      # open PRs
+  python .github/scripts/batch_issues.py --pattern "Stage 1" --run
+
+Requirements
+------------
+  gh CLI authenticated:  gh auth status
+  cmipld installed, src-data checked out in the workspace, LDR server
+  running (as new-issue.yml)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+
+
+REPO_DEFAULT = os.environ.get('GITHUB_REPOSITORY', 'WCRP-CMIP/Essential-Model-Documentation')
+BASE_BRANCH  = 'src-data'
+PROJECT      = '8'    # project board new-issue.yml adds every PR to
+
+# new-issue.yml's skip flag: `|skip|` in the title leaves the issue alone.
+SKIP_TITLE = re.compile(r'\|\s*skip\s*\|')
+
+_SCRIPT_DIR  = Path(__file__).resolve().parent
+HANDLER_DIR  = _SCRIPT_DIR.parent / 'ISSUE_SCRIPT'
+_WORKSPACE   = Path(os.environ.get('GITHUB_WORKSPACE', os.getcwd()))
+
+sys.path.insert(0, str(HANDLER_DIR))
+import _registry  # noqa: E402
+
+_timing = _registry.helper('_timing')
+
+
+# =============================================================================
+# Issue fetching and parsing
+# =============================================================================
+
+def gh(args: list[str]) -> str:
+    """Run gh and return stdout (raises on failure)."""
+    result = _timing.run(['gh', *args], capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def fetch_issue(repo: str, number: int | str) -> dict:
+    """Fetch one issue and normalise it to the dict shape handlers expect."""
+    raw = json.loads(gh([
+        'issue', 'view', str(number), '--repo', repo,
+        '--json', 'title,body,author,labels,number,createdAt',
+    ]))
+    return {
+        'number':     raw.get('number'),
+        'title':      raw.get('title', ''),
+        'body':       raw.get('body') or '',
+        'author':     (raw.get('author') or {}).get('login', ''),
+        'created_at': raw.get('createdAt', ''),
+        'labels':     [l.get('name', '') for l in raw.get('labels') or []],
+    }
+
+
+def find_issue_numbers(repo: str, pattern: str) -> list[int]:
+    """Return open issue numbers whose title matches `pattern` (as rerun_stage.sh)."""
+    issues = json.loads(gh([
+        'issue', 'list', '--repo', repo, '--state', 'open',
+        '--limit', '200', '--json', 'number,title',
+    ]))
+    rx = re.compile(pattern, re.IGNORECASE)
+    return sorted(i['number'] for i in issues if rx.search(i.get('title', '')))
+
+
+# =============================================================================
+# Handler loading
+# =============================================================================
+
+def handler_kind(labels: list[str], handler_dir: Path = HANDLER_DIR) -> str | None:
+    """Return the first label that names a handler script, else None (no import)."""
+    return _registry.for_dir(handler_dir).kind_for_labels(labels)
+
+
+def warm_up(kinds: list[str], handler_dir: Path = HANDLER_DIR) -> None:
+    """Prefetch shared state once before the first issue — only what `kinds` need.
+
+    The CV graphs are only used by the grid-cell handler; a batch of modify
+    or model issues skips them (and cmipld) entirely.
+    """
+    if 'horizontal_grid_cell' in kinds:
+        with _timing.span('cv_prefetch', 'network'):
+            _registry.helper('_cv_prefetch', handler_dir).prefetch_cv_maps()
+
+
+# =============================================================================
+# Per-issue processing
+# =============================================================================
+
+def _new_issue() -> ModuleType:
+    """cmipld's per-issue pipeline, imported once on first use."""
+    from cmipld.generate import new_issue
+    return new_issue
+
+
+def run_new_issue(issue: dict, dry_run: bool) -> int:
+    """Run `new_issue --issue N [--dry-run]` in this process; returns its exit code."""
+    argv = ['new_issue', '--issue', str(issue['number'])] + (['--dry-run'] if dry_run else [])
+    saved_argv, sys.argv = sys.argv, argv
+    # The environment new-issue.yml gives the step.
+    os.environ.update({
+        'ISSUE_NUMBER':     str(issue['number']),
+        'ISSUE_SUBMITTER':  issue['author'],
+        'ISSUE_CREATED_AT': issue['created_at'],
+    })
+    try:
+        result = _new_issue().main()
+    except SystemExit as e:
+        result = e.code
+    finally:
+        sys.argv = saved_argv
+    if result in (None, 0):
+        return 0
+    return result if isinstance(result, int) else 1
+
+
+def _git(*args: str, check: bool = True) -> subprocess.CompletedProcess:
+    return _timing.run(['git', *args], cwd=_WORKSPACE, check=check,
+                       capture_output=True, text=True)
+
+
+def find_pull_request(repo: str, number: int) -> dict | None:
+    """{'number', 'url'} of the open PR new_issue made for issue N (branch `*_<N>_*`).
+
+    Retried for up to 8 s as in new-issue.yml: a new PR takes a moment to
+    show up in the list.
+    """
+    pattern = re.compile(rf'_{number}_|[-_]{number}$')
+    for attempt in range(4):
+        if attempt:
+            time.sleep(2)
+        prs = json.loads(gh(['pr', 'list', '--repo', repo, '--state', 'open', '--limit', '200',
+                             '--json', 'number,url,headRefName']))
+        pr = next((pr for pr in prs if pattern.search(pr.get('headRefName', ''))), None)
+        if pr:
+            return {'number': pr['number'], 'url': pr['url']}
+    return None
+
+
+def add_to_project(repo: str, url: str) -> None:
+    """Add a PR to the project board; a failure is only reported (as new-issue.yml)."""
+    try:
+        gh(['project', 'item-add', PROJECT, '--owner', repo.split('/')[0], '--url', url])
+    except subprocess.CalledProcessError as e:
+        print(f'  ⚠ could not add {url} to project #{PROJECT} '
+              f'(check the token\'s project scope): {e}', flush=True)
+
+
+def report_failure(repo: str, number: int, error: Exception) -> None:
+    """Tell the submitter, as a failed new-issue.yml run would have."""
+    body = (f'⚠️ **Processing failed** in a batch re-run: `{type(error).__name__}: {error}`\n\n'
+            'No PR was created or updated. A maintainer will look into it; editing the '
+            'issue re-runs the processing.')
+    try:
+        gh(['issue', 'comment', str(number), '--repo', repo, '--body', body])
+    except subprocess.CalledProcessError as e:
+        print(f'  ⚠ could not comment on #{number}: {e}', flush=True)
+
+
+def process_issue(repo: str, issue: dict, dry_run: bool = True) -> dict:
+    """Run one issue end to end. Returns a summary row for the final table."""
+    row = {'issue': issue['number'], 'kind': handler_kind(issue.get('labels') or []),
+           'pr': None, 'status': ''}
+    if SKIP_TITLE.search(issue.get('title', '')):
+        row['status'] = 'skipped (|skip| in title)'
+        return row
+    try:
+        with _timing.span('new_issue', issue=issue['number'], kind=row['kind']):
+            code = run_new_issue(issue, dry_run)
+    except Exception as e:
+        if not dry_run:
+            report_failure(repo, issue['number'], e)
+        raise
+    finally:
+        # new_issue leaves the workspace on the issue branch; the next issue
+        # must start from src-data again.
+        _git('checkout', '--force', BASE_BRANCH, check=False)
+
+    if code != 0:
+        row['status'] = 'validation failed'
+    elif dry_run:
+        row['status'] = 'dry run'
+    else:
+        pr = find_pull_request(repo, issue['number'])
+        row['status'] = 'PR opened' if pr else 'no PR'
+        if pr:
+            row['pr'], row['pr_number'] = pr['url'], pr['number']
+            add_to_project(repo, pr['url'])
+    return row
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def _parse_numbers(values: list[str]) -> list[int]:
+    numbers: list[int] = []
+    for v in values:
+        numbers += [int(n) for n in re.split(r'[,\s]+', v) if n.strip()]
+    return numbers
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('issues', nargs='*', help='Issue numbers (space or comma separated).')
+    parser.add_argument('--pattern', help='Select open issues whose title matches this regex.')
+    parser.add_argument('--repo', default=REPO_DEFAULT)
+    parser.add_argument('--run', action='store_true',
+                        help='Write files and open PRs (default: dry run).')
+    args = parser.parse_args()
+
+    numbers = _parse_numbers(args.issues)
+    if args.pattern:
+        numbers += find_issue_numbers(args.repo, args.pattern)
+    numbers = sorted(set(numbers))
+    if not numbers:
+        print('No issues selected.')
+        return 0
+
+    dry_run = not args.run
+    print(f'Processing {len(numbers)} issue(s){" (dry run)" if dry_run else ""}...', flush=True)
+
+    issues: dict[int, dict | Exception] = {}
+    for number in numbers:
+        try:
+            issues[number] = fetch_issue(args.repo, number)
+        except Exception as e:
+            issues[number] = e
+    warm_up([handler_kind(i['labels']) for i in issues.values() if isinstance(i, dict)])
+
+    rows = []
+    for number, issue in issues.items():
+        print(f'\n{"═" * 70}\n  Issue #{number}', flush=True)
+        try:
+            if isinstance(issue, Exception):
+                raise issue
+            row = process_issue(args.repo, issue, dry_run=dry_run)
+        except Exception as e:
+            print(f'\033[91m  ✗ #{number} failed: {e}\033[0m', flush=True)
+            row = {'issue': number, 'kind': None, 'pr': None,
+                   'status': f'error: {type(e).__name__}'}
+        rows.append(row)
+
+    print(f'\n{"═" * 70}')
+    print(f'  {"ISSUE":>6}  {"KIND":<32}  STATUS')
+    for r in rows:
+        print(f'  #{r["issue"]:>5}  {r["kind"] or "-":<32}  {r["status"]}  {r["pr"] or ""}')
+
+    summary = os.environ.get('GITHUB_STEP_SUMMARY')
+    if summary:
+        with open(summary, 'a', encoding='utf-8') as f:
+            f.write('## Batch issue processing\n\n| Issue | Kind | Status | PR |\n|---|---|---|---|\n')
+            for r in rows:
+                f.write(f'| #{r["issue"]} | {r["kind"] or "–"} | {r["status"]} | {r["pr"] or "–"} |\n')
+
+    # The PRs opened, for the workflow's per-PR tempgrid duplicate check.
+    output = os.environ.get('GITHUB_OUTPUT')
+    if output:
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(f'pr_numbers={json.dumps([r["pr_number"] for r in rows if r.get("pr_number")])}\n')
+
+    return 1 if any(r['status'].startswith(('error', 'validation')) for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+============
+Time the EMD tooling against synthetic src-data trees of increasing size.
+
+Each scale generates a throw-away registry shaped on the handlers' ALL_KEYS
+schemas (grid cells, subgrids, computational grids, vertical grids,
+components, configs, models, families), with the folders in the same
+proportions as the live tree, the real `_context` files, and a few tempgrid
+files (half of them duplicates of an existing entry). Then it times:
+
+  find_grid_matches   find_best_match() for a batch of candidate grid cells
+  grid_self_join      find_grid_matches.self_join() over all grid cells
+  name_similarity     _name_similarity.find_similar_names() on components/families
+  name_audit          audit_names.audit() (MinHash/LSH) over the four named folders
+  vgrid_nearest       _vgrid_matcher.nearest() for a batch of candidate vertical grids
+  emd_query           emd_query index build + save + reload, then a batch of filter/join queries
+  search_index        search_index.build() over every entry, then a batch of prefix searches
+  scan_cv_fields      CVFieldScanner.scan_all()
+  validate_grid_types GridTypeValidator.run_validation()
+  check_links         check_links.check_file(offline=True) on every file
+  check_integrity     check_integrity.check_registry() over the whole tree
+  tempgrid_rename     tempgrid_ids.py, the duplicate check + next-ID scan of tempgrid-rename.yml
+
+Results are written as JSON keyed by scale and benchmark, so two runs (e.g.
+before/after a change) can be compared with --compare.
+
+Usage
+-----
+  python .github/scripts/benchmark.py                              # 1k, 10k, 100k
+  python .github/scripts/benchmark.py --scales 1000 5000 --output bench.json
+  python .github/scripts/benchmark.py --only check_links name_similarity
+  python .github/scripts/benchmark.py --output new.json --compare old.json
+
+Requirements
+------------
+  Python 3.9+ (stdlib only).
+
+Exit code: 0, or 1 when --compare finds a benchmark slower than --tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_REPO_ROOT = _SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+import audit_names  # noqa: E402
+import check_links  # noqa: E402
+import emd_query  # noqa: E402
+import search_index  # noqa: E402
+from check_integrity import check_registry  # noqa: E402
+from emd_registry import Registry  # noqa: E402
+from find_grid_matches import find_best_match, load_registry, self_join  # noqa: E402
+from scan_cv_fields import CVFieldScanner  # noqa: E402
+from validate_grid_types import GridTypeValidator  # noqa: E402
+
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+
+# Entries per folder in the live registry; synthetic trees keep these ratios.
+FOLDER_WEIGHTS = {
+    'horizontal_grid_cell':          91,
+    'horizontal_subgrid':            67,
+    'horizontal_computational_grid': 32,
+    'vertical_computational_grid':   48,
+    'model_component':               62,
+    'component_config':              62,
+    'model':                          9,
+    'model_family':                  59,
+}
+
+TEMPGRID_FOLDERS = ('horizontal_grid_cell', 'horizontal_computational_grid',
+                    'vertical_computational_grid')
+TEMPGRIDS_PER_FOLDER = 4
+
+# Proposals / candidates timed per scale.
+N_QUERIES = 20
+
+_TYPES = {
+    'horizontal_grid_cell':          'HorizontalGridCell',
+    'horizontal_subgrid':            'HorizontalSubgrid',
+    'horizontal_computational_grid': 'HorizontalComputationalGrid',
+    'vertical_computational_grid':   'VerticalComputationalGrid',
+    'model_component':               'ModelComponent',
+    'component_config':              'ComponentConfig',
+    'model':                         'Model',
+    'model_family':                  'ModelFamily',
+}
+
+_SYLLABLES = ('can', 'am', 'nemo', 'cice', 'ec', 'earth', 'mom', 'um', 'jules',
+              'clm', 'cam', 'arp', 'ege', 'ifs', 'icon', 'mpas', 'awi', 'fesom',
+              'mri', 'miroc', 'gfdl', 'ccsm', 'noah', 'lpj', 'oasis', 'hadg')
+_DOMAINS = ('atmosphere', 'ocean', 'sea-ice', 'land-surface', 'aerosol',
+            'ocean-biogeochemistry', 'atmospheric-chemistry', 'land-ice')
+_CELL_VARIABLE_TYPES = ('mass', 'x-velocity', 'y-velocity', 'velocity')
+_ARRANGEMENTS = ('arakawa-a', 'arakawa-b', 'arakawa-c', 'arakawa-d', 'arakawa-e')
+_VERTICAL_COORDS = ('height', 'pressure', 'sigma', 'hybrid-sigma-pressure',
+                    'ocean-s-coordinate', 'z-star', 'isopycnal')
+
+# =============================================================================
+# Synthetic registry
+# =============================================================================
+
+def _split(n: int) -> dict[str, int]:
+    """Distribute n entries over the folders by FOLDER_WEIGHTS (at least 1 each)."""
+    total = sum(FOLDER_WEIGHTS.values())
+    return {folder: max(1, round(n * w / total)) for folder, w in FOLDER_WEIGHTS.items()}
+
+
+def _envelope(folder: str, entry_id: str, record: dict) -> dict:
+    return {
+        **record,
+        '@context': '_context',
+        '@type': ['emd', f'wcrp:{folder}', f'esgvoc:{_TYPES[folder]}'],
+        '@id': entry_id,
+    }
+
+
+def _write(root: Path, folder: str, entry_id: str, record: dict) -> None:
+    with open(root / folder / f'{entry_id}.json', 'w', encoding='utf-8') as f:
+        json.dump(_envelope(folder, entry_id, record), f, indent=4)
+
+
+def _name(rng: random.Random, taken: set[str]) -> str:
+    """A plausible model-ish name (e.g. 'canam5-1'); near-misses are intended."""
+    while True:
+        name = (rng.choice(_SYLLABLES) + rng.choice(_SYLLABLES)
+                + f'{rng.randint(1, 9)}-{rng.randint(0, 9)}')
+        if rng.random() < 0.3:
+            name += f'-{rng.choice(_DOMAINS)}'
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def grid_cell_record(rng: random.Random, key: str) -> dict:
+    valid = CVFieldScanner.VALID_KEYS
+    res = rng.choice((0.25, 0.5, 0.75, 0.9, 1.0, 1.25, 1.5, 2.0, 2.5))
+    spectral = rng.random() < 0.2
+    return {
+        'validation_key': key,
+        'ui_label': '',
+        'description': '',
+        'alias': [],
+        'grid_mapping': rng.choice(sorted(valid['grid_mapping'])),
+        'grid_type': rng.choice(sorted(valid['grid_type'])),
+        'n_cells': rng.randint(1_000, 5_000_000),
+        'region': [rng.choice(sorted(valid['region']))],
+        'southernmost_latitude': rng.choice((-90.0, -89.5, -78.0, '')),
+        'temporal_refinement': 'static',
+        'truncation_method': rng.choice(sorted(valid['truncation_method'])) if spectral else '',
+        'truncation_number': rng.randint(31, 1279) if spectral else '',
+        'units': 'degree',
+        'westernmost_longitude': rng.choice((0.0, 0.5, -180.0, '')),
+        'x_resolution': res,
+        'y_resolution': rng.choice((res, res * 0.75)),
+    }
+
+
+def hgrid_record(rng: random.Random, key: str, subgrids: list[str]) -> dict:
+    return {
+        'validation_key': key,
+        'ui_label': '',
+        'description': '',
+        'arrangement': rng.choice(_ARRANGEMENTS),
+        'horizontal_subgrids': sorted(rng.sample(subgrids, min(len(subgrids), rng.randint(1, 3)))),
+    }
+
+
+def vgrid_record(rng: random.Random, key: str) -> dict:
+    n_z = rng.randint(10, 150)
+    return {
+        'validation_key': key,
+        'ui_label': '',
+        'description': '',
+        'vertical_coordinate': rng.choice(_VERTICAL_COORDS),
+        'n_z': n_z,
+        'n_z_range': '',
+        'top_layer_thickness': rng.choice((1.0, 2.0, 10.0, '')),
+        'bottom_layer_thickness': rng.choice((100.0, 250.0, 500.0, '')),
+        'total_thickness': rng.choice((5500.0, 6000.0, 80000.0, '')),
+    }
+
+
+def generate_tree(root: Path, n: int, seed: int = 0) -> dict[str, int]:
+    """Write a synthetic registry of ~n entries under root; return per-folder counts."""
+    rng = random.Random(seed)
+    counts = _split(n)
+    for folder in FOLDER_WEIGHTS:
+        (root / folder).mkdir(parents=True, exist_ok=True)
+        shutil.copy(_REPO_ROOT / folder / '_context', root / folder / '_context')
+
+    cells = [f'g{100 + i}' for i in range(counts['horizontal_grid_cell'])]
+    cell_records = {}
+    for cell in cells:
+        cell_records[cell] = grid_cell_record(rng, cell)
+        _write(root, 'horizontal_grid_cell', cell, cell_records[cell])
+
+    subgrids = []
+    for i in range(counts['horizontal_subgrid']):
+        cell = cells[i % len(cells)]
+        cvt = _CELL_VARIABLE_TYPES[(i // len(cells)) % len(_CELL_VARIABLE_TYPES)]
+        sid = f'{cell}-{cvt}' if i < len(cells) * len(_CELL_VARIABLE_TYPES) else f'{cell}-{cvt}-{i}'
+        subgrids.append(sid)
+        _write(root, 'horizontal_subgrid', sid, {
+            'validation_key': sid, 'ui_label': '', 'description': '',
+            'cell_variable_type': [cvt], 'horizontal_grid_cells': cell,
+        })
+
+    hgrids = [f'h{100 + i}' for i in range(counts['horizontal_computational_grid'])]
+    hgrid_records = {}
+    for h in hgrids:
+        hgrid_records[h] = hgrid_record(rng, h, subgrids)
+        _write(root, 'horizontal_computational_grid', h, hgrid_records[h])
+
+    vgrids = [f'v{100 + i}' for i in range(counts['vertical_computational_grid'])]
+    vgrid_records = {}
+    for v in vgrids:
+        vgrid_records[v] = vgrid_record(rng, v)
+        _write(root, 'vertical_computational_grid', v, vgrid_records[v])
+
+    taken: set[str] = set()
+    families = [_name(rng, taken).rsplit('-', 1)[0] + f'-f{i}' for i in range(counts['model_family'])]
+    for fam in families:
+        _write(root, 'model_family', fam, {
+            'validation_key': fam, 'ui_label': fam, 'family_type': rng.choice(('model', 'component')),
+            'description': '', 'website': f'https://example.org/{fam}',
+            'established': rng.randint(1990, 2025), 'references': [],
+            'primary_institution': rng.choice(('cccma', 'cnrm', 'ipsl', 'mohc', 'ncar')),
+            'collaborative_institutions': [], 'scientific_domains': [rng.choice(_DOMAINS)],
+        })
+
+    components = []
+    for _ in range(counts['model_component']):
+        comp = _name(rng, taken)
+        components.append(comp)
+        _write(root, 'model_component', comp, {
+            'validation_key': comp, 'ui_label': '', 'component': rng.choice(_DOMAINS),
+            'family': rng.choice(families), 'description': '', 'references': [],
+            'code_base': 'private',
+        })
+
+    configs = []
+    for _ in range(counts['component_config']):
+        comp, h, v = rng.choice(components), rng.choice(hgrids), rng.choice(vgrids)
+        cid = f'{rng.choice(_DOMAINS)}_{comp}_{h}_{v}'
+        configs.append(cid)
+        _write(root, 'component_config', cid, {
+            'validation_key': cid, 'ui_label': cid, 'model_component': comp,
+            'horizontal_computational_grid': h, 'vertical_computational_grid': v,
+            'description': '',
+        })
+
+    for i in range(counts['model']):
+        mid = f'model-{i}'
+        _write(root, 'model', mid, {
+            'validation_key': mid.upper(), 'ui_label': mid.upper(), 'family': rng.choice(families),
+            'description': '', 'release_year': rng.randint(2015, 2027),
+            'calendar': ['proleptic-gregorian'], 'references': [],
+            'dynamic_components': rng.sample(_DOMAINS, 3), 'prescribed_components': [],
+            'omitted_components': [], 'model_components': rng.sample(configs, min(len(configs), 4)),
+            'embedded_components': [], 'coupled_components': [],
+        })
+
+    # Tempgrids: even-numbered ones duplicate an existing entry, odd ones are new.
+    originals = {
+        'horizontal_grid_cell': cell_records,
+        'horizontal_computational_grid': hgrid_records,
+        'vertical_computational_grid': vgrid_records,
+    }
+    makers = {
+        'horizontal_grid_cell': grid_cell_record,
+        'horizontal_computational_grid': lambda r, k: hgrid_record(r, k, subgrids),
+        'vertical_computational_grid': vgrid_record,
+    }
+    for folder in TEMPGRID_FOLDERS:
+        for k in range(TEMPGRIDS_PER_FOLDER):
+            tid = f'tempgrid-bench-{k}'
+            if k % 2 == 0:
+                record = dict(originals[folder][rng.choice(list(originals[folder]))])
+                record['validation_key'] = tid
+            else:
+                record = makers[folder](rng, tid)
+            _write(root, folder, tid, record)
+
+    return counts
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def _load_json(folder: Path, pattern: str = '*.json') -> list[dict]:
+    out = []
+    for path in sorted(folder.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            out.append(json.load(f))
+    return out
+
+
+def _issue_helper(name: str):
+    spec = importlib.util.spec_from_file_location(
+        name, _SCRIPT_DIR.parent / 'ISSUE_SCRIPT' / f'{name}.py',
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_find_grid_matches(root: Path) -> int:
+    refs = _load_json(root / 'horizontal_grid_cell', 'g*.json')
+    rng = random.Random(1)
+    for i in range(N_QUERIES):
+        find_best_match(grid_cell_record(rng, f'candidate-{i}'), refs)
+    return N_QUERIES
+
+
+def bench_grid_self_join(root: Path) -> int:
+    records = load_registry(root)
+    self_join(records)
+    return len(records)
+
+
+def bench_name_similarity(root: Path) -> int:
+    module = _issue_helper('_name_similarity')
+    rng = random.Random(2)
+    for i in range(N_QUERIES):
+        folder = ('model_component', 'model_family')[i % 2]
+        module.find_similar_names(_name(rng, set()), folder, workspace=str(root))
+    return N_QUERIES
+
+
+def bench_name_audit(root: Path) -> int:
+    result = audit_names.audit(Registry.load(root, audit_names.AUDITED_FOLDERS))
+    return sum(len(pairs) for pairs in result.values())
+
+
+def bench_vgrid_nearest(root: Path) -> int:
+    module = _issue_helper('_vgrid_matcher')
+    rng = random.Random(3)
+    for i in range(N_QUERIES):
+        module.nearest(vgrid_record(rng, f'candidate-{i}'), repo_root=str(root))
+    return N_QUERIES
+
+
+def bench_emd_query(root: Path) -> int:
+    index_path = root / '.emd_query_index.json'
+    emd_query.load_index(root, index_path, rebuild=True)
+    index = emd_query.load_index(root, index_path)
+    cells = sorted(index['folders']['horizontal_grid_cell']['rows'])
+    for i in range(N_QUERIES):
+        emd_query.query(index, 'horizontal_grid_cell',
+                        ['grid_type=tripolar', f'x_resolution<{0.25 * (1 + i % 4)}'])
+        emd_query.query(index, 'model', uses=[f'horizontal_grid_cell:{cells[i % len(cells)]}'])
+    return 2 * N_QUERIES
+
+
+def bench_search_index(root: Path) -> int:
+    index = search_index.build(search_index.load_records(root))
+    words = index['terms'][::max(1, len(index['terms']) // N_QUERIES)][:N_QUERIES]
+    for i, word in enumerate(words):
+        search_index.search(index, f'grid {word[:3]}', 'horizontal_grid_cell' if i % 2 else None)
+    return len(words)
+
+
+def bench_scan_cv_fields(root: Path) -> int:
+    scanner = CVFieldScanner(str(root))
+    scanner.scan_all()
+    return sum(len(v) for r in scanner.results.values() for v in r.values())
+
+
+def bench_validate_grid_types(root: Path) -> int:
+    results = GridTypeValidator(str(root)).run_validation()
+    return sum(len(v) for v in results.values())
+
+
+def bench_check_links(root: Path) -> int:
+    check_links._LOCAL_IDS.clear()
+    files = [p for folder in FOLDER_WEIGHTS for p in sorted((root / folder).glob('*.json'))]
+    for path in files:
+        check_links.check_file(path, verbose=False, quiet=True, offline=True)
+    return len(files)
+
+
+def bench_check_integrity(root: Path) -> int:
+    result = check_registry(Registry.load(root))
+    return result['stats']['files']
+
+
+def bench_tempgrid_rename(root: Path, timeout: float) -> int:
+    # The same script tempgrid-rename.yml runs, in its own process as there.
+    files = [str(p) for folder in TEMPGRID_FOLDERS
+             for p in sorted((root / folder).glob('tempgrid*.json'))]
+    subprocess.run([sys.executable, str(_SCRIPT_DIR / 'tempgrid_ids.py'), *files],
+                   capture_output=True, text=True, check=True, timeout=timeout)
+    return len(files)
+
+
+BENCHMARKS: dict[str, Callable[..., int]] = {
+    'find_grid_matches':   bench_find_grid_matches,
+    'grid_self_join':      bench_grid_self_join,
+    'name_similarity':     bench_name_similarity,
+    'name_audit':          bench_name_audit,
+    'vgrid_nearest':       bench_vgrid_nearest,
+    'emd_query':           bench_emd_query,
+    'search_index':        bench_search_index,
+    'scan_cv_fields':      bench_scan_cv_fields,
+    'validate_grid_types': bench_validate_grid_types,
+    'check_links':         bench_check_links,
+    'check_integrity':     bench_check_integrity,
+    'tempgrid_rename':     bench_tempgrid_rename,
+}
+
+
+def run_benchmark(name: str, root: Path, timeout: float) -> dict:
+    """Time one benchmark; returns {'seconds', 'items', 'ms_per_item', 'status'}."""
+    kwargs = {'timeout': timeout} if name == 'tempgrid_rename' else {}
+    t0 = time.perf_counter()
+    try:
+        # The scanners print progress; keep it out of the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            items = BENCHMARKS[name](root, **kwargs)
+        status = 'ok'
+    except subprocess.TimeoutExpired:
+        items, status = 0, f'timeout (>{timeout:.0f}s)'
+    except Exception as e:
+        items, status = 0, f'error: {type(e).__name__}: {e}'
+    seconds = round(time.perf_counter() - t0, 4)
+    return {
+        'seconds': seconds,
+        'items': items,
+        'ms_per_item': round(seconds * 1000 / items, 4) if items else None,
+        'status': status,
+    }
+
+
+def run_scale(n: int, names: list[str], seed: int, timeout: float, keep: Path | None) -> dict:
+    tmp = None
+    if keep:
+        root = keep / f'registry_{n}'
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix=f'emd_bench_{n}_')
+        root = Path(tmp.name)
+    try:
+        print(f'\033[94m▶ scale {n}: generating tree in {root}\033[0m', flush=True)
+        t0 = time.perf_counter()
+        counts = generate_tree(root, n, seed)
+        result = {
+            'entries': sum(counts.values()),
+            'folders': counts,
+            'generate_seconds': round(time.perf_counter() - t0, 4),
+            'benchmarks': {},
+        }
+        for name in names:
+            print(f'  {name:<22}', end='', flush=True)
+            r = run_benchmark(name, root, timeout)
+            result['benchmarks'][name] = r
+            secs = f'{r["seconds"]:.3f}s' if r['seconds'] is not None else '-'
+            print(f'{secs:>12}  {r["status"]}', flush=True)
+        return result
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+
+# =============================================================================
+# Output / comparison
+# =============================================================================
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare_results(base: dict, current: dict, tolerance: float) -> list[str]:
+    """Print a base-vs-current table; return the 'scale/benchmark' keys that regressed."""
+    regressions = []
+    sep = '-' * 78
+    print(sep)
+    print(f'  {"SCALE":>7}  {"BENCHMARK":<22}{"BASE s":>12}{"NOW s":>12}{"RATIO":>9}')
+    print(sep)
+    for scale, res in current['results'].items():
+        base_res = base.get('results', {}).get(scale, {}).get('benchmarks', {})
+        for name, r in res['benchmarks'].items():
+            old = base_res.get(name, {}).get('seconds')
+            new = r['seconds']
+            if not old or new is None:
+                print(f'  {scale:>7}  {name:<22}{"-":>12}{new if new is not None else "-":>12}{"":>9}')
+                continue
+            ratio = new / old
+            flag = ''
+            if ratio > tolerance:
+                flag = '  \033[91m▲ slower\033[0m'
+                regressions.append(f'{scale}/{name}')
+            elif ratio < 1 / tolerance:
+                flag = '  \033[92m▼ faster\033[0m'
+            print(f'  {scale:>7}  {name:<22}{old:>12.3f}{new:>12.3f}{ratio:>8.2f}x{flag}')
+    print(sep)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help='Registry sizes to generate (default: 1000 10000 100000).')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Run only these benchmarks.')
+    parser.add_argument('--output', '-o', type=Path, help='Write results JSON here.')
+    parser.add_argument('--compare', type=Path, help='Previous results JSON to compare against.')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Slowdown ratio that counts as a regression (default: 1.5).')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Give up on tempgrid_rename after this many seconds (default: 600).')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed (default: 0).')
+    parser.add_argument('--keep', type=Path, help='Keep the generated trees under this directory.')
+    args = parser.parse_args()
+
+    report = {
+        'commit': _git_sha(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': {},
+    }
+    for n in args.scales:
+        report['results'][str(n)] = run_scale(n, args.only, args.seed, args.timeout, args.keep)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f'\n✅ Results written to {args.output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            base = json.load(f)
+        print(f'\nCompared with {args.compare} (commit {base.get("commit") or "?"}):')
+        regressions = compare_results(base, report, args.tolerance)
+        if regressions:
+            print(f'\033[91m✗ {len(regressions)} regression(s): {", ".join(regressions)}\033[0m')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+build_graphs.py
+===============
+Incremental `_graph.json` builder for the production sync: regenerates the
+folder graphs a push can have changed and reuses every other one from the
+previous production commit, so the sync job only pays for what changed.
+
+Runs in the sync_data job after the src-data files have been copied onto
+the production checkout. HEAD is then the previous production commit, so
+the vocab files that differ from it are exactly what this deploy brings in
+(whatever number of pushes that spans). From those:
+
+  1. affected folders — the folders of the changed entries plus every
+     folder with an entry that links to them, directly or transitively
+     (impact.py over the `_context` link declarations);
+  2. unaffected folders — their `_graph.json` is checked out of HEAD in one
+     git call instead of being regenerated;
+  3. affected folders — the previous graph is patched: changed entries are
+     replaced, deleted ones dropped and new ones appended, keeping the
+     document's other keys, entry order and indentation.
+
+Patching relies on graph entries being the entry files as published. That
+is verified per folder before writing, on the entries that did not change:
+each must reproduce its entry in the previous graph exactly. When it cannot
+be verified (no previous graph, a `_context` change, an unrecognised
+document, or a mismatch) the run reports that a full `graphify --all` is
+needed instead, and the workflow falls back to it.
+
+Usage
+-----
+  python .github/scripts/build_graphs.py                   # since HEAD
+  python .github/scripts/build_graphs.py --since HEAD~3 --dry-run
+  python .github/scripts/build_graphs.py --full            # always ask for graphify
+
+With GITHUB_OUTPUT set, writes `graphify=true|false` and `folders=a,b,...`
+(the affected folders); with GITHUB_STEP_SUMMARY, a per-folder table.
+
+Exit code: 0, or 2 if the base ref is not a commit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+import impact  # noqa: E402
+from emd_registry import FOLDERS, Registry, normalise_id  # noqa: E402
+from publish import Changes, _git  # noqa: E402
+
+GRAPH = "_graph.json"
+
+# Unchanged entries compared against the previous graph per folder.
+VERIFY_SAMPLE = 5
+
+# Candidate forms of an entry file inside a graph, tried in order.
+ENTRY_FORMS = {
+    "without @context": lambda record: {k: v for k, v in record.items() if k != "@context"},
+    "as published":     lambda record: record,
+}
+
+
+class NeedsGraphify(Exception):
+    """The folder's graph cannot be patched safely."""
+
+
+# =============================================================================
+# Changed set
+# =============================================================================
+
+def vocab_paths(paths, folders=FOLDERS) -> set[str]:
+    """Entry files and `_context`s among `paths`."""
+    out = set()
+    for rel in paths:
+        folder, _, name = rel.partition("/")
+        if folder in folders and "/" not in name and (
+                name == "_context" or (name.endswith(".json") and not name.startswith("_"))):
+            out.add(rel)
+    return out
+
+
+def affected_folders(reg: Registry, paths: set[str]) -> list[str]:
+    """Folders of the changed entries and of everything that links to them."""
+    folders = set(impact.impact(reg, paths)["folders"])
+    return [f for f in FOLDERS if f in folders or any(p.startswith(f"{f}/") for p in paths)]
+
+
+# =============================================================================
+# Patching
+# =============================================================================
+
+def _graph_key(entry) -> str | None:
+    entry_id = entry.get("@id") if isinstance(entry, dict) else None
+    if not isinstance(entry_id, str):
+        return None
+    return normalise_id(entry_id.rstrip("/").rsplit("/", 1)[-1].removesuffix(".json"))
+
+
+def _indent(text: str):
+    """The indentation json.dumps needs to reproduce `text`'s layout."""
+    if not text.startswith("{\n"):
+        return None
+    line = text[2:].split("\n", 1)[0]
+    return len(line) - len(line.lstrip(" ")) or None
+
+
+def _entry_files(root: Path, folder: str) -> list[tuple[str, dict]]:
+    """[(path, record)] of a folder's entry files in name order (unparseable ones skipped)."""
+    out = []
+    for path in sorted((root / folder).glob("*.json")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(record, dict):
+            out.append((f"{folder}/{path.name}", record))
+    return out
+
+
+def patch_graph(root: Path, folder: str, previous: str, changed: set[str]) -> str:
+    """The new `_graph.json` text for `folder`, patched from the previous one."""
+    try:
+        doc = json.loads(previous)
+    except ValueError:
+        raise NeedsGraphify("previous graph is not valid JSON")
+    if not isinstance(doc, dict) or not isinstance(doc.get("@graph"), list):
+        raise NeedsGraphify("previous graph has no @graph list")
+
+    # Several files may share an @id; both sides keep them in order per key.
+    old: dict[str, list] = {}
+    for entry in doc["@graph"]:
+        old.setdefault(_graph_key(entry), []).append(entry)
+    files = _entry_files(root, folder)
+    current: dict[str, list[dict]] = {}
+    for _rel, record in files:
+        current.setdefault(_graph_key(record), []).append(record)
+
+    unchanged = [record for rel, record in files if rel not in changed
+                 and len(old.get(_graph_key(record), ())) == 1
+                 and len(current[_graph_key(record)]) == 1][:VERIFY_SAMPLE]
+    if not unchanged:
+        raise NeedsGraphify("no unchanged entry to verify the graph layout against")
+    form = next((f for f in ENTRY_FORMS.values()
+                 if all(f(r) == old[_graph_key(r)][0] for r in unchanged)), None)
+    if form is None:
+        raise NeedsGraphify("graph entries differ from the entry files")
+
+    entries = []
+    for entry in doc["@graph"]:
+        key = _graph_key(entry)
+        if key is None:
+            entries.append(entry)
+        elif current.get(key):
+            entries.append(form(current[key].pop(0)))
+    entries += [form(record) for _rel, record in files
+                if any(record is r for r in current.get(_graph_key(record), ()))]
+    doc["@graph"] = entries
+
+    text = json.dumps(doc, indent=_indent(previous), ensure_ascii=False)
+    return text + "\n" if previous.endswith("\n") else text
+
+
+# =============================================================================
+# Run
+# =============================================================================
+
+def build(root: Path, base: str, full: bool = False, dry_run: bool = False) -> dict:
+    """
+    Bring every folder's `_graph.json` up to date. Returns {'affected',
+    'graphify', 'folders': {folder: (action, detail)}}.
+    """
+    changes = Changes.since(root, base)
+    changed = vocab_paths(changes.changed | changes.deleted)
+    reg = Registry.load(root)
+    affected = affected_folders(reg, changed)
+    result = {"affected": affected, "graphify": full, "folders": {}}
+
+    restore = []
+    for folder in FOLDERS:
+        rel = f"{folder}/{GRAPH}"
+        previous = _git(root, "cat-file", "blob", f"{base}:{rel}")
+        if folder not in affected:
+            if previous.returncode != 0:
+                result["folders"][folder] = ("graphify", "no graph in the previous commit")
+                result["graphify"] = True
+            else:
+                result["folders"][folder] = ("reused", "")
+                if not (root / rel).is_file():
+                    restore.append(rel)
+            continue
+        try:
+            if previous.returncode != 0:
+                raise NeedsGraphify("no graph in the previous commit")
+            if f"{folder}/_context" in changed:
+                raise NeedsGraphify("_context changed")
+            text = patch_graph(root, folder, previous.stdout.decode("utf-8"), changed)
+        except NeedsGraphify as e:
+            result["folders"][folder] = ("graphify", str(e))
+            result["graphify"] = True
+            continue
+        n = sum(p.startswith(f"{folder}/") for p in changed)
+        result["folders"][folder] = ("patched", f"{n} changed entr{'y' if n == 1 else 'ies'}"
+                                     if n else "link dependent")
+        if not dry_run:
+            (root / rel).write_text(text, encoding="utf-8")
+
+    if restore and not dry_run:
+        _git(root, "checkout", base, "--pathspec-from-file=-", "--pathspec-file-nul",
+             input="\0".join(restore).encode(), check=True)
+    return result
+
+
+def write_outputs(result: dict, output: str | None, summary: str | None) -> None:
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            f.write(f"graphify={'true' if result['graphify'] else 'false'}\n")
+            f.write(f"folders={','.join(result['affected'])}\n")
+    if summary:
+        lines = ["## Graphs", "",
+                 "Full `graphify --all` needed." if result["graphify"]
+                 else "Built incrementally, graphify skipped.", "",
+                 "| Folder | Graph | |", "|---|---|---|"]
+        lines += [f"| `{folder}` | {action} | {detail} |"
+                  for folder, (action, detail) in result["folders"].items()]
+        with open(summary, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--root", default=".", help="Production checkout (default: cwd).")
+    parser.add_argument("--since", default="HEAD", metavar="REF",
+                        help="Last published commit (default: HEAD).")
+    parser.add_argument("--full", action="store_true",
+                        help="Report that graphify --all is needed without patching.")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing.")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    if _git(root, "rev-parse", "--verify", "--quiet", f"{args.since}^{{commit}}").returncode != 0:
+        print(f"\033[91m✗ {args.since} is not a commit\033[0m", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    result = build(root, args.since, args.full, args.dry_run or args.full)
+    colours = {"reused": "\033[90m", "patched": "\033[92m", "graphify": "\033[93m"}
+    for folder, (action, detail) in result["folders"].items():
+        print(f"  {folder:<30} {colours[action]}{action:<9}\033[0m {detail}")
+    verdict = "\033[93m→ run graphify --all" if result["graphify"] else "\033[92m✓ graphs up to date"
+    print(f"{verdict} ({time.perf_counter() - started:.2f}s)\033[0m")
+
+    write_outputs(result, os.environ.get("GITHUB_OUTPUT"), os.environ.get("GITHUB_STEP_SUMMARY"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
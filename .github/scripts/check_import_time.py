@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+check_import_time.py
+====================
+Import-time regression gate for the `.github/ISSUE_SCRIPT/` handlers.
+
+Each handler is loaded on its own in a fresh interpreter under
+`python -X importtime`, exactly as new_issue / batch_issues load it (by file
+path). The gate fails when loading a handler:
+
+  * pulls in a heavy dependency at module level (cmipld, pydantic, the
+    name-similarity helper, ...) — those belong inside run() / update(); or
+  * takes longer than --budget-ms of cumulative import time.
+
+Because cmipld is only imported lazily, this runs without CMIPLD installed —
+a module-level `import cmipld` shows up as a failure, which is the point.
+
+Usage
+-----
+  python .github/scripts/check_import_time.py                  # all handlers
+  python .github/scripts/check_import_time.py modify model     # some kinds
+  python .github/scripts/check_import_time.py --budget-ms 30 --verbose
+  python .github/scripts/check_import_time.py --json
+
+Exit code: 0 if every handler passes, 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+HANDLER_DIR = _SCRIPT_DIR.parent / 'ISSUE_SCRIPT'
+
+# Module prefixes that must not be imported just by loading a handler.
+FORBIDDEN = ('cmipld', 'pydantic', 'esgvoc', 'rdflib', 'pyld', 'requests',
+             '_name_similarity', 'difflib')
+
+DEFAULT_BUDGET_MS = 50.0
+
+_MARKER = '#handler-load#'
+
+# Runs in the child. Everything imported after the marker is the handler's.
+_DRIVER = f'''
+import importlib.util, json, sys, time
+path = sys.argv[1]
+before = set(sys.modules)
+sys.stderr.write({_MARKER!r} + "\\n"); sys.stderr.flush()
+t0 = time.perf_counter()
+error = None
+try:
+    spec = importlib.util.spec_from_file_location(path.rsplit("/", 1)[-1][:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+except BaseException as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps({{
+    "wall_ms": (time.perf_counter() - t0) * 1000,
+    "modules": sorted(set(sys.modules) - before),
+    "error": error,
+}}))
+'''
+
+
+def handler_kinds(handler_dir: Path = HANDLER_DIR) -> list[str]:
+    """Every handler kind (non-underscore *.py), without importing any of them."""
+    return sorted(p.stem for p in handler_dir.glob('*.py') if not p.name.startswith(('_', '.')))
+
+
+def _parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """Return (cumulative_ms, [(module, self_ms), ...]) for lines after the marker."""
+    lines = stderr.splitlines()
+    try:
+        lines = lines[lines.index(_MARKER) + 1:]
+    except ValueError:
+        return 0.0, []
+    per_module = []
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        per_module.append((name.strip(), int(self_us) / 1000))
+    return sum(ms for _, ms in per_module), per_module
+
+
+def measure(kind: str, handler_dir: Path = HANDLER_DIR) -> dict:
+    """Load one handler in a fresh interpreter; return its import profile."""
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    env.pop('EMD_PROFILE', None)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _DRIVER, str(handler_dir / f'{kind}.py')],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    try:
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        result = {'wall_ms': 0.0, 'modules': [], 'error': proc.stderr.strip()[-300:] or 'no output'}
+    import_ms, per_module = _parse_importtime(proc.stderr)
+    result['kind'] = kind
+    result['import_ms'] = round(import_ms, 2)
+    result['wall_ms'] = round(result['wall_ms'], 2)
+    result['slowest'] = sorted(per_module, key=lambda m: m[1], reverse=True)[:5]
+    return result
+
+
+def evaluate(result: dict, budget_ms: float) -> list[str]:
+    """Return the reasons `result` fails the gate ([] when it passes)."""
+    problems = []
+    if result.get('error'):
+        problems.append(f'load failed: {result["error"]}')
+    heavy = sorted({m for m in result['modules']
+                    for prefix in FORBIDDEN if m == prefix or m.startswith(prefix + '.')})
+    if heavy:
+        problems.append('imports at load time: ' + ', '.join(heavy[:6])
+                        + (' …' if len(heavy) > 6 else ''))
+    if result['wall_ms'] > budget_ms:
+        problems.append(f'load took {result["wall_ms"]:.1f} ms (budget {budget_ms:.0f} ms)')
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('kinds', nargs='*', help='Handler kinds to check (default: all).')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Max load time per handler (default: {DEFAULT_BUDGET_MS:.0f}).')
+    parser.add_argument('--json', action='store_true', help='Emit results as JSON.')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Also list the slowest imports for each handler.')
+    args = parser.parse_args()
+
+    kinds = args.kinds or handler_kinds()
+    results = []
+    for kind in kinds:
+        result = measure(kind)
+        result['problems'] = evaluate(result, args.budget_ms)
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'  {"HANDLER":<32}{"LOAD ms":>10}{"IMPORT ms":>11}{"MODULES":>9}  STATUS')
+        for r in results:
+            status = '\033[92m✓\033[0m' if not r['problems'] else '\033[91m✗ ' + '; '.join(r['problems']) + '\033[0m'
+            print(f'  {r["kind"]:<32}{r["wall_ms"]:>10.1f}{r["import_ms"]:>11.1f}{len(r["modules"]):>9}  {status}')
+            if args.verbose:
+                for name, ms in r['slowest']:
+                    print(f'      {ms:>8.2f} ms  {name}')
+
+    summary = os.environ.get('GITHUB_STEP_SUMMARY')
+    if summary:
+        with open(summary, 'a', encoding='utf-8') as f:
+            f.write('## Handler import time\n\n| Handler | Load (ms) | Modules | Status |\n|---|---:|---:|---|\n')
+            for r in results:
+                f.write(f'| `{r["kind"]}` | {r["wall_ms"]:.1f} | {len(r["modules"])} '
+                        f'| {"✓" if not r["problems"] else "✗ " + "; ".join(r["problems"])} |\n')
+
+    return 1 if any(r['problems'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
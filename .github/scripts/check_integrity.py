@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+check_integrity.py
+==================
+Referential-integrity check for the whole src-data registry, offline.
+
+Loads all eight folders once (emd_registry.Registry), builds the `@id` set
+of each folder, and validates every link declared in the `_context` files —
+`component_config.model_component / horizontal_computational_grid /
+vertical_computational_grid`, `horizontal_computational_grid.horizontal_subgrids`,
+`horizontal_subgrid.horizontal_grid_cell(s)`, `model.model_components`,
+`model(_component).family` — with a set lookup each. The whole tree is checked
+in one pass over its links; nothing is fetched.
+
+Links that leave the tree (constants CVs, DOIs) are counted but not checked;
+use check_links.py for those. Unreadable files and duplicate `@id`s are
+reported as errors too.
+
+Problems already on src-data are listed in the baseline (BASELINE,
+`integrity_baseline.json` next to this script, used by default): they are
+still reported, as known, but only new problems fail the check. Baseline
+entries that no longer occur are reported so the file can be pruned with
+--update-baseline once the data is fixed.
+
+Usage
+-----
+  python .github/scripts/check_integrity.py                       # whole tree
+  python .github/scripts/check_integrity.py --folder model        # one folder
+  python .github/scripts/check_integrity.py --all                 # list OK files too
+  python .github/scripts/impact.py --since HEAD~1 --format paths \
+      | xargs -r python .github/scripts/check_integrity.py          # affected files only
+  python .github/scripts/check_integrity.py --json > integrity.json
+  python .github/scripts/check_integrity.py --update-baseline     # accept the current problems
+  python .github/scripts/check_integrity.py --no-baseline         # fail on every problem
+
+Exit code: 0 if every local link resolves and every file loads (apart from
+baseline problems), 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+from emd_registry import FOLDERS, Registry, loose_id  # noqa: E402
+
+BASELINE = _SCRIPT_DIR / "integrity_baseline.json"
+
+
+# =============================================================================
+# Checking
+# =============================================================================
+
+class _Hints:
+    """Per-folder {loosened id: id} maps, built only for folders with misses."""
+
+    def __init__(self, reg: Registry):
+        self._reg = reg
+        self._maps: dict[str, dict[str, str]] = {}
+
+    def __call__(self, folder: str, value: str) -> str | None:
+        if folder not in self._maps:
+            self._maps[folder] = {loose_id(i): i for i in self._reg.ids(folder)}
+        return self._maps[folder].get(loose_id(value))
+
+
+def check_registry(reg: Registry, folders=None, only=None) -> dict:
+    """
+    Validate every local link of every record, optionally only for files in
+    `folders` or whose root-relative path is in `only`. Returns
+    {'files': {path: report}, 'stats': {...}} where each report is
+    {'folder', 'id', 'checked', 'external', 'broken': [...], 'errors': [...]}.
+    """
+    hint = _Hints(reg)
+    files: dict[str, dict] = {}
+
+    def wanted(folder: str, rel: str) -> bool:
+        return (not folders or folder in folders) and (not only or rel in only)
+
+    for folder, entry_id, path in reg.files():
+        if not wanted(folder, str(path.relative_to(reg.root))):
+            continue
+        files[str(path.relative_to(reg.root))] = {
+            "folder": folder, "id": entry_id,
+            "checked": 0, "external": 0, "broken": [], "errors": [],
+        }
+
+    for path, message in reg.errors:
+        key = str(path.relative_to(reg.root))
+        if not wanted(path.parent.name, key):
+            continue
+        report = files.setdefault(key, {
+            "folder": path.parent.name, "id": path.stem,
+            "checked": 0, "external": 0, "broken": [], "errors": [],
+        })
+        report["errors"].append(message)
+
+    stats: dict[str, int] = defaultdict(int)
+    for folder, entry_id, field, value, target in reg.iter_links():
+        report = files.get(str(reg.paths[folder][entry_id].relative_to(reg.root)))
+        if report is None:
+            continue
+        if target is None:
+            report["external"] += 1
+            stats["external"] += 1
+            continue
+        report["checked"] += 1
+        stats["checked"] += 1
+        if value in reg.ids(target):
+            continue
+        stats["broken"] += 1
+        report["broken"].append({
+            "field": field, "value": value, "target": f"{target}/{value}.json",
+            "did_you_mean": hint(target, value),
+        })
+
+    stats["files"] = len(files)
+    stats["errors"] = sum(len(r["errors"]) for r in files.values())
+    stats["failing_files"] = sum(1 for r in files.values() if r["broken"] or r["errors"])
+    return {"files": files, "stats": dict(stats)}
+
+
+def problems(report: dict) -> list[str]:
+    """One line per problem of a file report, as the baseline records them."""
+    return report["errors"] + [f"{b['field']}: {b['target']} not found" for b in report["broken"]]
+
+
+def load_baseline(path: Path) -> dict[str, list[str]]:
+    """{path: [problem, ...]}; empty when the file does not exist."""
+    if not path.is_file():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_baseline(result: dict, path: Path) -> int:
+    baseline = {p: problems(r) for p, r in sorted(result["files"].items()) if problems(r)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return sum(len(v) for v in baseline.values())
+
+
+def apply_baseline(result: dict, baseline: dict[str, list[str]], whole_tree: bool = True) -> None:
+    """
+    Move the problems listed in `baseline` out of each report's `broken` /
+    `errors` into `known`, and record baseline entries that no longer occur
+    under stats['fixed'] (for the checked files, and for files that are gone
+    when the whole tree was checked).
+    """
+    known_total, fixed = 0, []
+    for path, report in result["files"].items():
+        listed = set(baseline.get(path, ()))
+        report["known"] = [p for p in problems(report) if p in listed]
+        report["errors"] = [m for m in report["errors"] if m not in listed]
+        report["broken"] = [b for b in report["broken"]
+                            if f"{b['field']}: {b['target']} not found" not in listed]
+        known_total += len(report["known"])
+        fixed += [f"{path}: {p}" for p in sorted(listed - set(report["known"]))]
+    if whole_tree:
+        fixed += [f"{path}: {p}" for path in sorted(set(baseline) - set(result["files"]))
+                  for p in baseline[path]]
+    s = result["stats"]
+    s["known"] = known_total
+    s["fixed"] = fixed
+    s["broken"] = sum(len(r["broken"]) for r in result["files"].values())
+    s["errors"] = sum(len(r["errors"]) for r in result["files"].values())
+    s["failing_files"] = sum(1 for r in result["files"].values() if r["broken"] or r["errors"])
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_report(result: dict, show_all: bool = False) -> None:
+    for path, report in sorted(result["files"].items()):
+        failing = report["broken"] or report["errors"]
+        if not failing and not show_all:
+            continue
+        mark = "\033[91m✗\033[0m" if failing else "\033[92m✓\033[0m"
+        print(f"{mark} {path}  ({report['checked']} local, {report['external']} external)")
+        for message in report["errors"]:
+            print(f"    \033[91m{message}\033[0m")
+        for b in report["broken"]:
+            hint = f"  — did you mean '{b['did_you_mean']}'?" if b["did_you_mean"] else ""
+            print(f"    {b['field']}: {b['target']} not found{hint}")
+
+    known = [(p, r["known"]) for p, r in sorted(result["files"].items()) if r.get("known")]
+    if known:
+        print("\n\033[90mKnown (baseline):")
+        for path, lines in known:
+            for line in lines:
+                print(f"    {path}: {line}")
+        print("\033[0m", end="")
+
+    s = result["stats"]
+    for line in s.get("fixed", ()):
+        print(f"\033[93m  no longer occurs, remove from the baseline: {line}\033[0m")
+    colour = "\033[92m" if not s["failing_files"] else "\033[91m"
+    known_note = f", {s['known']} known" if s.get("known") else ""
+    print(f"\n{colour}{s['files']} file(s), {s.get('checked', 0)} local link(s) checked, "
+          f"{s.get('broken', 0)} broken, {s['errors']} file error(s){known_note}; "
+          f"{s.get('external', 0)} external link(s) not checked\033[0m")
+
+
+def write_step_summary(result: dict, path: str) -> None:
+    s = result["stats"]
+    lines = ["## Referential integrity", "",
+             f"{s['files']} files, {s.get('checked', 0)} local links checked, "
+             f"**{s.get('broken', 0)} broken**, {s['errors']} file errors"
+             + (f" (plus {s['known']} known, in the baseline)." if s.get("known") else "."), ""]
+    failing = [(p, r) for p, r in sorted(result["files"].items()) if r["broken"] or r["errors"]]
+    if failing:
+        lines += ["| File | Problem |", "|---|---|"]
+        for p, r in failing:
+            for message in r["errors"]:
+                lines.append(f"| `{p}` | {message} |")
+            for b in r["broken"]:
+                lines.append(f"| `{p}` | `{b['field']}` → `{b['target']}` not found |")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("files", nargs="*",
+                        help="Only report these files (e.g. from impact.py --format paths).")
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--folder", action="append", choices=FOLDERS,
+                        help="Only report files in this folder (repeatable).")
+    parser.add_argument("--all", action="store_true", help="Also list files with no problems.")
+    parser.add_argument("--json", action="store_true", help="Emit the per-file report as JSON.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, metavar="FILE",
+                        help="Known problems that do not fail the check (default: %(default)s).")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Fail on every problem, known or not.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write every current problem to the baseline and exit.")
+    args = parser.parse_args()
+    if args.update_baseline and (args.files or args.folder):
+        parser.error("--update-baseline checks the whole tree; drop the file / --folder filters")
+
+    root = Path(args.root).expanduser().resolve()
+    start = time.perf_counter()
+    reg = Registry.load(root)
+    only = {str(Path(f).resolve().relative_to(root)) if Path(f).is_absolute() else str(Path(f))
+            for f in args.files}
+    result = check_registry(reg, set(args.folder) if args.folder else None, only or None)
+    result["stats"]["seconds"] = round(time.perf_counter() - start, 3)
+
+    if args.update_baseline:
+        n = write_baseline(result, args.baseline)
+        print(f"\033[92m✓\033[0m {args.baseline}: {n} known problem(s)")
+        return 0
+    if not args.no_baseline:
+        apply_baseline(result, load_baseline(args.baseline), not (args.files or args.folder))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, show_all=args.all)
+        print(f"  ({result['stats']['seconds']:.2f} s)")
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        write_step_summary(result, summary)
+
+    return 1 if result["stats"]["failing_files"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,12 @@ For each `@id`-typed field on the loaded file, this script:
      builds `<base><value>`.
   4. Calls `cmipld.client.check_url_exists` on each resulting URL.
 
+With --offline nothing is fetched: links into another EMD folder
+(`https://emd.mipcvs.dev/<folder>/_context`) are resolved against the sibling
+`<folder>/` on disk, and every other link (constants CVs, absolute URLs) is
+skipped. The benchmarks use it; the src-data-change workflow checks online
+(CMIPLD installed) so the constants CV links are covered as well.
+
 Empty strings and `_no response_` placeholders are skipped (not flagged) —
 those are EMD's way of marking "not yet filled in" and aren't link errors.
 
@@ -28,6 +34,7 @@ Usage
     python docs/scripts/check_links.py horizontal_grid_cell/g110.json
     python docs/scripts/check_links.py model/canesm5-1.json --verbose
     python docs/scripts/check_links.py model/canesm5-1.json --quiet      # only failures
+    python docs/scripts/check_links.py model/canesm5-1.json --offline    # local tree only
 
 Exit code: 0 if every link resolves, 1 if any failed (CI-friendly).
 """
@@ -42,11 +49,6 @@ import urllib.error
 from pathlib import Path
 from typing import Any, Iterable
 
-# cmipld provides the LDR client, which knows the alt-base mappings (so
-# https://emd.mipcvs.dev/... is checked against wcrp-cmip.github.io/...
-# transparently).
-import cmipld
-
 # Cache fetched remote contexts so the same `@base` lookup isn't repeated
 # for every value in a list field.
 _CTX_CACHE: dict[str, dict] = {}
@@ -54,6 +56,21 @@ _CTX_CACHE: dict[str, dict] = {}
 # Placeholders that mean "unset" — not real links.
 _PLACEHOLDERS = {"", "not specified", "_no response_", "none"}
 
+# Remote contexts under this prefix belong to the EMD tree itself, so offline
+# they map onto a sibling folder: <prefix><folder>/_context -> ../<folder>/
+_EMD_PREFIX = "https://emd.mipcvs.dev/"
+
+# Lower-cased file stems per local folder, for offline resolution.
+_LOCAL_IDS: dict[Path, set[str]] = {}
+
+
+def _cmipld():
+    # cmipld provides the LDR client, which knows the alt-base mappings (so
+    # https://emd.mipcvs.dev/... is checked against wcrp-cmip.github.io/...
+    # transparently). Imported lazily so --offline runs without it.
+    import cmipld
+    return cmipld
+
 
 def _is_absolute(value: str) -> bool:
     return value.startswith("http://") or value.startswith("https://")
@@ -84,7 +101,7 @@ def _fetch_context(ctx_url: str) -> dict:
 
     # Step 1: ask cmipld where this URL actually lives on GitHub Pages.
     try:
-        info = cmipld.client.test_load(ctx_url)
+        info = _cmipld().client.test_load(ctx_url)
         document_url = info.get("documentUrl") if info.get("success") else None
     except Exception:
         document_url = None
@@ -114,6 +131,22 @@ def _base_for(ctx_url: str) -> str | None:
     return ctx.get("@base")
 
 
+def _local_folder(ctx_url: str | None, root: Path) -> Path | None:
+    """Map an EMD remote context URL to its folder under `root` (None if external)."""
+    if not ctx_url or not ctx_url.startswith(_EMD_PREFIX):
+        return None
+    folder = ctx_url[len(_EMD_PREFIX):].split("/", 1)[0]
+    return root / folder if folder else None
+
+
+def _local_ids(folder: Path) -> set[str]:
+    if folder not in _LOCAL_IDS:
+        _LOCAL_IDS[folder] = {
+            p.stem.lower() for p in folder.glob("*.json") if not p.name.startswith("_")
+        } if folder.is_dir() else set()
+    return _LOCAL_IDS[folder]
+
+
 def load_local_context(file_path: Path) -> dict:
     """Load the `_context` sibling file. Errors are fatal — a context is required."""
     ctx_path = file_path.parent / "_context"
@@ -139,7 +172,8 @@ def link_fields(local_ctx: dict) -> dict[str, str | None]:
     return fields
 
 
-def check_file(file_path: Path, verbose: bool = True, quiet: bool = False) -> int:
+def check_file(file_path: Path, verbose: bool = True, quiet: bool = False,
+               offline: bool = False) -> int:
     """Check every link in `file_path`. Returns count of failures."""
     with file_path.open(encoding="utf-8") as fh:
         data = json.load(fh)
@@ -154,6 +188,8 @@ def check_file(file_path: Path, verbose: bool = True, quiet: bool = False) -> in
 
     failures = 0
     checked  = 0
+    skipped  = 0
+    root     = file_path.parent.parent
 
     for field, remote_ctx_url in fields.items():
         if field not in data:
@@ -162,6 +198,25 @@ def check_file(file_path: Path, verbose: bool = True, quiet: bool = False) -> in
         if not values:
             continue
 
+        if offline:
+            folder = _local_folder(remote_ctx_url, root)
+            for raw in values:
+                value = raw.strip()
+                if value.lower() in _PLACEHOLDERS:
+                    continue
+                if folder is None or _is_absolute(value):
+                    skipped += 1
+                    continue
+                checked += 1
+                target = f"{folder.name}/{value}.json"
+                if value.lower() in _local_ids(folder):
+                    if verbose and not quiet:
+                        print(f"  ✓ {field}: {target}")
+                else:
+                    failures += 1
+                    print(f"  ✗ {field}: {target} (not found locally)")
+            continue
+
         # Resolve base once per field.
         base: str | None = None
         if remote_ctx_url:
@@ -188,7 +243,7 @@ def check_file(file_path: Path, verbose: bool = True, quiet: bool = False) -> in
 
             checked += 1
             try:
-                ok = cmipld.client.check_url_exists(url)
+                ok = _cmipld().client.check_url_exists(url)
                 err_note = ""
             except Exception as e:
                 ok = False
@@ -203,7 +258,8 @@ def check_file(file_path: Path, verbose: bool = True, quiet: bool = False) -> in
 
     if not quiet:
         status = "OK" if failures == 0 else f"{failures} broken"
-        print(f"\n{file_path}: {checked} link(s) checked — {status}")
+        note = f", {skipped} external skipped offline" if skipped else ""
+        print(f"\n{file_path}: {checked} link(s) checked{note} — {status}")
 
     return failures
 
@@ -217,6 +273,8 @@ def main() -> int:
                    help="Show every URL checked (default: only failures + summary).")
     p.add_argument("-q", "--quiet", action="store_true",
                    help="Show only broken links; suppress summary.")
+    p.add_argument("--offline", action="store_true",
+                   help="No network: resolve EMD links against the local tree, skip the rest.")
     args = p.parse_args()
 
     path = Path(args.file).expanduser().resolve()
@@ -225,7 +283,7 @@ def main() -> int:
 
     # `verbose` and `quiet` are mutually exclusive; quiet wins if both are set.
     verbose = args.verbose and not args.quiet
-    failures = check_file(path, verbose=verbose, quiet=args.quiet)
+    failures = check_file(path, verbose=verbose, quiet=args.quiet, offline=args.offline)
     return 1 if failures else 0
 
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+diff_records.py
+===============
+Field-level diff of every src-data record changed between two commits.
+
+Lists the changed `<folder>/<id>.json` files with `git diff --name-status`,
+reads both versions of each through one `git cat-file --batch` process
+(git_objects.py) and compares them with ISSUE_SCRIPT/_json_diff.py: records
+aligned by key, list fields compared as sets, `@context` / `@type` skipped.
+A sync commit touching hundreds of files is diffed in one pass with no
+per-file subprocess.
+
+Usage
+-----
+  python .github/scripts/diff_records.py --since HEAD~1                 # vs working tree
+  python .github/scripts/diff_records.py --since "$BEFORE" --until HEAD
+  python .github/scripts/diff_records.py --since origin/src-data --format markdown
+  python .github/scripts/diff_records.py --since HEAD~5 --format json
+
+With GITHUB_STEP_SUMMARY set, the markdown report is appended to it.
+
+Exit code: 0, or 2 on a bad ref.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+sys.path.insert(0, str(_SCRIPT_DIR.parent / "ISSUE_SCRIPT"))
+
+import _registry  # noqa: E402
+from emd_registry import FOLDERS  # noqa: E402
+from git_objects import GitObjectReader  # noqa: E402
+
+_json_diff = _registry.helper('_json_diff')
+
+_STATUS = {"A": "added", "D": "deleted", "M": "modified"}
+
+# Files beyond this many are counted but not tabulated in the markdown.
+_MAX_MARKDOWN_FILES = 200
+
+
+# =============================================================================
+# Diffing
+# =============================================================================
+
+def changed_files(root: Path, since: str, until: str | None) -> list[tuple[str, str]]:
+    """[(status letter, path)] of record files changed between the two refs."""
+    cmd = ["git", "-C", str(root), "diff", "--name-status", "--no-renames", since]
+    if until:
+        cmd.append(until)
+    result = subprocess.run(cmd + ["--", *FOLDERS], capture_output=True, text=True, check=True)
+    out = []
+    for line in result.stdout.splitlines():
+        status, _, path = line.partition("\t")
+        name = Path(path).name
+        if name.endswith(".json") and not name.startswith("_"):
+            out.append((status[:1], path))
+    return out
+
+
+def diff_range(root: Path, since: str, until: str | None = None) -> dict:
+    """
+    Return {'files': [{'path', 'status', 'changes'}, ...], 'stats': {...}}.
+    `until` None compares against the working tree. `changes` is None for a
+    side that is not valid JSON.
+    """
+    files = []
+    reader = GitObjectReader(str(root))
+    try:
+        for status, path in changed_files(root, since, until):
+            old = reader.read(since, path) if status != "A" else None
+            if status == "D":
+                new = None
+            elif until:
+                new = reader.read(until, path)
+            else:
+                new = (root / path).read_bytes()
+            changes = _json_diff.diff_text(old and old.decode("utf-8"), new and new.decode("utf-8"))
+            files.append({"path": path, "status": _STATUS.get(status, status), "changes": changes})
+    finally:
+        reader.close()
+
+    stats = {"files": len(files), "added": 0, "deleted": 0, "modified": 0, "fields": 0, "unparsed": 0}
+    for f in files:
+        stats[f["status"]] = stats.get(f["status"], 0) + 1
+        if f["changes"] is None:
+            stats["unparsed"] += 1
+        elif f["status"] == "modified":
+            stats["fields"] += len(f["changes"])
+    return {"files": files, "stats": stats}
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_report(result: dict) -> None:
+    for f in result["files"]:
+        colour = {"added": "\033[92m", "deleted": "\033[91m"}.get(f["status"], "\033[94m")
+        print(f"{colour}{f['status']:>8}\033[0m  {f['path']}")
+        if f["changes"] is None:
+            print("          (not valid JSON)")
+        elif f["status"] == "modified":
+            for line in _json_diff.to_lines(f["changes"]):
+                print(f"          {line}")
+    s = result["stats"]
+    print(f"\n{s['files']} file(s): {s['added']} added, {s['deleted']} deleted, "
+          f"{s['modified']} modified ({s['fields']} field change(s))")
+
+
+def to_markdown(result: dict, title: str = "Record changes") -> str:
+    s = result["stats"]
+    lines = [f"## {title}", "",
+             f"{s['files']} file(s): {s['added']} added, {s['deleted']} deleted, "
+             f"{s['modified']} modified ({s['fields']} field changes).", ""]
+    for f in result["files"][:_MAX_MARKDOWN_FILES]:
+        if f["status"] != "modified" or not f["changes"]:
+            lines.append(f"- `{f['path']}` — {f['status']}"
+                         + (" (not valid JSON)" if f["changes"] is None else ""))
+            continue
+        lines += [f"<details><summary><code>{f['path']}</code> — "
+                  f"{len(f['changes'])} field change(s)</summary>", "",
+                  _json_diff.to_markdown(f["changes"]), "", "</details>"]
+    if len(result["files"]) > _MAX_MARKDOWN_FILES:
+        lines.append(f"\n… and {len(result['files']) - _MAX_MARKDOWN_FILES} more file(s).")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--since", metavar="REF", required=True, help="Base commit.")
+    parser.add_argument("--until", metavar="REF",
+                        help="Head commit (default: the working tree).")
+    parser.add_argument("--root", default=".", help="src-data checkout (default: cwd).")
+    parser.add_argument("--format", choices=("report", "markdown", "json"), default="report",
+                        help="Output format (default: report).")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    try:
+        result = diff_range(root, args.since, args.until)
+    except subprocess.CalledProcessError as e:
+        print(f"\033[91m✗ git diff failed: {e.stderr.strip()}\033[0m", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.format == "markdown":
+        print(to_markdown(result))
+    else:
+        print_report(result)
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, "a", encoding="utf-8") as f:
+            f.write(to_markdown(result) + "\n\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+emd_query.py
+============
+emd-query: answer filter, range and join questions about the registry from
+secondary indexes instead of grep.
+
+The index covers the common filter fields of each folder (INDEXED):
+
+  * categorical and link fields -> hash index {value: [ids]}  (`=`, `!=`)
+  * numeric fields              -> sorted (value, id) arrays  (`<`, `<=`, `>`, `>=`, `=`)
+  * every local link            -> forward and reverse edges  (--uses / --used-by)
+
+so a query is a handful of set intersections and bisections. `--uses`
+follows links transitively: `model --uses horizontal_grid_cell:g106` walks
+grid cell <- subgrid <- horizontal grid <- component config <- model.
+
+The index is built from the tree in one pass (emd_registry). With `--index
+FILE` it is saved there and loaded on the next run while the tree is
+unchanged (file sizes and mtimes are fingerprinted), so repeated queries
+skip the JSON parsing entirely.
+
+Usage
+-----
+  python .github/scripts/emd_query.py horizontal_grid_cell --where grid_type=tripolar --where "x_resolution<0.5"
+  python .github/scripts/emd_query.py horizontal_grid_cell --where region=arctic,antarctic --fields units,n_cells
+  python .github/scripts/emd_query.py model --uses horizontal_grid_cell:g106
+  python .github/scripts/emd_query.py horizontal_computational_grid --used-by model:canesm5-1
+  python .github/scripts/emd_query.py component_config --count-by horizontal_computational_grid
+  python .github/scripts/emd_query.py vertical_computational_grid --where "n_z>=50" --format json
+  python .github/scripts/emd_query.py --index ~/.cache/emd-query.json model_component --where component=ocean
+  python .github/scripts/emd_query.py --fields-of horizontal_grid_cell
+
+Exit code: 0, or 2 on a bad query.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+from emd_registry import (  # noqa: E402
+    FIELD_ALIASES, FOLDERS, PLACEHOLDERS, Registry, link_ids, normalise_id,
+)
+
+# Bump when the index layout changes; older index files are rebuilt.
+INDEX_VERSION = 1
+
+# folder -> ({categorical or link field, ...}, {numeric field, ...})
+INDEXED: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "model_family": (
+        ("family_type", "primary_institution", "collaborative_institutions", "scientific_domains"),
+        ("established",),
+    ),
+    "horizontal_grid_cell": (
+        ("grid_type", "grid_mapping", "units", "region", "temporal_refinement", "truncation_method"),
+        ("x_resolution", "y_resolution", "n_cells", "truncation_number",
+         "southernmost_latitude", "westernmost_longitude"),
+    ),
+    "horizontal_subgrid": (("cell_variable_type", "horizontal_grid_cell"), ()),
+    "horizontal_computational_grid": (("arrangement", "horizontal_subgrids"), ()),
+    "vertical_computational_grid": (
+        ("vertical_coordinate",),
+        ("n_z", "top_layer_thickness", "bottom_layer_thickness", "total_thickness"),
+    ),
+    "model_component": (("component", "family", "code_base"), ()),
+    "component_config": (
+        ("model_component", "horizontal_computational_grid", "vertical_computational_grid"), (),
+    ),
+    "model": (
+        ("family", "calendar", "component_configs", "dynamic_components",
+         "prescribed_components", "omitted_components"),
+        ("release_year",),
+    ),
+}
+
+_CLAUSE = re.compile(r"^\s*([\w@.-]+)\s*(<=|>=|!=|=|<|>)\s*(.*?)\s*$")
+
+
+# =============================================================================
+# Building and loading the index
+# =============================================================================
+
+def fingerprint(root: Path) -> str:
+    """Hash of every record file's name, size and mtime under the data folders."""
+    h = hashlib.sha1()
+    for folder in FOLDERS:
+        directory = root / folder
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            if path.suffix == ".json" or path.name == "_context":
+                st = path.stat()
+                h.update(f"{folder}/{path.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _number(value) -> float | int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value) if any(c in value for c in ".eE") else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _terms(value, is_link: bool) -> list[str]:
+    """Normalised values of a categorical field (lists give one term per item)."""
+    if is_link:
+        return link_ids(value)
+    items = value if isinstance(value, list) else [value]
+    return [str(i).strip().lower() for i in items
+            if i is not None and str(i).strip().lower() not in PLACEHOLDERS]
+
+
+def build_index(reg: Registry) -> dict:
+    """
+    {'folders': {folder: {'rows': {id: {field: value}},
+                          'eq':   {field: {term: [ids]}},
+                          'num':  {field: [[values...], [ids...]]}}},
+     'edges': [[folder, id, target_folder, target_id], ...]}
+    """
+    folders = {}
+    for folder in FOLDERS:
+        categorical, numeric = INDEXED.get(folder, ((), ()))
+        links = reg.links.get(folder, {})
+        aliases = {alias: field for (f, alias), field in FIELD_ALIASES.items() if f == folder}
+        rows: dict[str, dict] = {}
+        eq: dict[str, dict[str, list[str]]] = {field: {} for field in categorical}
+        num: dict[str, list[tuple]] = {field: [] for field in numeric}
+
+        for f, entry_id, _path in reg.files():
+            if f != folder:
+                continue
+            record = reg.entries[folder][entry_id]
+            entry_id = reg.canonical_id(folder, entry_id)
+            row = {"ui_label": record.get("ui_label", "")}
+            for key, value in record.items():
+                field = aliases.get(key, key)
+                if field in eq:
+                    terms = _terms(value, field in links)
+                    if not terms and field in row:
+                        continue
+                    row[field] = terms if isinstance(value, list) or field in row else \
+                        (terms[0] if terms else None)
+                    for term in terms:
+                        eq[field].setdefault(term, []).append(entry_id)
+                elif field in num:
+                    n = _number(value)
+                    row[field] = n
+                    if n is not None:
+                        num[field].append((n, entry_id))
+            rows[entry_id] = row
+
+        for field in eq:
+            for term in eq[field]:
+                eq[field][term] = sorted(set(eq[field][term]))
+        folders[folder] = {
+            "rows": rows,
+            "eq": eq,
+            "num": {field: [[v for v, _ in pairs], [i for _, i in pairs]]
+                    for field, pairs in ((f, sorted(p)) for f, p in num.items())},
+        }
+
+    edges = sorted({(folder, reg.canonical_id(folder, entry_id), target,
+                     reg.canonical_id(target, value))
+                    for folder, entry_id, _field, value, target in reg.iter_links()
+                    if target is not None})
+    return {"folders": folders, "edges": [list(e) for e in edges]}
+
+
+def load_index(root: Path, path: Path | None = None, rebuild: bool = False) -> dict:
+    """The index for `root`: read from `path` if still current, else built (and saved)."""
+    stamp = fingerprint(root)
+    if path and path.exists() and not rebuild:
+        try:
+            index = json.loads(path.read_text(encoding="utf-8"))
+            if index.get("version") == INDEX_VERSION and index.get("fingerprint") == stamp:
+                return index
+        except (OSError, ValueError):
+            pass
+    index = build_index(Registry.load(root))
+    index.update(version=INDEX_VERSION, fingerprint=stamp)
+    if path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    return index
+
+
+# =============================================================================
+# Queries
+# =============================================================================
+
+class QueryError(ValueError):
+    pass
+
+
+def _adjacency(index: dict, reverse: bool) -> dict[tuple[str, str], list[tuple[str, str]]]:
+    key = "_reverse" if reverse else "_forward"
+    if key not in index:
+        adj: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        for folder, entry_id, target, target_id in index["edges"]:
+            a, b = ((target, target_id), (folder, entry_id))
+            if not reverse:
+                a, b = b, a
+            adj.setdefault(a, []).append(b)
+        index[key] = adj
+    return index[key]
+
+
+def reachable(index: dict, start: tuple[str, str], folder: str, reverse: bool) -> set[str]:
+    """Ids in `folder` reachable from `start` over links (reverse: who links to it)."""
+    adj = _adjacency(index, reverse)
+    seen, found = {start}, set()
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for nxt in adj.get(node, ()):
+            if nxt in seen:
+                continue
+            seen.add(nxt)
+            if nxt[0] == folder:
+                found.add(nxt[1])
+            queue.append(nxt)
+    return found
+
+
+def _match(data: dict, clause: str) -> set[str]:
+    m = _CLAUSE.match(clause)
+    if not m:
+        raise QueryError(f"cannot parse --where {clause!r} (expected FIELD OP VALUE)")
+    field, op, raw = m.groups()
+    if field in data["eq"]:
+        if op not in ("=", "!="):
+            raise QueryError(f"{field} is categorical: use = or !=")
+        hits = set()
+        for term in raw.split(","):
+            hits.update(data["eq"][field].get(normalise_id(term), ()))
+        return hits if op == "=" else set(data["rows"]) - hits
+    if field in data["num"]:
+        value = _number(raw)
+        if value is None:
+            raise QueryError(f"{field} is numeric: {raw!r} is not a number")
+        values, ids = data["num"][field]
+        lo, hi = 0, len(values)
+        if op in (">", ">="):
+            lo = (bisect.bisect_right if op == ">" else bisect.bisect_left)(values, value)
+        elif op in ("<", "<="):
+            hi = (bisect.bisect_left if op == "<" else bisect.bisect_right)(values, value)
+        else:
+            lo, hi = bisect.bisect_left(values, value), bisect.bisect_right(values, value)
+        hits = set(ids[lo:hi])
+        return set(data["rows"]) - hits if op == "!=" else hits
+    raise QueryError(f"{field} is not indexed; indexed fields: "
+                     + ", ".join(sorted([*data["eq"], *data["num"]])))
+
+
+def _node(spec: str) -> tuple[str, str]:
+    folder, sep, entry_id = spec.partition(":")
+    if not sep or folder not in FOLDERS:
+        raise QueryError(f"expected FOLDER:ID with FOLDER one of {', '.join(FOLDERS)}, got {spec!r}")
+    return folder, normalise_id(entry_id)
+
+
+def query(index: dict, folder: str, where=(), uses=(), used_by=()) -> list[str]:
+    """Sorted ids in `folder` matching every clause."""
+    data = index["folders"][folder]
+    result = set(data["rows"])
+    for clause in where:
+        result &= _match(data, clause)
+    for spec in uses:
+        result &= reachable(index, _node(spec), folder, reverse=True)
+    for spec in used_by:
+        result &= reachable(index, _node(spec), folder, reverse=False)
+    return sorted(result)
+
+
+def count_by(index: dict, folder: str, ids: list[str], field: str) -> list[tuple[str, int]]:
+    """[(value, n)] over `ids`, most common first; list fields count each item."""
+    data = index["folders"][folder]
+    if field not in data["eq"] and field not in data["num"]:
+        raise QueryError(f"{field} is not indexed")
+    counts: dict[str, int] = {}
+    for entry_id in ids:
+        value = data["rows"][entry_id].get(field)
+        for v in (value if isinstance(value, list) else [value]):
+            key = "—" if v is None else str(v)
+            counts[key] = counts.get(key, 0) + 1
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def print_table(header: list[str], rows: list[list]) -> None:
+    cells = [[_cell(v) for v in row] for row in rows]
+    widths = [max([len(h), *(len(r[i]) for r in cells)]) for i, h in enumerate(header)]
+    print("  ".join(f"\033[94m{h:<{w}}\033[0m" for h, w in zip(header, widths)))
+    for row in cells:
+        print("  ".join(f"{c:<{w}}" for c, w in zip(row, widths)).rstrip())
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="emd-query",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("folder", nargs="?", choices=FOLDERS, help="Entry type to return.")
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--where", action="append", default=[], metavar="FIELD<OP>VALUE",
+                        help="Filter on an indexed field: = and != (comma = any of) for "
+                             "categorical/link fields, < <= > >= = for numeric (repeatable, AND).")
+    parser.add_argument("--uses", action="append", default=[], metavar="FOLDER:ID",
+                        help="Only entries that link to FOLDER:ID, directly or transitively.")
+    parser.add_argument("--used-by", action="append", default=[], metavar="FOLDER:ID",
+                        help="Only entries FOLDER:ID links to, directly or transitively.")
+    parser.add_argument("--fields", help="Comma-separated indexed fields to show.")
+    parser.add_argument("--count-by", metavar="FIELD", help="Count the matches per value of FIELD.")
+    parser.add_argument("--format", choices=("table", "json", "ids"), default="table",
+                        help="Output format (default: table).")
+    parser.add_argument("--index", metavar="FILE",
+                        help="Load the index from FILE if current, else build and save it there.")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the --index file.")
+    parser.add_argument("--fields-of", metavar="FOLDER", choices=FOLDERS,
+                        help="List the indexed fields of FOLDER and exit.")
+    args = parser.parse_args()
+
+    if args.fields_of:
+        categorical, numeric = INDEXED.get(args.fields_of, ((), ()))
+        for field in categorical:
+            print(f"{field:<32} = !=")
+        for field in numeric:
+            print(f"{field:<32} < <= > >= = !=")
+        return 0
+    if not args.folder:
+        parser.error("a folder is required")
+
+    started = time.perf_counter()
+    root = Path(args.root).expanduser().resolve()
+    index = load_index(root, Path(args.index).expanduser() if args.index else None, args.rebuild)
+    loaded = time.perf_counter()
+    try:
+        ids = query(index, args.folder, args.where, args.uses, args.used_by)
+        counts = count_by(index, args.folder, ids, args.count_by) if args.count_by else None
+    except QueryError as e:
+        print(f"\033[91m✗ {e}\033[0m", file=sys.stderr)
+        return 2
+    elapsed = (time.perf_counter() - loaded) * 1000
+
+    data = index["folders"][args.folder]
+    fields = [f.strip() for f in args.fields.split(",")] if args.fields else \
+        [f.split("<")[0].split(">")[0].split("=")[0].rstrip("!").strip() for f in args.where]
+    fields = [f for f in dict.fromkeys(fields) if f]
+    unknown = [f for f in fields if f not in data["eq"] and f not in data["num"] and f != "ui_label"]
+    if unknown:
+        print(f"\033[91m✗ not indexed: {', '.join(unknown)}\033[0m", file=sys.stderr)
+        return 2
+
+    if args.format == "ids":
+        print("\n".join(value for value, _n in counts) if counts is not None else "\n".join(ids))
+    elif args.format == "json":
+        if counts is not None:
+            print(json.dumps(dict(counts), indent=2))
+        else:
+            print(json.dumps([{"id": i, **{f: data["rows"][i].get(f) for f in ["ui_label", *fields]}}
+                              for i in ids], indent=2, ensure_ascii=False))
+    elif counts is not None:
+        print_table([args.count_by, "count"], [list(c) for c in counts])
+    else:
+        print_table(["id", "ui_label", *fields],
+                    [[i, data["rows"][i].get("ui_label"), *(data["rows"][i].get(f) for f in fields)]
+                     for i in ids])
+    if args.format == "table":
+        print(f"\033[90m{len(ids)} {args.folder} entr{'y' if len(ids) == 1 else 'ies'} "
+              f"in {elapsed:.1f} ms (index {(loaded - started) * 1000:.0f} ms)\033[0m",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
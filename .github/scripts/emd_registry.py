@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+emd_registry.py
+===============
+Load the whole src-data registry from disk in one pass (stdlib only).
+
+Every EMD folder has a `_context` declaring which fields are links
+(`"@type": "@id"`) and, for links into another EMD folder, that folder's
+remote context (`https://emd.mipcvs.dev/<folder>/_context`). This module
+reads all eight folders once and turns those declarations into:
+
+  * `Registry.ids(folder)`   — the set of normalised `@id`s in a folder
+  * `Registry.links[folder]` — {field: target folder, or None if external}
+  * `Registry.iter_links()`  — every (folder, id, field, value, target)
+  * `Registry.referrers()`   — reverse index: who links to each entry
+
+so cross-folder checks are plain set lookups instead of one HTTP request per
+link (see check_integrity.py).
+
+Two things in the live data are not spelled out by the `_context` files and
+are patched in here:
+
+  * Untyped local links — `horizontal_subgrids` and `horizontal_grid_cell`
+    are declared `@type: @id` without a `@context`, but point into a sibling
+    folder (LOCAL_TARGETS).
+  * Field aliases — some records use a field name the `_context` does not
+    declare (`horizontal_grid_cells`, `model_components`); these are read as
+    the declared field they stand for (FIELD_ALIASES).
+
+Usage in code
+-------------
+    from emd_registry import Registry
+    reg = Registry.load(root)
+    for folder, entry_id, field, value, target in reg.iter_links():
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, KeysView
+
+# Data folders, in dependency order: each folder only links to folders
+# listed before it.
+FOLDERS = (
+    "model_family",
+    "horizontal_grid_cell",
+    "horizontal_subgrid",
+    "horizontal_computational_grid",
+    "vertical_computational_grid",
+    "model_component",
+    "component_config",
+    "model",
+)
+
+# Remote contexts under this prefix are EMD folders in this same tree.
+EMD_PREFIX = "https://emd.mipcvs.dev/"
+
+# Link fields declared without a @context that nevertheless point locally.
+LOCAL_TARGETS: dict[tuple[str, str], str] = {
+    ("horizontal_computational_grid", "horizontal_subgrids"): "horizontal_subgrid",
+    ("horizontal_subgrid", "horizontal_grid_cell"): "horizontal_grid_cell",
+}
+
+# Undeclared field names used in the data -> the declared field they mean.
+FIELD_ALIASES: dict[tuple[str, str], str] = {
+    ("horizontal_subgrid", "horizontal_grid_cells"): "horizontal_grid_cell",
+    ("model", "model_components"): "component_configs",
+}
+
+# Placeholders that mean "unset" — not real links (same as check_links.py).
+PLACEHOLDERS = {"", "not specified", "_no response_", "none"}
+
+
+def normalise_id(value: str) -> str:
+    """Canonical form used for every id comparison (ids are case-insensitive)."""
+    return value.strip().lower()
+
+
+def loose_id(value: str) -> str:
+    """Id with case and every separator dropped, for "did you mean" matching."""
+    return "".join(c for c in value.lower() if c.isalnum())
+
+
+def link_values(value: Any) -> Iterator[str]:
+    """Yield link strings from a str, an {"@id": ...} object, or a (nested) list."""
+    if isinstance(value, str):
+        if value.strip().lower() not in PLACEHOLDERS:
+            yield value.strip()
+    elif isinstance(value, dict):
+        yield from link_values(value.get("@id"))
+    elif isinstance(value, list):
+        for item in value:
+            yield from link_values(item)
+
+
+def link_ids(value: Any) -> list[str]:
+    """
+    Normalised ids of a link value; EMD URLs are reduced to the id they name,
+    other URLs are kept as they are.
+    """
+    ids = []
+    for raw in link_values(value):
+        if raw.startswith(("http://", "https://")):
+            local = emd_url_target(raw)
+            ids.append(local[1] if local else raw)
+        else:
+            ids.append(normalise_id(raw))
+    return ids
+
+
+def context_folder(ctx_url: str | None) -> str | None:
+    """Map `https://emd.mipcvs.dev/<folder>/_context` to `<folder>` (else None)."""
+    if not ctx_url or not ctx_url.startswith(EMD_PREFIX):
+        return None
+    return ctx_url[len(EMD_PREFIX):].split("/", 1)[0] or None
+
+
+def link_fields(folder: str, context: dict) -> dict[str, str | None]:
+    """
+    Return {field: target_folder_or_None} for every `@type: @id` field of
+    `folder`, aliases included. None means the link leaves this tree
+    (constants CVs, DOIs, ...) and cannot be checked offline.
+    """
+    fields: dict[str, str | None] = {}
+    for key, spec in context.items():
+        if key.startswith("@") or not isinstance(spec, dict) or spec.get("@type") != "@id":
+            continue
+        fields[key] = context_folder(spec.get("@context")) or LOCAL_TARGETS.get((folder, key))
+    for (alias_folder, alias), field in FIELD_ALIASES.items():
+        if alias_folder == folder and field in fields:
+            fields.setdefault(alias, fields[field])
+    return fields
+
+
+class Registry:
+    """All src-data records under `root`, indexed by folder and `@id`."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # folder -> {normalised id: record}
+        self.entries: dict[str, dict[str, dict]] = {}
+        # folder -> {normalised id: path}
+        self.paths: dict[str, dict[str, Path]] = {}
+        # folder -> {field: target folder | None}
+        self.links: dict[str, dict[str, str | None]] = {}
+        # folder -> {file-stem id: @id} where the two differ
+        self.aliases: dict[str, dict[str, str]] = {}
+        # (path, message) for files that could not be read
+        self.errors: list[tuple[Path, str]] = []
+        self._referrers: dict[tuple[str, str], list[tuple[str, str, str]]] | None = None
+
+    @classmethod
+    def load(cls, root: Path, folders=FOLDERS) -> "Registry":
+        reg = cls(root)
+        for folder in folders:
+            reg._load_folder(folder)
+        return reg
+
+    def _load_folder(self, folder: str) -> None:
+        directory = self.root / folder
+        entries: dict[str, dict] = {}
+        paths: dict[str, Path] = {}
+        self.entries[folder] = entries
+        self.paths[folder] = paths
+        self.aliases[folder] = aliases = {}
+        self.links[folder] = {}
+        if not directory.is_dir():
+            return
+
+        ctx_path = directory / "_context"
+        try:
+            context = json.loads(ctx_path.read_text(encoding="utf-8")).get("@context", {})
+            self.links[folder] = link_fields(folder, context)
+        except (OSError, json.JSONDecodeError) as e:
+            self.errors.append((ctx_path, f"unreadable _context: {e}"))
+
+        for path in sorted(directory.glob("*.json")):
+            if path.name.startswith("_"):
+                continue
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as e:
+                self.errors.append((path, f"invalid JSON: {e}"))
+                continue
+            if not isinstance(record, dict):
+                self.errors.append((path, "not a JSON object"))
+                continue
+            entry_id = normalise_id(str(record.get("@id") or path.stem))
+            if entry_id in paths:
+                self.errors.append((path, f"duplicate @id '{entry_id}' (also in {paths[entry_id].name})"))
+                continue
+            entries[entry_id] = record
+            paths[entry_id] = path
+            # Links may use the file name where it differs from @id (case,
+            # legacy names); accept both.
+            stem = normalise_id(path.stem)
+            if stem != entry_id and stem not in paths:
+                entries[stem] = record
+                paths[stem] = path
+                aliases[stem] = entry_id
+
+    def ids(self, folder: str) -> KeysView[str]:
+        return self.entries.get(folder, {}).keys()
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        folder, entry_id = key
+        return normalise_id(entry_id) in self.entries.get(folder, {})
+
+    def canonical_id(self, folder: str, entry_id: str) -> str:
+        """The record's own @id for `entry_id`, which may be a file-stem alias."""
+        entry_id = normalise_id(entry_id)
+        return self.aliases.get(folder, {}).get(entry_id, entry_id)
+
+    def files(self) -> Iterator[tuple[str, str, Path]]:
+        """Yield (folder, id, path) once per file."""
+        for folder, paths in self.paths.items():
+            seen: set[Path] = set()
+            for entry_id, path in paths.items():
+                if entry_id not in self.aliases[folder] and path not in seen:
+                    seen.add(path)
+                    yield folder, entry_id, path
+
+    def iter_links(self) -> Iterator[tuple[str, str, str, str, str | None]]:
+        """
+        Yield (folder, entry_id, field, value, target_folder) for every link
+        value in every record. `value` is normalised; EMD URLs pointing into
+        a local folder are reduced to their id.
+        """
+        for folder, entry_id, path in self.files():
+            record = self.entries[folder][entry_id]
+            for field, target in self.links.get(folder, {}).items():
+                if field not in record:
+                    continue
+                for raw in link_values(record[field]):
+                    if not raw.startswith(("http://", "https://")):
+                        yield folder, entry_id, field, normalise_id(raw), target
+                        continue
+                    local = emd_url_target(raw)
+                    if local is None:
+                        yield folder, entry_id, field, raw, None
+                    else:
+                        yield folder, entry_id, field, local[1], local[0]
+
+
+    def referrers(self) -> dict[tuple[str, str], list[tuple[str, str, str]]]:
+        """
+        Reverse-link index: (target folder, id) -> [(folder, id, field), ...]
+        for every local link pointing at it, built once in one pass over the
+        links. Ids are canonical; links to missing entries are kept under the
+        id they name.
+        """
+        if self._referrers is None:
+            index: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+            for folder, entry_id, field, value, target in self.iter_links():
+                if target is not None:
+                    key = (target, self.canonical_id(target, value))
+                    index.setdefault(key, []).append((folder, entry_id, field))
+            self._referrers = index
+        return self._referrers
+
+
+def emd_url_target(url: str) -> tuple[str, str] | None:
+    """(folder, id) for `https://emd.mipcvs.dev/<folder>/<id>[.json]`, else None."""
+    if not url.startswith(EMD_PREFIX):
+        return None
+    folder, _, rest = url[len(EMD_PREFIX):].partition("/")
+    if folder not in FOLDERS or not rest or "/" in rest:
+        return None
+    if rest.endswith(".json"):
+        rest = rest[:-len(".json")]
+    return folder, normalise_id(rest)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+export_arrow.py
+===============
+Columnar export of the whole registry: one typed Arrow table per folder,
+written as Parquet (or Arrow IPC) files.
+
+Each folder's records are flattened into one row per entry. The columns are
+the union of the fields its records use (the `ALL_KEYS` of each handler plus
+whatever older records carry), typed from the values:
+
+  * numbers              -> int64 / float64 ('' and 'none' become null)
+  * lists                -> list<string> (list<int64> / list<float64> for
+                            numeric lists, list<list<string>> for pairs such
+                            as `coupled_components`)
+  * link fields          -> normalised target ids, as a string or list<string>
+                            column (field aliases folded into the declared
+                            field, `{"@id": ...}` objects and EMD URLs reduced
+                            to the id)
+  * everything else      -> string
+
+`@context` / `@type` are dropped and `@id` becomes the first column, `id`.
+A separate `links` table holds every local link as an edge
+(folder, id, field, target_folder, target_id), so "how many configs use each
+h###" is a group-by and multi-hop questions are joins.
+
+pyarrow is only needed to write files; `--schema` prints the inferred
+schema with the standard library alone.
+
+Usage
+-----
+  python .github/scripts/export_arrow.py --out parquet
+  python .github/scripts/export_arrow.py --out arrow --format arrow
+  python .github/scripts/export_arrow.py --schema
+  python .github/scripts/export_arrow.py --folder horizontal_grid_cell --schema
+
+Exit code: 0, or 2 if pyarrow is needed and not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+from emd_registry import (  # noqa: E402
+    FIELD_ALIASES, FOLDERS, PLACEHOLDERS, Registry, link_ids,
+)
+
+SKIPPED_FIELDS = {"@context", "@type", "@id"}
+
+# Column kinds, in the order a mixed column falls back through.
+INT, FLOAT, STRING = "int64", "float64", "string"
+LIST_INT, LIST_FLOAT, LIST_STRING = "list<int64>", "list<float64>", "list<string>"
+LIST_LIST_STRING = "list<list<string>>"
+
+LINKS_TABLE = "links"
+LINKS_SCHEMA = [("folder", STRING), ("id", STRING), ("field", STRING),
+                ("target_folder", STRING), ("target_id", STRING)]
+
+
+# =============================================================================
+# Schema inference
+# =============================================================================
+
+def _is_null(value) -> bool:
+    return value is None or (isinstance(value, str) and value.strip().lower() in PLACEHOLDERS)
+
+
+def _number(value):
+    """int/float for numbers and numeric strings, else None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+def _scalar_kind(values: list) -> str:
+    numbers = [_number(v) for v in values]
+    if values and all(n is not None for n in numbers):
+        return INT if all(isinstance(n, int) for n in numbers) else FLOAT
+    return STRING
+
+
+def infer_kind(values: list, is_link: bool) -> str:
+    """Arrow column kind for the non-null values of one field."""
+    if is_link:
+        return LIST_STRING if any(isinstance(v, list) for v in values) else STRING
+    if any(isinstance(v, list) for v in values):
+        items = [i for v in values for i in (v if isinstance(v, list) else [v]) if not _is_null(i)]
+        if items and all(isinstance(i, list) for i in items):
+            return LIST_LIST_STRING
+        kind = _scalar_kind(items) if items else STRING
+        return {INT: LIST_INT, FLOAT: LIST_FLOAT}.get(kind, LIST_STRING)
+    return _scalar_kind(values)
+
+
+def _convert(value, kind: str):
+    """One cell of a column of `kind` (link columns are handled by the caller)."""
+    if kind in (LIST_INT, LIST_FLOAT, LIST_STRING, LIST_LIST_STRING):
+        if _is_null(value):
+            return []
+        items = [i for i in (value if isinstance(value, list) else [value]) if not _is_null(i)]
+        if kind == LIST_LIST_STRING:
+            return [[str(x) for x in (i if isinstance(i, list) else [i])] for i in items]
+        if kind == LIST_STRING:
+            return [i if isinstance(i, str) else json.dumps(i, ensure_ascii=False) for i in items]
+        return [(int if kind == LIST_INT else float)(_number(i)) for i in items]
+    if _is_null(value):
+        return None
+    if kind == INT:
+        return int(_number(value))
+    if kind == FLOAT:
+        return float(_number(value))
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def folder_table(reg: Registry, folder: str) -> tuple[list[tuple[str, str]], dict[str, list]]:
+    """
+    ([(column, kind), ...], {column: [cell, ...]}) for one folder, one row
+    per record file in id order.
+    """
+    aliases = {alias: field for (f, alias), field in FIELD_ALIASES.items() if f == folder}
+    links = reg.links.get(folder, {})
+    ids = sorted(entry_id for f, entry_id, _path in reg.files() if f == folder)
+    records = []
+    for entry_id in ids:
+        record = {}
+        for key, value in reg.entries[folder][entry_id].items():
+            if key in SKIPPED_FIELDS:
+                continue
+            key = aliases.get(key, key)
+            if key in record and _is_null(value):
+                continue
+            record[key] = value
+        records.append(record)
+
+    fields: list[str] = []
+    for record in records:
+        fields += [k for k in record if k not in fields]
+
+    schema = [("id", STRING)]
+    columns: dict[str, list] = {"id": [reg.canonical_id(folder, i) for i in ids]}
+    for field in fields:
+        is_link = field in links
+        present = [r[field] for r in records if field in r and not _is_null(r[field])]
+        kind = infer_kind(present, is_link)
+        if is_link:
+            cells = [link_ids(r.get(field)) for r in records]
+            if kind == STRING:
+                cells = [c[0] if c else None for c in cells]
+        else:
+            cells = [_convert(r.get(field), kind) for r in records]
+        schema.append((field, kind))
+        columns[field] = cells
+    return schema, columns
+
+
+def links_table(reg: Registry, folders) -> dict[str, list]:
+    """Every local link as an edge row, canonical ids on both ends."""
+    columns: dict[str, list] = {name: [] for name, _kind in LINKS_SCHEMA}
+    for folder, entry_id, field, value, target in reg.iter_links():
+        if target is None or folder not in folders:
+            continue
+        field = FIELD_ALIASES.get((folder, field), field)
+        for name, cell in zip(columns, (folder, reg.canonical_id(folder, entry_id), field,
+                                        target, reg.canonical_id(target, value))):
+            columns[name].append(cell)
+    return columns
+
+
+# =============================================================================
+# Arrow
+# =============================================================================
+
+def _pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _arrow_type(pa, kind: str):
+    return {
+        INT: pa.int64(), FLOAT: pa.float64(), STRING: pa.string(),
+        LIST_INT: pa.list_(pa.int64()), LIST_FLOAT: pa.list_(pa.float64()),
+        LIST_STRING: pa.list_(pa.string()), LIST_LIST_STRING: pa.list_(pa.list_(pa.string())),
+    }[kind]
+
+
+def to_arrow(pa, schema: list[tuple[str, str]], columns: dict[str, list]):
+    arrow_schema = pa.schema([(name, _arrow_type(pa, kind)) for name, kind in schema])
+    return pa.table({name: columns[name] for name, _kind in schema}, schema=arrow_schema)
+
+
+def export(reg: Registry, folders, out: Path, fmt: str = "parquet") -> list[tuple[str, int, int, Path]]:
+    """Write one file per folder plus the links table; [(name, rows, columns, path)]."""
+    pa = _pyarrow()
+    out.mkdir(parents=True, exist_ok=True)
+    tables = [(folder, *folder_table(reg, folder)) for folder in folders]
+    tables.append((LINKS_TABLE, LINKS_SCHEMA, links_table(reg, folders)))
+
+    written = []
+    for name, schema, columns in tables:
+        table = to_arrow(pa, schema, columns)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            path = out / f"{name}.parquet"
+            pq.write_table(table, path, compression="zstd")
+        else:
+            import pyarrow.feather as feather
+            path = out / f"{name}.arrow"
+            feather.write_feather(table, path, compression="zstd")
+        written.append((name, table.num_rows, table.num_columns, path))
+    return written
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_schema(reg: Registry, folders) -> None:
+    for folder in folders:
+        schema, columns = folder_table(reg, folder)
+        print(f"\033[94m{folder}\033[0m  ({len(columns['id'])} rows)")
+        for name, kind in schema:
+            print(f"  {name:<32} {kind}")
+    print(f"\033[94m{LINKS_TABLE}\033[0m  ({len(links_table(reg, folders)['id'])} rows)")
+    for name, kind in LINKS_SCHEMA:
+        print(f"  {name:<32} {kind}")
+
+
+def write_step_summary(written, path: str) -> None:
+    lines = ["## Columnar export", "", "| Table | Rows | Columns | File |", "|---|---:|---:|---|"]
+    lines += [f"| `{name}` | {rows} | {cols} | `{p.name}` ({p.stat().st_size:,} B) |"
+              for name, rows, cols, p in written]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--out", default="parquet", help="Output directory (default: ./parquet).")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet",
+                        help="File format (default: parquet).")
+    parser.add_argument("--folder", action="append", choices=FOLDERS,
+                        help="Only export this type (repeatable).")
+    parser.add_argument("--schema", action="store_true",
+                        help="Print the inferred schema instead of writing files.")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    folders = tuple(args.folder or FOLDERS)
+    reg = Registry.load(root, FOLDERS)
+    for path, message in reg.errors:
+        print(f"\033[93m⚠ {path.relative_to(root)}: {message}\033[0m", file=sys.stderr)
+
+    if args.schema:
+        print_schema(reg, folders)
+        return 0
+
+    if _pyarrow() is None:
+        print("\033[91m✗ pyarrow is not installed (pip install pyarrow)\033[0m", file=sys.stderr)
+        return 2
+
+    written = export(reg, folders, Path(args.out), args.format)
+    for name, rows, cols, path in written:
+        print(f"\033[92m✓\033[0m {path}  {rows} rows × {cols} columns")
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        write_step_summary(written, summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,9 +15,15 @@ Usage
   python3 find_grid_matches.py --threshold 0.6     # hide matches below score
   python3 find_grid_matches.py --json              # emit JSON instead of table
   python3 find_grid_matches.py --verbose           # per-field diff for each PR
+  python3 find_grid_matches.py --self-join         # audit the registry itself
+  python3 find_grid_matches.py --self-join --root . --threshold 0.9 --json
 
 Outputs a ranked match table, one row per closed horizontal_grid_cell PR.
 
+With --self-join no PRs are fetched: every horizontal_grid_cell/*.json entry
+under --root is compared with the others and clusters of near-identical
+entries (score >= --threshold, default 0.95) are reported.
+
 Requirements
 ------------
   gh CLI authenticated:  gh auth status
@@ -34,6 +40,25 @@ ui_label, validation_key):
     either side             not penalised
 
 Overall score = mean of all evaluable per-field scores.
+
+Self-join
+---------
+Comparing every pair is quadratic, so the self-join only scores pairs that
+could plausibly match:
+
+  * blocking   -> same grid_type; units must agree where both are set
+  * sweep      -> within a block, entries are sorted by n_cells and each is
+                  compared only with the following entries whose n_cells is
+                  close enough for the pair to still reach --threshold: over
+                  k fields that needs an n_cells score >= 1 - k(1 - threshold)
+  * entries without n_cells are compared with their whole block
+
+Before compare(), a pair is dropped if its string fields already disagree
+too often for it to reach --threshold. All three steps are lossless for the
+default threshold (a grid_type mismatch alone keeps a pair of fewer than 20
+fields below 95%). --window trades that for speed with a fixed n_cells ratio.
+
+Pairs at or above --threshold are merged into clusters (union-find).
 """
 
 from __future__ import annotations
@@ -43,6 +68,7 @@ import json
 import re
 import subprocess
 import sys
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
@@ -201,6 +227,150 @@ def load_reference(path: Path | None) -> list[dict]:
     return data if isinstance(data, list) else list(data.values())
 
 
+# ---------------------------------------------------------------------------
+# Self-join over the registry
+# ---------------------------------------------------------------------------
+
+SELF_JOIN_THRESHOLD = 0.95
+
+
+def load_registry(root: Path) -> list[dict]:
+    """All horizontal_grid_cell entries under `root` (tempgrids included)."""
+    records = []
+    for path in sorted((root / TYPE_MARKER).glob("*.json")):
+        if path.name.startswith("_"):
+            continue
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        record.setdefault("@id", path.stem)
+        records.append(record)
+    return records
+
+
+def _key(v: Any) -> str:
+    v = _normalise(v)
+    return "" if v is None else str(v).strip().lower()
+
+
+def _n_fields(record: dict) -> int:
+    return sum(1 for k, v in record.items() if k not in SKIP_FIELDS and _normalise(v) is not None)
+
+
+def candidate_pairs(records: list[dict], threshold: float = SELF_JOIN_THRESHOLD,
+                    window: float | None = None):
+    """
+    Yield (i, j) index pairs worth scoring: blocked on grid_type (units
+    compatible), then swept over sorted n_cells.
+
+    Without `window` the sweep is lossless: a pair over k fields can only
+    reach `threshold` if its n_cells score is >= 1 - k * (1 - threshold), and
+    k is at most the smaller entry's field count. A `window` overrides that
+    bound with a fixed (tighter) n_cells ratio.
+    """
+    blocks: dict[str, list[int]] = defaultdict(list)
+    for i, r in enumerate(records):
+        blocks[_key(r.get("grid_type"))].append(i)
+
+    def units_agree(i: int, j: int) -> bool:
+        a, b = _key(records[i].get("units")), _key(records[j].get("units"))
+        return not a or not b or a == b
+
+    ratio = [window if window is not None else 1.0 - _n_fields(r) * (1.0 - threshold)
+             for r in records]
+
+    for members in blocks.values():
+        anchored, loose = [], []
+        for i in members:
+            n = _normalise(records[i].get("n_cells"))
+            (anchored if _is_numeric(n) and n > 0 else loose).append((n, i))
+        anchored.sort()
+        for a, (n_a, i) in enumerate(anchored):
+            # Later entries have larger n_cells; stop once even the smallest
+            # of the pair's field counts could not make up the difference.
+            r_i = ratio[i]
+            for n_b, j in anchored[a + 1:]:
+                if n_a < n_b * r_i:
+                    break
+                if n_a < n_b * ratio[j]:
+                    continue
+                if units_agree(i, j):
+                    yield i, j
+        for a, (_, i) in enumerate(loose):
+            for _, j in anchored + loose[a + 1:]:
+                if units_agree(i, j):
+                    yield i, j
+
+
+def self_join(
+    records: list[dict],
+    threshold: float = SELF_JOIN_THRESHOLD,
+    window: float | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Return (clusters, pairs_scored). Each cluster is {'ids': [...],
+    'pairs': [{'a', 'b', 'score', 'field_scores'}, ...]}, best pair first.
+    """
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # compare() over k fields loses 1/k per categorical mismatch, so a pair
+    # whose string fields already disagree too often can be skipped unscored.
+    sizes = [_n_fields(r) for r in records]
+    labels = [{k: v.strip().lower() for k, v in r.items()
+               if k not in SKIP_FIELDS and isinstance(v, str) and v.strip()}
+              for r in records]
+
+    matches, scored = [], 0
+    for i, j in candidate_pairs(records, threshold, window):
+        other = labels[j]
+        mismatches = sum(1 for k, v in labels[i].items() if other.get(k, v) != v)
+        k_max = min(sizes[i], sizes[j])
+        if mismatches and (k_max - mismatches) < threshold * k_max:
+            continue
+        scored += 1
+        score, fields = compare(records[i], records[j])
+        if score >= threshold:
+            matches.append((i, j, score, fields))
+            parent[find(i)] = find(j)
+
+    grouped: dict[int, list] = defaultdict(list)
+    for i, j, score, fields in matches:
+        grouped[find(i)].append({
+            "a": records[i].get("@id"), "b": records[j].get("@id"),
+            "score": score, "field_scores": fields,
+        })
+    clusters = []
+    for pairs in grouped.values():
+        pairs.sort(key=lambda p: -p["score"])
+        ids = sorted({p["a"] for p in pairs} | {p["b"] for p in pairs})
+        clusters.append({"ids": ids, "pairs": pairs})
+    clusters.sort(key=lambda c: (-c["pairs"][0]["score"], c["ids"]))
+    return clusters, scored
+
+
+def print_clusters(clusters: list[dict], records: list[dict], verbose: bool):
+    by_id = {r.get("@id"): r for r in records}
+    sep = "-" * 105
+    print()
+    print(sep)
+    if not clusters:
+        print("  (no near-duplicate grid cells above threshold)")
+    for n, cluster in enumerate(clusters, 1):
+        print(f"  Cluster {n}: {', '.join(cluster['ids'])}")
+        for p in cluster["pairs"]:
+            print(f"    {p['score']:>6.1%}  [{_score_bar(p['score'])}]  {p['a']} ~ {p['b']}")
+            if verbose:
+                for line in _diff_lines(by_id[p["a"]], by_id[p["b"]], p["field_scores"]):
+                    print(line)
+        print()
+    print(sep)
+
+
 # ---------------------------------------------------------------------------
 # Output helpers
 # ---------------------------------------------------------------------------
@@ -267,6 +437,19 @@ def main():
     parser = argparse.ArgumentParser(
         description="Match closed horizontal_grid_cell PRs against registered entries."
     )
+    parser.add_argument(
+        "--self-join", action="store_true",
+        help="Audit the registry against itself instead of fetching PRs."
+    )
+    parser.add_argument(
+        "--root", type=Path, default=Path("."),
+        help="src-data root for --self-join (default: cwd)."
+    )
+    parser.add_argument(
+        "--window", type=float, default=None,
+        help="--self-join: only pair entries whose n_cells ratio is >= this"
+             " (faster, may miss matches; default: the lossless bound for --threshold)."
+    )
     parser.add_argument(
         "--repo", help="GitHub repo slug (ORG/NAME). Default: inferred by gh CLI."
     )
@@ -275,8 +458,9 @@ def main():
         help="Maximum number of closed PRs to fetch (default: 200)."
     )
     parser.add_argument(
-        "--threshold", type=float, default=0.0,
-        help="Only show matches at or above this score (0-1, default: 0 = show all)."
+        "--threshold", type=float, default=None,
+        help="Only show matches at or above this score (0-1, default: 0 = show all;"
+             f" {SELF_JOIN_THRESHOLD} with --self-join)."
     )
     parser.add_argument(
         "--reference", type=Path, default=None,
@@ -292,6 +476,24 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.self_join:
+        threshold = SELF_JOIN_THRESHOLD if args.threshold is None else args.threshold
+        records = load_registry(args.root)
+        clusters, scored = self_join(records, threshold, args.window)
+        all_pairs = len(records) * (len(records) - 1) // 2
+        print(
+            f"  {len(records)} grid cells, {scored} of {all_pairs} pairs scored,"
+            f" {len(clusters)} cluster(s) at >= {threshold:.0%}.",
+            file=sys.stderr if args.json else sys.stdout, flush=True,
+        )
+        if args.json:
+            print(json.dumps(clusters, indent=2))
+        else:
+            print_clusters(clusters, records, args.verbose)
+        return
+    if args.threshold is None:
+        args.threshold = 0.0
+
     references = load_reference(args.reference)
     print(f"  {len(references)} reference records loaded.", flush=True)
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+find_orphans.py
+===============
+List src-data entries that nothing references, per type.
+
+Builds the reverse-link index over all folders once (emd_registry) and
+reports every entry with no incoming local link — a subgrid left behind
+after its comp grid was rejected, a grid cell no subgrid uses, a vertical
+grid no component_config points at. `model` entries are top-level and are
+never reported.
+
+An orphan that is only "referenced" by a misspelt link (e.g. a model listing
+`sea_ice_cice5_h109_no-vertical` for the config `sea-ice_cice5_h109_no-vertical`)
+is flagged as such: fix the link, don't delete the entry.
+
+With --cascade, entries referenced only by orphans are reported too (the
+subgrids of an orphaned comp grid, then their grid cells, ...).
+
+With --stage the orphan files are removed with `git rm`, ready to commit.
+Staging requires --folder, so a removal is always scoped to the types you
+asked for; misspelt-link orphans are never staged.
+
+Usage
+-----
+  python .github/scripts/find_orphans.py                          # all types
+  python .github/scripts/find_orphans.py --folder horizontal_subgrid --cascade
+  python .github/scripts/find_orphans.py --folder horizontal_subgrid --stage
+  python .github/scripts/find_orphans.py --json
+
+Exit code: 0 (orphans are reported, not treated as failures).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import deque
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+from emd_registry import FOLDERS, Registry, loose_id  # noqa: E402
+
+# Top-level entries: nothing in the registry is expected to link to them.
+ROOT_FOLDERS = {"model"}
+
+
+# =============================================================================
+# Detection
+# =============================================================================
+
+def find_orphans(reg: Registry, cascade: bool = False) -> dict[str, list[dict]]:
+    """
+    Return {folder: [{'id', 'path', 'depth', 'misspelt_by'}, ...]} for every
+    unreferenced entry outside ROOT_FOLDERS. depth 0 is directly
+    unreferenced; with `cascade`, depth n is only referenced by orphans of
+    depth < n. `misspelt_by` lists referrers whose link misses the entry
+    only by case/separators.
+    """
+    referrers = reg.referrers()
+
+    # Distinct referring entries per target, and what each entry links to.
+    incoming: dict[tuple[str, str], set[tuple[str, str]]] = {}
+    outgoing: dict[tuple[str, str], set[tuple[str, str]]] = {}
+    near: dict[tuple[str, str], list[str]] = {}
+    loose: dict[str, dict[str, str]] = {}
+    for (target, entry_id), sources in referrers.items():
+        refs = {(f, i) for f, i, _field in sources}
+        if entry_id in reg.ids(target):
+            incoming[(target, entry_id)] = refs
+            for ref in refs:
+                outgoing.setdefault(ref, set()).add((target, entry_id))
+            continue
+        # Broken link: does it loosely name an existing entry?
+        if target not in loose:
+            loose[target] = {loose_id(i): i for i in reg.ids(target)}
+        match = loose[target].get(loose_id(entry_id))
+        if match:
+            near.setdefault((target, reg.canonical_id(target, match)), []).extend(
+                f"{f}/{i}" for f, i in sorted(refs))
+
+    depth: dict[tuple[str, str], int] = {}
+    queue: deque[tuple[str, str]] = deque()
+    for folder, entry_id, _path in reg.files():
+        if folder not in ROOT_FOLDERS and not incoming.get((folder, entry_id)):
+            depth[(folder, entry_id)] = 0
+            queue.append((folder, entry_id))
+
+    if cascade:
+        # Drop each orphan's outgoing links; whatever loses its last referrer
+        # becomes an orphan one level deeper.
+        remaining = {node: len(refs) for node, refs in incoming.items()}
+        while queue:
+            node = queue.popleft()
+            if node in near:
+                continue  # still wanted, just linked wrongly
+            for target in outgoing.get(node, ()):
+                remaining[target] -= 1
+                if remaining[target] == 0 and target[0] not in ROOT_FOLDERS and target not in depth:
+                    depth[target] = depth[node] + 1
+                    queue.append(target)
+
+    orphans: dict[str, list[dict]] = {folder: [] for folder in FOLDERS if folder not in ROOT_FOLDERS}
+    for (folder, entry_id), d in sorted(depth.items(), key=lambda item: (item[1], item[0])):
+        orphans[folder].append({
+            "id": entry_id,
+            "path": str(reg.paths[folder][entry_id].relative_to(reg.root)),
+            "depth": d,
+            "misspelt_by": near.get((folder, entry_id), []),
+        })
+    return orphans
+
+
+def stage_removals(root: Path, paths: list[str]) -> None:
+    """`git rm` the given root-relative paths (index and working tree)."""
+    if paths:
+        subprocess.run(["git", "-C", str(root), "rm", "--quiet", "--", *paths], check=True)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def print_report(orphans: dict[str, list[dict]]) -> None:
+    total = sum(len(v) for v in orphans.values())
+    print(f"\033[94m{total} unreferenced entr{'y' if total == 1 else 'ies'}\033[0m")
+    for folder, entries in orphans.items():
+        if not entries:
+            continue
+        print(f"\n{folder} ({len(entries)})")
+        for e in entries:
+            note = f"  (depth {e['depth']})" if e["depth"] else ""
+            if e["misspelt_by"]:
+                note += f"  \033[93m← misspelt link in {', '.join(e['misspelt_by'])}\033[0m"
+            print(f"  {e['path']}{note}")
+
+
+def write_step_summary(orphans: dict[str, list[dict]], path: str) -> None:
+    lines = ["## Unreferenced entries", "", "| Type | Count |", "|---|---:|"]
+    lines += [f"| `{folder}` | {len(entries)} |" for folder, entries in orphans.items()]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--folder", action="append",
+                        choices=[f for f in FOLDERS if f not in ROOT_FOLDERS],
+                        help="Only report this type (repeatable).")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Also report entries referenced only by orphans.")
+    parser.add_argument("--stage", action="store_true",
+                        help="git rm the reported orphans (requires --folder).")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    args = parser.parse_args()
+
+    if args.stage and not args.folder:
+        parser.error("--stage needs at least one --folder")
+
+    root = Path(args.root).expanduser().resolve()
+    orphans = find_orphans(Registry.load(root), cascade=args.cascade)
+    if args.folder:
+        orphans = {folder: orphans[folder] for folder in args.folder}
+
+    if args.json:
+        print(json.dumps(orphans, indent=2))
+    else:
+        print_report(orphans)
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        write_step_summary(orphans, summary)
+
+    if args.stage:
+        paths = [e["path"] for entries in orphans.values() for e in entries if not e["misspelt_by"]]
+        stage_removals(root, paths)
+        print(f"\n\033[92m✓ Staged removal of {len(paths)} file(s) — review with `git status`\033[0m")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
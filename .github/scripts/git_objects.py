@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+git_objects.py
+==============
+Read file versions from a local clone through one long-lived
+`git cat-file --batch` process, instead of one `git show` (or one GitHub
+contents API call) per file.
+
+Usage in code
+-------------
+    from git_objects import GitObjectReader
+    reader = GitObjectReader.open()          # enclosing checkout, or None
+    blob = reader.read('origin/src-data', 'model/canesm5-1.json')
+    reader.close()
+"""
+
+from __future__ import annotations
+
+import subprocess
+
+
+class GitObjectReader:
+    """
+    File versions from a local clone via one `git cat-file --batch` process.
+
+    read(ref, path) returns the blob bytes, or None when the ref or path is
+    not in the clone (the caller then falls back to the API). Branch names
+    are tried as given and as origin/<name>.
+    """
+
+    def __init__(self, clone_dir):
+        self.clone_dir = clone_dir
+        self.local = 0
+        self.api = 0
+        self._proc = subprocess.Popen(
+            ["git", "-C", clone_dir, "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+
+    @classmethod
+    def open(cls, clone_dir=None):
+        """Reader over `clone_dir` (default: the enclosing checkout), or None."""
+        try:
+            top = subprocess.run(
+                ["git", "-C", clone_dir or ".", "rev-parse", "--show-toplevel"],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return cls(top)
+
+    def _object(self, spec):
+        self._proc.stdin.write(spec.encode() + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().decode().split()
+        if len(header) != 3:              # "<spec> missing" / "ambiguous"
+            return None
+        _sha, kind, size = header
+        data = self._proc.stdout.read(int(size))
+        self._proc.stdout.read(1)         # trailing newline
+        return data if kind == "blob" else None
+
+    def read(self, ref, path):
+        for candidate in (ref, f"origin/{ref}"):
+            data = self._object(f"{candidate}:{path}")
+            if data is not None:
+                self.local += 1
+                return data
+        return None
+
+    def merge_base(self, head, base_ref):
+        """Fork point of `head` from `base_ref`, if both are in the clone."""
+        for base in (base_ref, f"origin/{base_ref}"):
+            result = subprocess.run(
+                ["git", "-C", self.clone_dir, "merge-base", head, base],
+                capture_output=True, text=True,
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        return None
+
+    def note_api(self):
+        self.api += 1
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+impact.py
+=========
+Transitive impact analysis for src-data changes.
+
+The `_context` link declarations (`"@type": "@id"`) make the registry a
+dependency graph: a model depends on its component_configs, a config on its
+component and comp grids, a comp grid on its subgrids, a subgrid on its grid
+cell. Given the paths that changed, this walks that graph backwards (via
+emd_registry's reverse-link index) and returns every entry that depends on
+them, directly or transitively:
+
+  horizontal_grid_cell/g100.json
+    -> horizontal_subgrid/g100-mass.json                 (depth 1)
+    -> horizontal_computational_grid/h100.json           (depth 2)
+    -> component_config/atmosphere_..._h100_v100.json    (depth 3)
+    -> model/....json                                    (depth 4)
+
+A changed `_context` marks its whole folder as changed. Deleted files are
+still traced: anything that linked to them is reported.
+
+CI uses the affected set to re-validate only what a push can have broken
+instead of the whole tree.
+
+Usage
+-----
+  python .github/scripts/impact.py horizontal_grid_cell/g100.json
+  python .github/scripts/impact.py --since origin/src-data          # git diff
+  python .github/scripts/impact.py --since HEAD~1 --format paths    # for xargs
+  python .github/scripts/impact.py --since HEAD~1 --format folders
+  python .github/scripts/impact.py --since HEAD~1 --format json
+
+Exit code: 0 (also when nothing is affected), 2 on a bad --since ref.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import deque
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+from emd_registry import FOLDERS, Registry, normalise_id  # noqa: E402
+
+Node = tuple[str, str]  # (folder, canonical id)
+
+
+# =============================================================================
+# Graph walk
+# =============================================================================
+
+def changed_since(ref: str, root: Path) -> list[str]:
+    """Registry paths changed between `ref` and the working tree (incl. deletions)."""
+    result = subprocess.run(
+        ["git", "-C", str(root), "diff", "--name-only", "--no-renames", ref, "--", *FOLDERS],
+        capture_output=True, text=True, check=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def seed_nodes(reg: Registry, paths) -> set[Node]:
+    """Map changed paths (relative to the root, or absolute) to graph nodes."""
+    seeds: set[Node] = set()
+    for raw in paths:
+        path = Path(raw)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(reg.root)
+            except ValueError:
+                continue
+        if len(path.parts) != 2 or path.parts[0] not in FOLDERS:
+            continue
+        folder, name = path.parts
+        if name in ("_context", "_context.json"):
+            seeds.update((folder, entry_id) for entry_id in _folder_ids(reg, folder))
+        elif name.endswith(".json") and not name.startswith("_"):
+            seeds.add((folder, reg.canonical_id(folder, normalise_id(name[:-len(".json")]))))
+    return seeds
+
+
+def _folder_ids(reg: Registry, folder: str) -> list[str]:
+    return [entry_id for f, entry_id, _ in reg.files() if f == folder]
+
+
+def dependents(reg: Registry, seeds: set[Node]) -> dict[Node, int]:
+    """
+    Breadth-first walk up the reverse-link index from `seeds`. Returns
+    {node: depth} for every dependent (depth >= 1); seeds themselves are
+    not included unless they also depend on another seed.
+    """
+    referrers = reg.referrers()
+    depth: dict[Node, int] = {}
+    queue = deque((node, 0) for node in seeds)
+    visited = set(seeds)
+    while queue:
+        node, d = queue.popleft()
+        for folder, entry_id, _field in referrers.get(node, ()):
+            parent = (folder, entry_id)
+            if parent in visited:
+                continue
+            visited.add(parent)
+            depth[parent] = d + 1
+            queue.append((parent, d + 1))
+    return depth
+
+
+def impact(reg: Registry, paths) -> dict:
+    """
+    Full impact of `paths`: {'changed': [...], 'dependents': [...],
+    'paths': [...], 'folders': [...]}. `paths` lists every existing file to
+    re-validate (changed + dependents), `folders` the folders they live in.
+    """
+    seeds = seed_nodes(reg, paths)
+    deps = dependents(reg, seeds)
+
+    def rel(node: Node) -> str | None:
+        path = reg.paths.get(node[0], {}).get(node[1])
+        return str(path.relative_to(reg.root)) if path else None
+
+    changed = [{"folder": f, "id": i, "path": rel((f, i)), "deleted": rel((f, i)) is None}
+               for f, i in sorted(seeds)]
+    dependent = [{"folder": f, "id": i, "path": rel((f, i)), "depth": d}
+                 for (f, i), d in sorted(deps.items(), key=lambda item: (item[1], item[0]))]
+    files = sorted({e["path"] for e in changed + dependent if e["path"]})
+    return {
+        "changed": changed,
+        "dependents": dependent,
+        "paths": files,
+        "folders": sorted({e["folder"] for e in changed + dependent}),
+    }
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def print_report(result: dict) -> None:
+    print(f"\033[94m{len(result['changed'])} changed, "
+          f"{len(result['dependents'])} dependent entr{'y' if len(result['dependents']) == 1 else 'ies'}\033[0m")
+    for e in result["changed"]:
+        note = "  \033[93m(deleted)\033[0m" if e["deleted"] else ""
+        print(f"  * {e['path'] or e['folder'] + '/' + e['id'] + '.json'}{note}")
+    for e in result["dependents"]:
+        print(f"  {'  ' * e['depth']}<- {e['path']}  (depth {e['depth']})")
+
+
+def write_step_summary(result: dict, path: str) -> None:
+    lines = ["## Change impact", "",
+             f"{len(result['changed'])} changed entr{'y' if len(result['changed']) == 1 else 'ies'}, "
+             f"{len(result['dependents'])} dependent; folders: "
+             + (", ".join(f"`{f}`" for f in result["folders"]) or "none"), ""]
+    if result["dependents"]:
+        lines += ["| Dependent | Depth |", "|---|---:|"]
+        lines += [f"| `{e['path']}` | {e['depth']} |" for e in result["dependents"]]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("paths", nargs="*", help="Changed paths, relative to --root.")
+    parser.add_argument("--since", metavar="REF",
+                        help="Also take every registry path changed since this git ref.")
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--format", choices=("report", "paths", "folders", "json"),
+                        default="report", help="Output format (default: report).")
+    args = parser.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    paths = list(args.paths)
+    if args.since:
+        try:
+            paths += changed_since(args.since, root)
+        except subprocess.CalledProcessError as e:
+            print(f"\033[91m✗ git diff {args.since} failed: {e.stderr.strip()}\033[0m", file=sys.stderr)
+            return 2
+
+    result = impact(Registry.load(root), paths)
+
+    if args.format == "paths":
+        print("\n".join(result["paths"]))
+    elif args.format == "folders":
+        print("\n".join(result["folders"]))
+    elif args.format == "json":
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        write_step_summary(result, summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
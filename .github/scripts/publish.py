@@ -0,0 +1,858 @@
+#!/usr/bin/env python3
+"""
+publish.py
+==========
+Incremental publisher for the production branch: derives the served files
+from the vocab files, touching only what changed since the last publish.
+
+Runs from .github/prepublish/01-publish.sh in the sync_data job, after the
+src-data files have been copied onto the production checkout and the
+`_graph.json` files are built (build_graphs.py, or graphify when it falls
+back), and before the commit. At that point
+HEAD is the previous production commit, so `git status` against it is the
+set of sources that changed in this deploy (Changes).
+
+Steps
+-----
+  shards  Graph shards for partial fetches: each folder's entries grouped by
+          selected fields (SHARD_KEYS), written as
+          `<folder>/_shards/<key>/<value>.json` graph documents of at most
+          MAX_SHARD_RECORDS entries (larger groups are paged
+          `<value>~2.json`, ...; values whose names clash get a short hash
+          suffix), plus the `_shards.json` index mapping folder -> key -> value
+          -> files. A key may follow one link (`model_component.component`
+          shards configs by realm). Only folders whose entries, or the
+          folders their keys link into, changed are rebuilt; the shard files
+          are fed into the changed set so the later steps twin, compress and
+          hash them like any other source.
+
+  resolve Context-free variants for clients that cannot (or should not)
+          process JSON-LD contexts: every entry and `_graph.json` of a
+          vocab folder is written to `<folder>/_resolved/<name>.json` with
+          `@id` and every link value (`"@type": "@id"` terms) made absolute
+          against the `@base` of the context that applies to it, and the
+          remote `@context` replaced by an inline one (`@base`, `@vocab`
+          and the link terms) that references nothing. Expanding a resolved
+          file gives the same triples as the original without a single
+          context fetch. Contexts are loaded once per run (ContextLoader):
+          EMD contexts from the tree, others over HTTP, falling back to the
+          `<url minus _context>` base convention when offline. A folder is
+          redone in full when its `_context` changes.
+
+  search  `_search.json`: the full-text inverted index of search_index.py
+          (tokenised id / name / ui_label / description, sorted terms for
+          prefix lookups, docs grouped by folder for type filters), so the
+          viewer and the docs search answer queries from one small file
+          instead of every `_graph.json`. Rebuilt when any entry changed.
+
+  twins   Extensionless twins for content negotiation:
+            x/y/file.json -> x/y/file
+            x/_graph.json -> x/graph
+            x/_context    -> x/_context.json
+          Twins of added or modified sources are hardlinked to the source
+          (copied where links are not possible); twins of deleted sources
+          are removed; twins that are missing from the working tree but
+          unchanged since HEAD (e.g. after a clean checkout) are restored
+          from HEAD in one batched git call instead of being rewritten.
+
+  compress
+          gzip (`.gz`) and brotli (`.br`) siblings of every source, for
+          clients that fetch the compressed file directly. Output is
+          deterministic (no timestamps), so an unchanged source never
+          changes its siblings. `.br` needs the optional `brotli` module;
+          without it `.br` siblings of changed sources are dropped rather
+          than left stale.
+
+  manifest
+          `_manifest.json` (+ `.gz`): for every source its sha256, size,
+          twin and compressed sizes. Clients compare hashes against their
+          cached copy and fetch only the entries that changed. Entries of
+          unchanged sources are carried over from the previous manifest.
+
+Every step only handles the changed set: outputs of changed sources are
+rebuilt, outputs of deleted sources removed, and outputs that are missing
+from the tree but belong to unchanged sources are restored from HEAD. A step
+whose outputs do not exist in HEAD yet (the first deploy with it) runs over
+every source; `--full` forces that for all steps.
+
+Usage
+-----
+  python .github/scripts/publish.py                    # all steps, since HEAD
+  python .github/scripts/publish.py twins --since HEAD~1
+  python .github/scripts/publish.py --root "$GITHUB_WORKSPACE" --dry-run
+  python .github/scripts/publish.py --full                     # rebuild everything
+  python .github/scripts/publish.py resolve --full --offline   # no HTTP fetches
+
+Exit code: 0, or 2 if the base ref is not a commit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urljoin
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+import search_index  # noqa: E402
+
+# Directories, at any depth, that are never published from (docs site,
+# reports) — the `*/docs/*` and `*/summaries/*` of the old copy scripts.
+EXCLUDED_DIRS = ("docs", "summaries")
+
+MANIFEST = "_manifest.json"
+MANIFEST_VERSION = 1
+
+SEARCH_INDEX = "_search.json"
+
+SHARD_INDEX = "_shards.json"
+SHARD_INDEX_VERSION = 3
+SHARD_DIR = "_shards"
+MAX_SHARD_RECORDS = 200
+
+# folder -> shard keys: a field, or `<link field>.<field>` read from the
+# linked entry (the link field names the target folder).
+SHARD_KEYS: dict[str, tuple[str, ...]] = {
+    "horizontal_grid_cell":          ("grid_type", "region", "units"),
+    "horizontal_computational_grid": ("arrangement",),
+    "vertical_computational_grid":   ("vertical_coordinate",),
+    "model_component":               ("component", "family"),
+    "component_config":              ("model_component.component",
+                                      "horizontal_computational_grid",
+                                      "vertical_computational_grid"),
+    "model":                         ("family", "dynamic_components"),
+    "model_family":                  ("family_type",),
+}
+
+_PLACEHOLDERS = {"", "none", "not specified", "_no response_"}
+
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+RESOLVED_DIR = "_resolved"
+
+# Remote contexts served from this tree: `<EMD_BASE><folder>/_context`.
+EMD_BASE = "https://emd.mipcvs.dev/"
+CONTEXT_FETCH_TIMEOUT = 10
+
+
+# =============================================================================
+# Changed set
+# =============================================================================
+
+def _git(root: Path, *args: str, **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", "-C", str(root), *args], capture_output=True, **kwargs)
+
+
+def is_source(rel: str) -> bool:
+    """True for a file the publisher derives outputs from."""
+    parts = rel.split("/")
+    if any(p in EXCLUDED_DIRS for p in parts[:-1]) or any(p.startswith(".") for p in parts):
+        return False
+    name = parts[-1]
+    if name == "_context":
+        return True
+    return name.endswith(".json") and name != "_context.json" and rel != MANIFEST
+
+
+def all_sources(root: Path) -> set[str]:
+    """Every source file under `root` (for full rebuilds)."""
+    found = set()
+    for directory, dirs, files in os.walk(root):
+        rel_dir = Path(directory).relative_to(root).as_posix()
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in EXCLUDED_DIRS]
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+        found.update(rel for rel in (prefix + f for f in files) if is_source(rel))
+    return found
+
+
+@dataclass
+class Changes:
+    """Paths (relative, '/'-separated) that differ between `base` and the working tree."""
+    base: str
+    changed: set[str] = field(default_factory=set)   # added or modified, present on disk
+    deleted: set[str] = field(default_factory=set)   # tracked in base, gone from disk
+
+    @classmethod
+    def since(cls, root: Path, base: str) -> "Changes":
+        result = _git(root, "status", "--porcelain=v1", "-z", "--untracked-files=all",
+                      "--no-renames", "--ignored=no")
+        result.check_returncode()
+        changes = cls(base)
+        # --porcelain always compares against HEAD; for another base, diff it too.
+        entries = [e[3:] for e in result.stdout.decode("utf-8").split("\0") if e]
+        if base != "HEAD":
+            diff = _git(root, "diff", "--name-only", "--no-renames", "-z", base)
+            diff.check_returncode()
+            entries += [e for e in diff.stdout.decode("utf-8").split("\0") if e]
+        for rel in entries:
+            (changes.changed if (root / rel).exists() else changes.deleted).add(rel)
+        return changes
+
+    def sources(self) -> tuple[set[str], set[str]]:
+        return ({p for p in self.changed if is_source(p)},
+                {p for p in self.deleted if is_source(p)})
+
+
+# =============================================================================
+# Steps
+# =============================================================================
+
+@dataclass
+class Context:
+    root: Path
+    changes: Changes
+    dry_run: bool = False
+    full: bool = False
+    offline: bool = False
+    stats: dict[str, dict[str, int]] = field(default_factory=dict)
+    _base_paths: set[str] | None = field(default=None, repr=False)
+
+    def count(self, step: str, what: str, n: int = 1) -> None:
+        self.stats.setdefault(step, {}).setdefault(what, 0)
+        self.stats[step][what] += n
+
+    def sources(self, full: bool = False) -> tuple[set[str], set[str]]:
+        """(changed, deleted) sources; every source counts as changed when full."""
+        changed, deleted = self.changes.sources()
+        if full or self.full:
+            changed = all_sources(self.root)
+        return changed, deleted
+
+    def in_base(self, rel: str) -> bool:
+        return _git(self.root, "cat-file", "-e", f"{self.changes.base}:{rel}").returncode == 0
+
+    def base_paths(self) -> set[str]:
+        """Every file tracked in the base commit (one git call, cached)."""
+        if self._base_paths is None:
+            out = _git(self.root, "ls-tree", "-r", "-z", "--name-only", self.changes.base).stdout
+            self._base_paths = {p.decode("utf-8") for p in out.split(b"\0") if p}
+        return self._base_paths
+
+    def read_base(self, rel: str) -> bytes | None:
+        result = _git(self.root, "cat-file", "blob", f"{self.changes.base}:{rel}")
+        return result.stdout if result.returncode == 0 else None
+
+    def read_previous(self, rel: str) -> dict | None:
+        """A JSON output of the last publish: the tree's copy, else HEAD's."""
+        path = self.root / rel
+        raw = path.read_bytes() if path.is_file() else self.read_base(rel)
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    def wrote(self, rel: str) -> None:
+        """Record a source written by a step, for the steps after it."""
+        self.changes.changed.add(rel)
+        self.changes.deleted.discard(rel)
+
+    def dropped(self, rel: str) -> None:
+        self.changes.deleted.add(rel)
+        self.changes.changed.discard(rel)
+
+
+def restore_from_base(ctx: Context, paths: list[str]) -> int:
+    """Check `paths` (tracked in the base commit) out of it in one git call."""
+    if paths and not ctx.dry_run:
+        _git(ctx.root, "checkout", ctx.changes.base, "--pathspec-from-file=-",
+             "--pathspec-file-nul", input="\0".join(sorted(paths)).encode(), check=True)
+    return len(paths)
+
+
+def _remove(path: Path) -> bool:
+    if path.exists() or path.is_symlink():
+        path.unlink()
+        return True
+    return False
+
+
+def sync_outputs(ctx: Context, step: str, outputs, source_of, build, full: bool = False) -> None:
+    """
+    Bring one step's derived files up to date with the changed set.
+
+    outputs(source)  -> paths derived from a source
+    source_of(path)  -> the source a derived path belongs to, or None
+    build(source)    -> (re)write the outputs of a changed source
+    """
+    changed, deleted = ctx.sources(full)
+    for rel in sorted(changed):
+        if not ctx.dry_run:
+            build(rel)
+        ctx.count(step, "written")
+    for rel in sorted(deleted):
+        if not ctx.dry_run:
+            for out in outputs(rel):
+                _remove(ctx.root / out)
+        ctx.count(step, "removed")
+
+    # Outputs missing from the tree whose source did not change: bring back
+    # the previous commit's copy rather than recreating it.
+    handled = {out for rel in changed | deleted for out in outputs(rel)}
+    missing = []
+    for path in ctx.changes.deleted:
+        if path in handled or is_source(path):
+            continue
+        source = source_of(path)
+        if source and (ctx.root / source).is_file():
+            missing.append(path)
+    ctx.count(step, "restored", restore_from_base(ctx, missing))
+
+
+# -- shards -------------------------------------------------------------------
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9._-]+", "-", value.lower()).strip("-.") or "_"
+
+
+def _shard_names(values) -> dict[str, str]:
+    """{value: file name} for one key's values, unique even where slugs clash.
+
+    A value that is its own slug keeps it; the others sharing that slug
+    (`lat lon` next to `lat-lon`) get a short hash of the value appended, so
+    adding a clashing value never renames an existing shard.
+    """
+    by_slug: dict[str, list[str]] = {}
+    for value in values:
+        by_slug.setdefault(_slug(value), []).append(value)
+    names = {}
+    for slug, clashing in by_slug.items():
+        for value in clashing:
+            if len(clashing) == 1 or value == slug:
+                names[value] = slug
+            else:
+                names[value] = f"{slug}-{hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]}"
+    return names
+
+
+def _values(value) -> list[str]:
+    """Shard values of a field: one per list item, links reduced to their id."""
+    items = value if isinstance(value, list) else [value]
+    out = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("@id")
+        if isinstance(item, (str, int, float)) and not isinstance(item, bool):
+            text = str(item).strip()
+            if text.lower() not in _PLACEHOLDERS:
+                out.append(text.rsplit("/", 1)[-1].removesuffix(".json").lower()
+                           if text.startswith(("http://", "https://")) else text.lower())
+    return out
+
+
+def _load_folder(root: Path, folder: str) -> dict[str, dict]:
+    """{file stem: record} for the entry files of a folder."""
+    records = {}
+    directory = root / folder
+    if not directory.is_dir():
+        return records
+    for path in sorted(directory.glob("*.json")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(record, dict):
+            records[path.stem] = record
+    return records
+
+
+def _linked_folders(folder: str) -> set[str]:
+    return {key.split(".", 1)[0] for key in SHARD_KEYS.get(folder, ()) if "." in key}
+
+
+def build_shards(root: Path, folder: str) -> tuple[dict[str, bytes], dict]:
+    """({path: document bytes}, {key: {value: {'files', 'count'}}}) for one folder."""
+    records = _load_folder(root, folder)
+    linked = {f: {stem.lower(): r for stem, r in _load_folder(root, f).items()}
+              for f in _linked_folders(folder)}
+    files: dict[str, bytes] = {}
+    index: dict[str, dict] = {}
+    for key in SHARD_KEYS.get(folder, ()):
+        link, _, field_name = key.rpartition(".")
+        groups: dict[str, list[dict]] = {}
+        for stem, record in records.items():
+            if link:
+                targets = [linked[link].get(i) for i in _values(record.get(link))]
+                values = [v for t in targets if t for v in _values(t.get(field_name))]
+            else:
+                values = _values(record.get(field_name))
+            entry = {k: v for k, v in record.items() if k != "@context"}
+            for value in dict.fromkeys(values):
+                groups.setdefault(value, []).append(entry)
+        index[key] = {}
+        names = _shard_names(groups)
+        for value, entries in sorted(groups.items()):
+            paths = []
+            for page, start in enumerate(range(0, len(entries), MAX_SHARD_RECORDS), 1):
+                # Later pages sit next to the first (a directory would take
+                # the path of its extensionless twin); "~" is never in a
+                # slug, so they cannot meet another value's file.
+                name = names[value] + (f"~{page}" if page > 1 else "")
+                rel = f"{folder}/{SHARD_DIR}/{key}/{name}.json"
+                doc = {"@context": "../../_context",
+                       "@graph": entries[start:start + MAX_SHARD_RECORDS]}
+                files[rel] = (json.dumps(doc, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+                paths.append(rel)
+            index[key][value] = {"files": paths, "count": len(entries)}
+    return files, index
+
+
+def _entry_folder(rel: str) -> str | None:
+    """Folder of an entry file (`<folder>/<id>.json`), else None."""
+    folder, _, name = rel.partition("/")
+    if folder in SHARD_KEYS and "/" not in name and name.endswith(".json") \
+            and not name.startswith("_"):
+        return folder
+    return None
+
+
+def step_shards(ctx: Context) -> None:
+    previous = ctx.read_previous(SHARD_INDEX) or {"folders": {}}
+    # Files the last index listed are cleaned up even when its layout is
+    # stale and every folder is rebuilt.
+    old_files = {folder: {p for key in keys.values() for v in key.values() for p in v["files"]}
+                 for folder, keys in previous.get("folders", {}).items()}
+    if ctx.full or previous.get("version") != SHARD_INDEX_VERSION:
+        previous = {"folders": {}}
+        touched = set(SHARD_KEYS)
+    else:
+        touched = {f for rel in ctx.changes.changed | ctx.changes.deleted
+                   if (f := _entry_folder(rel))}
+        touched |= {f for f in SHARD_KEYS if _linked_folders(f) & touched}
+    folders = {}
+    for folder in SHARD_KEYS:
+        if folder not in touched:
+            folders[folder] = previous["folders"].get(folder, {})
+            missing = [p for p in sorted(old_files.get(folder, ()))
+                       if not (ctx.root / p).is_file()]
+            ctx.count("shards", "restored", restore_from_base(ctx, missing))
+            for p in missing:
+                ctx.changes.deleted.discard(p)
+            continue
+
+        files, folders[folder] = build_shards(ctx.root, folder)
+        ctx.count("shards", "folders")
+        for rel, data in files.items():
+            path = ctx.root / rel
+            if path.is_file() and path.read_bytes() == data:
+                ctx.changes.deleted.discard(rel)
+                continue
+            if not ctx.dry_run:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+            ctx.wrote(rel)
+            ctx.count("shards", "written")
+        for rel in sorted(old_files.get(folder, set()) - set(files)):
+            if not ctx.dry_run:
+                _remove(ctx.root / rel)
+                # Pages of an older layout lived in a `<value>/` directory,
+                # which would stand where the twins step writes `<value>`.
+                if rel.count("/") > 3:
+                    try:
+                        (ctx.root / rel).parent.rmdir()
+                    except OSError:
+                        pass
+            ctx.dropped(rel)
+            ctx.count("shards", "removed")
+
+    if not ctx.dry_run:
+        text = json.dumps({"version": SHARD_INDEX_VERSION, "max_records": MAX_SHARD_RECORDS,
+                           "folders": folders}, indent=1, sort_keys=True) + "\n"
+        (ctx.root / SHARD_INDEX).write_text(text, encoding="utf-8")
+    ctx.wrote(SHARD_INDEX)
+
+
+# -- resolve ------------------------------------------------------------------
+
+class ContextLoader:
+    """
+    Memoised `@context` loader. Returns the inner context object of a
+    context document, loading each one once per run: `_context` files of
+    this tree are read from disk, any other URL is fetched (unless offline).
+    """
+
+    def __init__(self, root: Path, offline: bool = False):
+        self.root = root
+        self.offline = offline
+        self.fetched = 0
+        self.failed: list[str] = []
+        self._cache: dict[str, dict] = {}
+
+    def _local(self, ref: str) -> Path | None:
+        if ref.startswith(EMD_BASE) and ref.endswith("/_context"):
+            folder = ref[len(EMD_BASE):-len("/_context")]
+            if "/" not in folder:
+                return self.root / folder / "_context"
+        return None
+
+    def load(self, ref: str) -> dict:
+        if ref in self._cache:
+            return self._cache[ref]
+        local = self._local(ref)
+        doc = None
+        try:
+            if local is not None:
+                doc = json.loads(local.read_text(encoding="utf-8"))
+            elif not self.offline:
+                with urllib.request.urlopen(ref, timeout=CONTEXT_FETCH_TIMEOUT) as response:
+                    doc = json.loads(response.read())
+                self.fetched += 1
+        except (OSError, ValueError):
+            self.failed.append(ref)
+        context = doc.get("@context") if isinstance(doc, dict) else None
+        self._cache[ref] = context if isinstance(context, dict) else {}
+        return self._cache[ref]
+
+    def base_of(self, ref: str) -> str:
+        """`@base` of a context, else the directory the context is served from."""
+        return self.load(ref).get("@base") or ref.rsplit("/", 1)[0] + "/"
+
+
+def _absolute(value, base: str):
+    """Link value(s) as absolute IRIs; placeholders and non-strings untouched."""
+    if isinstance(value, list):
+        return [_absolute(v, base) for v in value]
+    if isinstance(value, dict):
+        return {**value, "@id": _absolute(value["@id"], base)} if "@id" in value else value
+    if isinstance(value, str) and value.strip().lower() not in _PLACEHOLDERS:
+        return urljoin(base, value.strip())
+    return value
+
+
+def _link_terms(context: dict) -> dict[str, dict]:
+    return {k: v for k, v in context.items()
+            if not k.startswith("@") and isinstance(v, dict) and v.get("@type") == "@id"}
+
+
+def inline_context(context: dict) -> dict:
+    """The part of a folder context a resolved document still needs."""
+    inline = {k: context[k] for k in ("@base", "@vocab") if k in context}
+    inline.update({term: {"@type": "@id"} for term in _link_terms(context)})
+    return inline
+
+
+def resolve_record(record: dict, context: dict, loader: ContextLoader) -> dict:
+    """`record` with absolute `@id` and link values, and no `@context`."""
+    base = context.get("@base", "")
+    terms = _link_terms(context)
+    out = {}
+    for key, value in record.items():
+        if key == "@context":
+            continue
+        if key == "@id":
+            out[key] = _absolute(value, base)
+        elif key in terms:
+            scoped = terms[key].get("@context")
+            out[key] = _absolute(value, loader.base_of(scoped) if isinstance(scoped, str) else base)
+        else:
+            out[key] = value
+    return out
+
+
+def resolve_document(doc, context: dict, loader: ContextLoader):
+    """Resolved form of an entry or a `@graph` document, or None if neither."""
+    if not isinstance(doc, dict):
+        return None
+    if isinstance(doc.get("@graph"), list):
+        rest = {k: v for k, v in doc.items() if k not in ("@context", "@graph")}
+        graph = [resolve_record(r, context, loader) if isinstance(r, dict) else r
+                 for r in doc["@graph"]]
+        return {"@context": inline_context(context), **rest, "@graph": graph}
+    return {"@context": inline_context(context), **resolve_record(doc, context, loader)}
+
+
+def vocab_folders(root: Path) -> set[str]:
+    """Top-level folders with a `_context`."""
+    return {p.parent.name for p in root.glob("*/_context")
+            if p.parent.name not in EXCLUDED_DIRS and not p.parent.name.startswith(".")}
+
+
+def resolved_of(rel: str, folders: set[str]) -> str | None:
+    """Resolved path of an entry or `_graph.json` in a vocab folder, else None."""
+    folder, _, name = rel.partition("/")
+    if folder in folders and "/" not in name and name.endswith(".json") \
+            and (name == "_graph.json" or not name.startswith("_")):
+        return f"{folder}/{RESOLVED_DIR}/{name}"
+    return None
+
+
+def source_of_resolved(path: str) -> str | None:
+    folder, _, rest = path.partition("/")
+    directory, _, name = rest.partition("/")
+    if directory == RESOLVED_DIR and "/" not in name and name.endswith(".json"):
+        return f"{folder}/{name}"
+    return None
+
+
+def step_resolve(ctx: Context) -> None:
+    loader = ContextLoader(ctx.root, ctx.offline)
+    folders = vocab_folders(ctx.root)
+    changed, deleted = ctx.sources()
+    redo = {f for f in folders
+            if ctx.full or f"{f}/_context" in changed or not ctx.in_base(f"{f}/{RESOLVED_DIR}")}
+    todo = {rel for rel in changed if resolved_of(rel, folders)}
+    todo |= {p.relative_to(ctx.root).as_posix() for f in redo
+             for p in (ctx.root / f).glob("*.json") if resolved_of(f"{f}/{p.name}", folders)}
+
+    for rel in sorted(todo):
+        out = resolved_of(rel, folders)
+        context = loader.load(f"{EMD_BASE}{rel.split('/', 1)[0]}/_context")
+        try:
+            doc = resolve_document(json.loads((ctx.root / rel).read_bytes()), context, loader)
+        except ValueError:
+            doc = None
+        if doc is None:
+            ctx.count("resolve", "skipped")
+            continue
+        data = (json.dumps(doc, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+        path = ctx.root / out
+        if path.is_file() and path.read_bytes() == data:
+            ctx.changes.deleted.discard(out)
+            continue
+        if not ctx.dry_run:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        ctx.wrote(out)
+        ctx.count("resolve", "written")
+
+    # Outputs whose source is gone: deleted sources, and strays in redone folders.
+    stale = {out for rel in deleted if (out := resolved_of(rel, folders))}
+    stale |= {p.relative_to(ctx.root).as_posix() for f in redo
+              for p in (ctx.root / f / RESOLVED_DIR).glob("*.json")
+              if not (ctx.root / f / p.name).is_file()}
+    for out in sorted(stale):
+        if not ctx.dry_run:
+            _remove(ctx.root / out)
+        ctx.dropped(out)
+        ctx.count("resolve", "removed")
+
+    missing = [p for p in sorted(ctx.changes.deleted)
+               if (source := source_of_resolved(p)) and source not in todo
+               and (ctx.root / source).is_file()]
+    ctx.count("resolve", "restored", restore_from_base(ctx, missing))
+    for p in missing:
+        ctx.changes.deleted.discard(p)
+
+    ctx.count("resolve", "contexts fetched", loader.fetched)
+    for ref in loader.failed:
+        print(f"  \033[93m⚠ could not load {ref}: using its URL as @base\033[0m")
+
+
+# -- search -------------------------------------------------------------------
+
+def step_search(ctx: Context) -> None:
+    folders = vocab_folders(ctx.root)
+    touched = any((out := resolved_of(rel, folders)) and not out.endswith("/_graph.json")
+                  for rel in ctx.changes.changed | ctx.changes.deleted)
+    if not (touched or ctx.full or not ctx.in_base(SEARCH_INDEX)):
+        if not (ctx.root / SEARCH_INDEX).is_file():
+            ctx.count("search", "restored", restore_from_base(ctx, [SEARCH_INDEX]))
+            ctx.changes.deleted.discard(SEARCH_INDEX)
+        return
+
+    records = [(folder, r["@id"] if isinstance(r.get("@id"), str) else stem, r)
+               for folder in sorted(folders) for stem, r in _load_folder(ctx.root, folder).items()]
+    index = search_index.build(records)
+    data = search_index.dumps(index).encode("utf-8")
+    ctx.count("search", "entries", len(index["docs"]))
+    ctx.count("search", "terms", len(index["terms"]))
+    path = ctx.root / SEARCH_INDEX
+    if path.is_file() and path.read_bytes() == data:
+        ctx.changes.deleted.discard(SEARCH_INDEX)
+        return
+    if not ctx.dry_run:
+        path.write_bytes(data)
+    ctx.wrote(SEARCH_INDEX)
+
+
+# -- twins --------------------------------------------------------------------
+
+def twin_of(rel: str) -> str:
+    """Served twin path of a source path."""
+    directory, _, name = rel.rpartition("/")
+    prefix = f"{directory}/" if directory else ""
+    if name == "_context":
+        return f"{prefix}_context.json"
+    if name == "_graph.json":
+        return f"{prefix}graph"
+    return f"{prefix}{name[:-len('.json')]}"
+
+
+def source_of_twin(twin: str) -> str | None:
+    directory, _, name = twin.rpartition("/")
+    prefix = f"{directory}/" if directory else ""
+    if name == "_context.json":
+        source = f"{prefix}_context"
+    elif name == "graph":
+        source = f"{prefix}_graph.json"
+    else:
+        source = f"{prefix}{name}.json"
+    return source if is_source(source) else None
+
+
+def step_twins(ctx: Context) -> None:
+    def build(rel: str) -> None:
+        src, dest = ctx.root / rel, ctx.root / twin_of(rel)
+        _remove(dest)
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+
+    # Twins missing from both HEAD and the tree (the first deploy with this
+    # step, or a source that was never published) mean a run over everything.
+    base = ctx.base_paths()
+    full = any(twin_of(rel) not in base and not (ctx.root / twin_of(rel)).exists()
+               for rel in all_sources(ctx.root))
+    sync_outputs(ctx, "twins", lambda rel: [twin_of(rel)], source_of_twin, build, full=full)
+
+
+# -- compress -----------------------------------------------------------------
+
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """Deterministic gzip (mtime 0), so unchanged input gives identical output."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def source_of_sibling(path: str) -> str | None:
+    if not path.endswith(COMPRESSED_SUFFIXES):
+        return None
+    source = path[:-3]
+    return source if is_source(source) else None
+
+
+def step_compress(ctx: Context) -> None:
+    brotli = _brotli()
+    if brotli is None:
+        print("  \033[93m⚠ brotli is not installed: .br siblings skipped\033[0m")
+
+    def build(rel: str) -> None:
+        data = (ctx.root / rel).read_bytes()
+        (ctx.root / f"{rel}.gz").write_bytes(gzip_bytes(data))
+        if brotli is not None:
+            (ctx.root / f"{rel}.br").write_bytes(brotli.compress(data, quality=11))
+        else:
+            _remove(ctx.root / f"{rel}.br")
+
+    sync_outputs(ctx, "compress", lambda rel: [f"{rel}{s}" for s in COMPRESSED_SUFFIXES],
+                 source_of_sibling, build, full=not ctx.in_base(MANIFEST))
+
+
+# -- manifest -----------------------------------------------------------------
+
+def manifest_entry(root: Path, rel: str) -> dict:
+    data = (root / rel).read_bytes()
+    entry = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "twin": twin_of(rel)}
+    for suffix, key in ((".gz", "gzip"), (".br", "br")):
+        sibling = root / f"{rel}{suffix}"
+        if sibling.is_file():
+            entry[key] = sibling.stat().st_size
+    return entry
+
+
+def step_manifest(ctx: Context) -> None:
+    full = ctx.full or not ctx.in_base(MANIFEST)
+    files: dict[str, dict] = {}
+    if not full:
+        previous = ctx.read_previous(MANIFEST) or {}
+        if previous.get("version") == MANIFEST_VERSION:
+            files = previous.get("files", {})
+        else:
+            full = True
+
+    changed, deleted = ctx.sources(full)
+    for rel in deleted:
+        if files.pop(rel, None) is not None:
+            ctx.count("manifest", "removed")
+    for rel in changed:
+        files[rel] = manifest_entry(ctx.root, rel)
+        ctx.count("manifest", "hashed")
+    ctx.count("manifest", "entries", len(files))
+
+    if ctx.dry_run:
+        return
+    text = json.dumps({"version": MANIFEST_VERSION, "files": dict(sorted(files.items()))},
+                      indent=1, sort_keys=True) + "\n"
+    (ctx.root / MANIFEST).write_text(text, encoding="utf-8")
+    (ctx.root / f"{MANIFEST}.gz").write_bytes(gzip_bytes(text.encode("utf-8")))
+
+
+STEPS = {
+    "shards":   step_shards,
+    "resolve":  step_resolve,
+    "search":   step_search,
+    "twins":    step_twins,
+    "compress": step_compress,
+    "manifest": step_manifest,
+}
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("steps", nargs="*", metavar="STEP",
+                        help=f"Steps to run, in order: {', '.join(STEPS)} (default: all).")
+    parser.add_argument("--root", default=".", help="Production checkout (default: cwd).")
+    parser.add_argument("--since", default="HEAD", metavar="REF",
+                        help="Last published commit (default: HEAD).")
+    parser.add_argument("--full", action="store_true",
+                        help="Treat every source as changed (full rebuild).")
+    parser.add_argument("--offline", action="store_true",
+                        help="Do not fetch remote contexts (resolve uses their URLs as @base).")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing.")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.steps if name not in STEPS]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
+
+    root = Path(args.root).expanduser().resolve()
+    if _git(root, "rev-parse", "--verify", "--quiet", f"{args.since}^{{commit}}").returncode != 0:
+        print(f"\033[91m✗ {args.since} is not a commit\033[0m", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    ctx = Context(root, Changes.since(root, args.since), args.dry_run, args.full,
+                  args.offline)
+    changed, deleted = ctx.changes.sources()
+    print(f"\033[94m{len(changed)} changed, {len(deleted)} deleted source file(s) "
+          f"since {args.since}\033[0m")
+    for name in args.steps or STEPS:
+        step_started = time.perf_counter()
+        STEPS[name](ctx)
+        counts = ", ".join(f"{n} {what}" for what, n in ctx.stats.get(name, {}).items() if n) \
+            or "nothing to do"
+        print(f"  {name:<10} {counts}  \033[90m({time.perf_counter() - step_started:.2f}s)\033[0m")
+    print(f"\033[92m✓ published in {time.perf_counter() - started:.2f}s\033[0m")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
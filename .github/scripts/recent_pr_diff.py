@@ -7,14 +7,25 @@ For each issue, find the emd-bot-issue-status comment and fetch
 its edit history via GraphQL — showing only edits made in the
 lookback window, with the PR link extracted from each version.
 
-Then for each PR found, fetch the previous and latest versions
-of the submitted JSON file and display a diff.
+With --diff, for each PR found, fetch the previous and latest versions
+of the submitted JSON file and display a field-level diff
+(ISSUE_SCRIPT/_json_diff.py).
+
+File versions and PR base commits are read from a local clone (the
+current checkout, or --clone DIR) through one long-lived
+`git cat-file --batch` process; only objects missing from the clone are
+fetched from the GitHub API. Fetch the PR refs first so heads of
+unmerged PRs are local too:
+
+  git fetch origin '+refs/pull/*/head:refs/pull/*/head'
 
 Usage
 -----
   python scripts/recent_pr_diff.py
   python scripts/recent_pr_diff.py --hours 6
   python scripts/recent_pr_diff.py --repo ORG/REPO
+  python scripts/recent_pr_diff.py --diff --clone ~/src/emd
+  python scripts/recent_pr_diff.py --diff --no-clone     # API only
 
 Requirements
 ------------
@@ -28,6 +39,16 @@ import os
 import re
 import sys
 from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+sys.path.insert(0, str(_SCRIPT_DIR.parent / "ISSUE_SCRIPT"))
+
+import _registry  # noqa: E402
+from git_objects import GitObjectReader  # noqa: E402
+
+_json_diff = _registry.helper('_json_diff')
 
 REPO_DEFAULT = "WCRP-CMIP/Essential-Model-Documentation"
 PR_IN_BODY_RE = re.compile(r"/pull/(\d+)", re.IGNORECASE)
@@ -178,12 +199,21 @@ def fetch_pr_info(repo, pr_number):
                    "--json", "files,mergedAt,state,headRefName,baseRefName,baseRefOid") or {}
 
 
-def fetch_pr_base_sha(repo, pr_number):
+def fetch_pr_base_sha(repo, pr_number, base_ref=None, reader=None):
+    if reader and base_ref:
+        sha = reader.merge_base(f"refs/pull/{pr_number}/head", base_ref)
+        if sha:
+            return sha
     data = gh_json("api", f"repos/{repo}/pulls/{pr_number}", "--method", "GET")
     return (data or {}).get("base", {}).get("sha")
 
 
-def fetch_file_at_ref(repo, path, ref):
+def fetch_file_at_ref(repo, path, ref, reader=None):
+    if reader:
+        blob = reader.read(ref, path)
+        if blob is not None:
+            return blob.decode("utf-8", errors="replace")
+        reader.note_api()
     raw = gh("api", f"repos/{repo}/contents/{path}",
              "--method", "GET", "-f", f"ref={ref}")
     if not raw:
@@ -235,12 +265,16 @@ def print_diff(diff_lines):
             print(f"    {line}")
 
 
-def show_pr_file_diff(repo, pr_number, pr_info):
+def show_pr_file_diff(repo, pr_number, pr_info, reader=None):
     files     = pr_info.get("files", [])
     merged_at = pr_info.get("mergedAt")
     base_ref  = pr_info.get("baseRefName", "main")
     head_ref  = pr_info.get("headRefName", "")
-    base_sha  = pr_info.get("baseRefOid") or fetch_pr_base_sha(repo, pr_number)
+    base_sha  = (pr_info.get("baseRefOid")
+                 or fetch_pr_base_sha(repo, pr_number, base_ref, reader))
+    if not merged_at and reader:
+        # The head branch may be gone or on a fork; the PR ref is not.
+        head_ref = f"refs/pull/{pr_number}/head"
 
     json_files = [f for f in files if f.get("filename", "").endswith(".json")]
     if not json_files:
@@ -252,8 +286,8 @@ def show_pr_file_diff(repo, pr_number, pr_info):
         status = f.get("status", "?")
         print(f"\n    File: {path}  ({status})")
 
-        latest   = fetch_file_at_ref(repo, path, base_ref if merged_at else head_ref)
-        previous = fetch_file_at_ref(repo, path, base_sha) if base_sha else None
+        latest   = fetch_file_at_ref(repo, path, base_ref if merged_at else head_ref, reader)
+        previous = fetch_file_at_ref(repo, path, base_sha, reader) if base_sha else None
 
         if status == "added":
             print("    (new file — no previous version)")
@@ -265,12 +299,20 @@ def show_pr_file_diff(repo, pr_number, pr_info):
                 except Exception:
                     print(f"      {latest[:300]}")
         elif previous and latest:
-            diff = json_diff(
-                previous, latest,
-                label_old=f"base ({base_sha[:7] if base_sha else '?'})",
-                label_new=f"PR #{pr_number} head",
-            )
-            print_diff(diff)
+            changes = _json_diff.diff_text(previous, latest)
+            if changes is None:
+                # Not valid JSON on one side: fall back to a text diff.
+                print_diff(json_diff(
+                    previous, latest,
+                    label_old=f"base ({base_sha[:7] if base_sha else '?'})",
+                    label_new=f"PR #{pr_number} head",
+                ))
+            elif not changes:
+                print("    (no changes in JSON content)")
+            else:
+                print(f"    {BOLD}base ({base_sha[:7]}) -> PR #{pr_number}{RESET}")
+                for line in _json_diff.to_lines(changes):
+                    print(f"    {line}")
         else:
             print("    (could not fetch one or both versions for diff)")
 
@@ -288,8 +330,17 @@ def main():
     parser.add_argument("--hours", type=float, default=4)
     parser.add_argument("--apply", action="store_true",
                         help="Restore overwritten comments (default: dry run)")
+    parser.add_argument("--diff", action="store_true",
+                        help="Show the JSON diff of each PR found")
+    parser.add_argument("--clone", metavar="DIR",
+                        help="Local clone to read file versions from (default: cwd's checkout)")
+    parser.add_argument("--no-clone", action="store_true",
+                        help="Read file versions from the GitHub API only")
     args = parser.parse_args()
 
+    reader = None if args.no_clone else GitObjectReader.open(args.clone)
+    diffed = set()
+
     since_dt  = datetime.now(timezone.utc) - timedelta(hours=args.hours)
     since_iso = since_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -393,9 +444,21 @@ def main():
         elif prev_pr == current_pr:
             print(f"  PR unchanged (#{current_pr})")
 
+        if args.diff:
+            for pr in (prev_pr, current_pr):
+                if pr and pr not in diffed:
+                    diffed.add(pr)
+                    print(f"\n  PR #{pr} files:")
+                    show_pr_file_diff(args.repo, pr, fetch_pr_info(args.repo, pr), reader)
+
         print()
 
     print(f"{'═'*70}")
+    if reader:
+        reader.close()
+        if args.diff:
+            print(f"File versions: {reader.local} read from {reader.clone_dir}, "
+                  f"{reader.api} fetched from the API.")
     print("Done.")
 
 
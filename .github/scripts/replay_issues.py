@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+replay_issues.py
+================
+Replay recorded issue fixtures through the `.github/ISSUE_SCRIPT/` handlers,
+time every stage, and diff the produced files against golden output.
+
+Nothing here talks to GitHub: handlers always run with dry_run=True, inside a
+local snapshot of src-data (GITHUB_WORKSPACE and the cwd both point at it).
+Each case replays the handler half of cmipld's new_issue pipeline on the
+parsed issue it recorded: `run()`, cmipld's generic `build_data_from_issue`
+when run() returns None, then `update()`. JSONValidator validation, the PR
+and the issue comments are not replayed.
+
+Network and cmipld
+------------------
+The model_family, model_component and modify handlers, and the committed
+cases under fixtures/replay/, need neither: they replay with the standard
+library alone (CI runs them). The grid handlers fetch the CV graphs through
+cmipld (`_cv_prefetch`, id_generation, ReportBuilder), link_existing_component
+reads entries with `cmipld.get`, and model resolves CRS terms with
+`cmipld.utils.crs`; cases for those, and any case whose handler falls back
+to the generic builder, need cmipld installed and network access (the LDR
+server for src-data graphs, as in new-issue.yml). A case that cannot import
+cmipld is reported as `needs cmipld` (and counts as a failure).
+
+Fixture layout
+--------------
+  <fixtures>/<case>/issue.json        {"number", "title", "author", "created_at",
+                                       "labels": [...], "body": "..."}
+  <fixtures>/<case>/parsed.json       the issue as cmipld's parse_issue_body
+                                      returned it (the handlers' input)
+  <fixtures>/<case>/expected/...      golden files, e.g. expected/model/foo.json
+
+Record new cases with --record (calls gh, and cmipld for parsed.json), then
+run once with --update-golden and review the generated expected/ tree.
+
+Usage
+-----
+  python .github/scripts/replay_issues.py .github/scripts/fixtures/replay/cases \\
+      --src-data .github/scripts/fixtures/replay/src-data
+  python .github/scripts/replay_issues.py fixtures/ --src-data ../src-data --jobs 8 --json
+  python .github/scripts/replay_issues.py fixtures/ --update-golden
+  python .github/scripts/replay_issues.py fixtures/ --record 412 413
+
+Exit code: 0 if every case matches its golden output, 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import difflib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+sys.path.insert(0, str(_SCRIPT_DIR.parent / 'ISSUE_SCRIPT'))
+
+import _registry  # noqa: E402
+from batch_issues import HANDLER_DIR, REPO_DEFAULT, fetch_issue, handler_kind  # noqa: E402
+
+
+STAGES = ('run', 'generic', 'update', 'diff')
+
+
+class NeedsCmipld(Exception):
+    """The case needs cmipld, which is not installed here."""
+
+
+def _cmipld_new_issue():
+    try:
+        from cmipld.generate import new_issue
+    except ImportError as e:
+        raise NeedsCmipld(str(e))
+    return new_issue
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def discover_cases(fixtures_dir: Path) -> list[Path]:
+    """Return every case directory (one containing issue.json), sorted."""
+    return sorted(p.parent for p in fixtures_dir.glob('*/issue.json'))
+
+
+def load_issue(case_dir: Path) -> dict:
+    with open(case_dir / 'issue.json', encoding='utf-8') as f:
+        issue = json.load(f)
+    # Accept raw `gh issue view --json` output as well as the normalised shape.
+    if isinstance(issue.get('author'), dict):
+        issue['author'] = issue['author'].get('login', '')
+    issue.setdefault('created_at', issue.pop('createdAt', ''))
+    issue['labels'] = [l.get('name', '') if isinstance(l, dict) else l
+                       for l in issue.get('labels') or []]
+    issue.setdefault('body', '')
+    return issue
+
+
+def load_parsed(case_dir: Path, issue: dict) -> dict:
+    """The recorded handler input; parsed with cmipld when the case has none."""
+    parsed = case_dir / 'parsed.json'
+    if parsed.is_file():
+        with open(parsed, encoding='utf-8') as f:
+            return json.load(f)
+    return _cmipld_new_issue().parse_issue_body(issue['body'])
+
+
+def _write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write('\n')
+
+
+def record_case(fixtures_dir: Path, repo: str, number: int) -> Path:
+    """Fetch a live issue once and save it as `<fixtures>/issue_<N>/`."""
+    case_dir = fixtures_dir / f'issue_{number}'
+    issue = fetch_issue(repo, number)
+    _write_json(case_dir / 'issue.json', issue)
+    _write_json(case_dir / 'parsed.json', _cmipld_new_issue().parse_issue_body(issue['body']))
+    return case_dir
+
+
+def load_golden(case_dir: Path) -> dict[str, dict]:
+    expected = case_dir / 'expected'
+    golden: dict[str, dict] = {}
+    for path in sorted(expected.rglob('*.json')) if expected.is_dir() else []:
+        with open(path, encoding='utf-8') as f:
+            golden[path.relative_to(expected).as_posix()] = json.load(f)
+    return golden
+
+
+def write_golden(case_dir: Path, records: dict[str, dict]) -> None:
+    for rel_path, record in records.items():
+        _write_json(case_dir / 'expected' / rel_path, record)
+
+
+# =============================================================================
+# Diffing
+# =============================================================================
+
+def _pretty(record: dict) -> list[str]:
+    return json.dumps(record, indent=2, sort_keys=True, ensure_ascii=False).splitlines()
+
+
+def diff_records(produced: dict[str, dict], golden: dict[str, dict]) -> list[str]:
+    """Return human-readable mismatch lines ([] when produced == golden)."""
+    lines: list[str] = []
+    for path in sorted(set(produced) | set(golden)):
+        if path not in golden:
+            lines.append(f'+ unexpected file {path}')
+        elif path not in produced:
+            lines.append(f'- missing file {path}')
+        elif produced[path] != golden[path]:
+            lines.append(f'~ {path}')
+            lines += [f'    {d}' for d in difflib.unified_diff(
+                _pretty(golden[path]), _pretty(produced[path]),
+                fromfile='golden', tofile='produced', lineterm='', n=1,
+            )]
+    return lines
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+def load_handler(kind: str):
+    """Load `.github/ISSUE_SCRIPT/<kind>.py` once per process."""
+    return _registry.for_dir(HANDLER_DIR)[kind]
+
+
+def data_files(files_to_write: dict) -> dict[str, dict]:
+    """Return {rel_path: clean_record} with every `_`-prefixed key removed."""
+    return {
+        path: {k: v for k, v in data.items() if not k.startswith('_')}
+        for path, data in (files_to_write or {}).items()
+        if not path.startswith('_') and isinstance(data, dict)
+    }
+
+
+def generic_files(parsed: dict, kind: str, labels: list[str]) -> dict:
+    """What new_issue writes when a handler's run() returns None."""
+    record = _cmipld_new_issue().build_data_from_issue(parsed, kind, labels)
+    if not record:
+        return {}
+    return {os.path.join(kind, f"{record['@id']}.json"): record}
+
+
+def _init_worker(src_data: str) -> None:
+    """Point every handler at the snapshot before any of them is imported."""
+    os.environ['GITHUB_WORKSPACE'] = src_data
+    os.chdir(src_data)
+
+
+def replay_case(case_dir: str, update_golden: bool = False) -> dict:
+    """Replay one case; returns a result row with per-stage timings in ms."""
+    case = Path(case_dir)
+    row = {'case': case.name, 'kind': None, 'status': '', 'timings': {}, 'diff': []}
+    timings = row['timings']
+
+    def _timed(stage, fn, *args, **kwargs):
+        # Handler chatter goes to stderr so the table / JSON on stdout stays clean.
+        t0 = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                return fn(*args, **kwargs)
+        finally:
+            timings[stage] = round((time.perf_counter() - t0) * 1000, 2)
+
+    try:
+        issue = load_issue(case)
+        kind = handler_kind(issue['labels'])
+        row['kind'] = kind
+        if kind is None:
+            row['status'] = 'no handler'
+            return row
+
+        parsed = load_parsed(case, issue)
+        module = load_handler(kind)
+        files_to_write = _timed('run', module.run, parsed, issue, dry_run=True)
+        if files_to_write is None:
+            files_to_write = _timed('generic', generic_files, parsed, kind, issue['labels'])
+        if files_to_write:
+            _timed('update', module.update, files_to_write, parsed, issue, dry_run=True)
+        produced = data_files(files_to_write or {})
+
+        if update_golden:
+            write_golden(case, produced)
+            row['status'] = 'golden updated'
+            return row
+
+        row['diff'] = _timed('diff', diff_records, produced, load_golden(case))
+        row['status'] = 'ok' if not row['diff'] else 'mismatch'
+    except NeedsCmipld:
+        row['status'] = 'needs cmipld'
+    except Exception as e:
+        row['status'] = f'error: {type(e).__name__}: {e}'
+    return row
+
+
+def replay_all(cases: list[Path], src_data: Path, jobs: int, update_golden: bool) -> list[dict]:
+    if jobs <= 1:
+        cwd = os.getcwd()
+        _init_worker(str(src_data))
+        try:
+            return [replay_case(str(c), update_golden) for c in cases]
+        finally:
+            os.chdir(cwd)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(str(src_data),)) as pool:
+        return list(pool.map(replay_case, [str(c) for c in cases],
+                             [update_golden] * len(cases)))
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def print_table(rows: list[dict]) -> None:
+    sep = '-' * 100
+    print(sep)
+    print(f'  {"CASE":<28}  {"KIND":<30}' + ''.join(f'{s.upper():>8}' for s in STAGES) + '  STATUS')
+    print(sep)
+    for r in rows:
+        ms = ''.join(f'{r["timings"].get(s, 0):>8.1f}' for s in STAGES)
+        print(f'  {r["case"][:28]:<28}  {(r["kind"] or "-")[:30]:<30}{ms}  {r["status"]}')
+        for line in r['diff']:
+            print(f'      {line}')
+    print(sep)
+
+    totals = {s: sum(r['timings'].get(s, 0) for r in rows) for s in STAGES}
+    print('  total ms: ' + '  '.join(f'{s}={v:.1f}' for s, v in totals.items()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('fixtures', type=Path, help='Directory of recorded issue cases.')
+    parser.add_argument('--src-data', type=Path, default=Path(os.environ.get('GITHUB_WORKSPACE', '.')),
+                        help='Local snapshot of src-data (default: $GITHUB_WORKSPACE or cwd).')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Parallel worker processes (default: CPU count).')
+    parser.add_argument('--case', action='append', default=[],
+                        help='Only replay the named case (repeatable).')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Write produced files as the new expected/ output.')
+    parser.add_argument('--json', action='store_true', help='Emit results as JSON.')
+    parser.add_argument('--record', type=int, nargs='+', metavar='N',
+                        help='Record live issue N as a new fixture case and exit.')
+    parser.add_argument('--repo', default=REPO_DEFAULT, help='Repository for --record.')
+    args = parser.parse_args()
+
+    if args.record:
+        for number in args.record:
+            print(f'Recorded {record_case(args.fixtures, args.repo, number)}')
+        return 0
+
+    cases = discover_cases(args.fixtures.resolve())
+    if args.case:
+        cases = [c for c in cases if c.name in set(args.case)]
+    if not cases:
+        print(f'No fixtures found under {args.fixtures}')
+        return 1
+
+    rows = replay_all(cases, args.src_data.resolve(), args.jobs, args.update_golden)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+    return 0 if all(r['status'] in ('ok', 'golden updated', 'no handler') for r in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -73,8 +73,10 @@ class CVFieldScanner:
                 continue
             
             # Determine if value is validation_key or ui_label format
+            # (list-valued fields such as region are valid if every item is)
+            values = value if isinstance(value, list) else [value]
             if field in self.VALID_KEYS:
-                if value in self.VALID_KEYS[field]:
+                if all(isinstance(v, str) and v in self.VALID_KEYS[field] for v in values):
                     findings[field] = ('validation_key', value)
                 else:
                     findings[field] = ('format_unknown', value)
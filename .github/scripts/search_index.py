@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+search_index.py
+===============
+Full-text search over the registry from one small static file.
+
+The index is an inverted index over the text fields of every entry
+(SEARCH_FIELDS: the id, `name`, `ui_label`, `description`), laid out so a
+browser can query it without any other request:
+
+  {
+    "version": 1,
+    "fields":   ["id", "name", "ui_label", "description"],
+    "types":    {"model": [0, 42], ...},          # folder -> [first doc, end)
+    "docs":     [["access-esm1-6", "ACCESS-ESM1-6"], ...],   # [id, label]
+    "terms":    ["access", "aerosol", ...],       # sorted
+    "postings": [[12, 57, ...], ...]              # per term: doc * len(fields) + field
+  }
+
+Text is tokenised the same way at build and query time (tokenise: accents
+folded, lower-cased, split on non-alphanumerics, stop words and single
+letters dropped). Because `terms` is sorted, a prefix is a bisection: the
+last query word matches as a prefix (typeahead), the others exactly, and all
+words must match. Docs are grouped by folder, so a type filter is a range
+check on the doc number. Hits are ranked by the field each word matched in
+(FIELD_WEIGHTS).
+
+publish.py writes the index to `_search.json` on production (with a `.gz`
+sibling); search() below is the reference query implementation.
+
+Usage
+-----
+  python .github/scripts/search_index.py "tripolar ocean"
+  python .github/scripts/search_index.py "canes" --folder model
+  python .github/scripts/search_index.py "arctic" --index _search.json --format json
+  python .github/scripts/search_index.py --out _search.json        # write the index
+
+Exit code: 0.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR))
+
+INDEX_VERSION = 1
+
+SEARCH_FIELDS = ("id", "name", "ui_label", "description")
+FIELD_WEIGHTS = {"id": 4, "name": 3, "ui_label": 3, "description": 1}
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has in is it its of on or that the this
+    to was were which with
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+def tokenise(text) -> list[str]:
+    """Search terms of a field value, in order (strings and lists of strings)."""
+    if isinstance(text, list):
+        return [t for item in text for t in tokenise(item)]
+    if not isinstance(text, str):
+        return []
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).lower()
+    return [w for w in _WORD.findall(folded)
+            if w not in STOP_WORDS and (len(w) > 1 or w.isdigit())]
+
+
+def _label(entry_id: str, record: dict) -> str:
+    for key in ("ui_label", "name"):
+        value = record.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return entry_id
+
+
+def build(records) -> dict:
+    """Index of [(folder, id, record), ...]."""
+    records = sorted(records, key=lambda r: (r[0], r[1]))
+    postings: dict[str, list[int]] = {}
+    docs, types = [], {}
+    width = len(SEARCH_FIELDS)
+    for doc, (folder, entry_id, record) in enumerate(records):
+        start = types.setdefault(folder, [doc, doc])
+        start[1] = doc + 1
+        docs.append([entry_id, _label(entry_id, record)])
+        for f, name in enumerate(SEARCH_FIELDS):
+            value = entry_id if name == "id" else record.get(name)
+            for term in dict.fromkeys(tokenise(value)):
+                postings.setdefault(term, []).append(doc * width + f)
+    terms = sorted(postings)
+    return {"version": INDEX_VERSION, "fields": list(SEARCH_FIELDS), "types": types,
+            "docs": docs, "terms": terms, "postings": [postings[t] for t in terms]}
+
+
+def dumps(index: dict) -> str:
+    """Compact serialisation (the index is fetched whole, so no indentation)."""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def load_records(root: Path):
+    """[(folder, id, record)] of every entry in the tree."""
+    from emd_registry import FOLDERS, Registry
+    reg = Registry.load(root, FOLDERS)
+    return [(folder, entry_id, reg.entries[folder][entry_id])
+            for folder, entry_id, _path in reg.files()]
+
+
+# =============================================================================
+# Query
+# =============================================================================
+
+def _term_range(terms: list[str], word: str, prefix: bool) -> range:
+    start = bisect.bisect_left(terms, word)
+    if not prefix:
+        return range(start, start + (start < len(terms) and terms[start] == word))
+    return range(start, bisect.bisect_left(terms, word + "\uffff", start))
+
+
+def search(index: dict, text: str, folder: str | None = None,
+           limit: int | None = None) -> list[tuple[str, str, str, int]]:
+    """
+    [(folder, id, label, score)] of the entries matching every word of
+    `text` (the last one as a prefix), best first.
+    """
+    words = list(dict.fromkeys(tokenise(text)))
+    if not words:
+        return []
+    fields, width = index["fields"], len(index["fields"])
+    lo, hi = index["types"].get(folder, [0, 0]) if folder else (0, len(index["docs"]))
+
+    scores: dict[int, int] | None = None
+    for n, word in enumerate(words):
+        best: dict[int, int] = {}
+        for t in _term_range(index["terms"], word, prefix=n == len(words) - 1):
+            for posting in index["postings"][t]:
+                doc, f = divmod(posting, width)
+                if lo <= doc < hi and (scores is None or doc in scores):
+                    best[doc] = max(best.get(doc, 0), FIELD_WEIGHTS.get(fields[f], 1))
+        scores = {doc: (scores or {}).get(doc, 0) + s for doc, s in best.items()}
+        if not scores:
+            return []
+
+    owner = sorted((start, name) for name, (start, _end) in index["types"].items())
+    hits = []
+    for doc, score in sorted(scores.items(), key=lambda kv: (-kv[1], index["docs"][kv[0]][0])):
+        folder_of = owner[bisect.bisect_right(owner, (doc, "\uffff")) - 1][1]
+        hits.append((folder_of, *index["docs"][doc], score))
+    return hits[:limit] if limit else hits
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("text", nargs="?", help="Words to search for.")
+    parser.add_argument("--root", default=".", help="src-data root (default: cwd).")
+    parser.add_argument("--folder", help="Only entries of this type.")
+    parser.add_argument("--index", metavar="FILE",
+                        help="Query this index file instead of indexing the tree.")
+    parser.add_argument("--out", metavar="FILE", help="Write the index to FILE.")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum hits (default: 20, 0 = all).")
+    parser.add_argument("--format", choices=("table", "json"), default="table",
+                        help="Output format (default: table).")
+    args = parser.parse_args()
+    if not args.text and not args.out:
+        parser.error("give search text or --out")
+
+    started = time.perf_counter()
+    if args.index:
+        index = json.loads(Path(args.index).expanduser().read_text(encoding="utf-8"))
+    else:
+        index = build(load_records(Path(args.root).expanduser().resolve()))
+    loaded = time.perf_counter()
+
+    if args.out:
+        text = dumps(index)
+        Path(args.out).write_text(text, encoding="utf-8")
+        print(f"\033[92m✓\033[0m {args.out}  {len(index['docs'])} entries, "
+              f"{len(index['terms'])} terms, {len(text.encode()):,} B")
+    if not args.text:
+        return 0
+
+    hits = search(index, args.text, args.folder, args.limit or None)
+    elapsed = (time.perf_counter() - loaded) * 1000
+    if args.format == "json":
+        print(json.dumps([{"folder": f, "id": i, "label": label, "score": s}
+                          for f, i, label, s in hits], indent=2, ensure_ascii=False))
+        return 0
+    for folder, entry_id, label, score in hits:
+        print(f"\033[94m{folder:<30}\033[0m {entry_id:<40} {label}  \033[90m({score})\033[0m")
+    print(f"\033[90m{len(hits)} hit(s) in {elapsed:.2f} ms "
+          f"(index {(loaded - started) * 1000:.0f} ms)\033[0m", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
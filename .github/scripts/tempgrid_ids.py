@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+tempgrid_ids.py
+===============
+Decide what each tempgrid file becomes: a duplicate of an existing numbered
+entry, or the next free number in its folder.
+
+This is the decision half of tempgrid-rename.yml (the workflow keeps the
+git, PR and author bookkeeping) and what the `tempgrid_rename` benchmark
+times:
+
+  * duplicates — the canonical-signature index of ISSUE_SCRIPT/_grid_signatures.py
+    (h: arrangement + subgrids, v: coordinate/levels/thicknesses, g: content
+    minus id fields); a file that matches an earlier file in the list gets
+    whatever ID that file is given;
+  * new IDs — each folder is scanned once for its numbered files
+    (`[sghv]NNN.json`); later files in the same folder continue the count.
+
+Usage
+-----
+  python .github/scripts/tempgrid_ids.py horizontal_grid_cell/tempgrid_ab12.json ...
+
+Prints one tab-separated line per FILE, in order:
+
+  FILE  new   ID        rename FILE to ID
+  FILE  dup   ID        FILE duplicates ID; remove it
+  FILE  skip            the folder has no numbered files to continue from
+
+Exit code: 0.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(_SCRIPT_DIR), 'ISSUE_SCRIPT'))
+
+import _registry  # noqa: E402
+
+_grid_signatures = _registry.helper('_grid_signatures')
+
+_NUMBERED = re.compile(r'^([sghv])(\d+)$', re.IGNORECASE)
+
+
+def _numbering(directory: str) -> tuple[str, int]:
+    """(letter, highest number) of the numbered files in `directory`."""
+    letter, highest = '', -1
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return letter, highest
+    for name in names:
+        m = _NUMBERED.match(name[:-5]) if name.endswith('.json') else None
+        if m:
+            letter = letter or m.group(1).lower()
+            highest = max(highest, int(m.group(2)))
+    return letter, highest
+
+
+def assign(paths: list[str]) -> list[tuple[str, str, str]]:
+    """[(path, 'new' | 'dup' | 'skip', ID)] for every path, in order."""
+    dup_of = _grid_signatures.duplicates(paths)
+    new_id_for: dict[str, str] = {}
+    numbering: dict[str, tuple[str, int]] = {}
+    plan = []
+    for path in paths:
+        existing = dup_of.get(path, '')
+        if existing.startswith('@'):
+            existing = new_id_for.get(existing[1:], '')
+        if existing:
+            plan.append((path, 'dup', existing))
+            continue
+        directory = os.path.dirname(path)
+        if directory not in numbering:
+            numbering[directory] = _numbering(directory or '.')
+        letter, highest = numbering[directory]
+        if not letter:
+            plan.append((path, 'skip', ''))
+            continue
+        new_id = f'{letter}{highest + 1:03d}'
+        numbering[directory] = (letter, highest + 1)
+        new_id_for[path] = new_id
+        plan.append((path, 'new', new_id))
+    return plan
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('files', nargs='*', help='Tempgrid files, in processing order.')
+    args = parser.parse_args()
+    for path, action, entry_id in assign(args.files):
+        print(f'{path}\t{action}\t{entry_id}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())